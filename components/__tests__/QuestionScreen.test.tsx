@@ -5,9 +5,13 @@ import QuestionScreen from '../screens/QuestionScreen';
 
 // Mock contexts and hooks
 const mockDispatch = vi.fn();
-const mockStats = { stats: { xp: 100 } };
+const mockStats = { stats: { xp: 100 }, addXp: vi.fn() };
 const mockAudio = { playCorrect: vi.fn(), playIncorrect: vi.fn(), playSuccess: vi.fn() };
 
+// Per-test overrides of the quiz state and the current question
+let mockStateOverrides: Record<string, unknown> = {};
+let mockQuestionOverrides: Record<string, unknown> = {};
+
 vi.mock('../../context/QuizContext', () => ({
     useQuiz: () => ({
         state: {
@@ -21,6 +25,7 @@ vi.mock('../../context/QuizContext', () => ({
             wrongAnswers: [],
             // Ensure popup is false initially
             showKnowMorePopup: false,
+            ...mockStateOverrides,
         },
         dispatch: mockDispatch,
         currentMascot: { emoji: '🦄' },
@@ -32,6 +37,7 @@ vi.mock('../../context/QuizContext', () => ({
             questionType: 'MCQ',
             knowMore: 'http://example.com',
             knowMoreText: 'Learn more here',
+            ...mockQuestionOverrides,
         },
         stats: mockStats,
     }),
@@ -48,6 +54,8 @@ vi.mock('../modals/KnowMoreModal', () => ({
 describe('QuestionScreen', () => {
     beforeEach(() => {
         vi.clearAllMocks();
+        mockStateOverrides = {};
+        mockQuestionOverrides = {};
     });
 
     it('does NOT show Settings icon or Zoom button', () => {
@@ -88,4 +96,38 @@ describe('QuestionScreen', () => {
             answerId: 'A'
         });
     });
+
+    describe('typed answers', () => {
+        const typedQuestion = (overrides: Record<string, unknown>) => {
+            mockQuestionOverrides = { answers: [], questionType: 'TTA', correctAnswer: '2/3', ...overrides };
+        };
+        const submit = (typedAnswer: string) => {
+            mockStateOverrides = { typedAnswer };
+            render(<QuestionScreen />);
+            fireEvent.click(screen.getByText('SUBMIT'));
+        };
+
+        it('accepts any spelling in acceptedAnswers', () => {
+            typedQuestion({ acceptedAnswers: ['2/3', '4/6', '0.67'] });
+            submit('  4 / 6 ');
+
+            expect(mockDispatch).toHaveBeenCalledWith({ type: 'SUBMIT_ANSWER', isCorrect: true, xpEarned: 5 });
+            expect(mockAudio.playCorrect).toHaveBeenCalled();
+        });
+
+        it('rejects answers outside acceptedAnswers', () => {
+            typedQuestion({ acceptedAnswers: ['2/3', '4/6', '0.67'] });
+            submit('3/4');
+
+            expect(mockDispatch).toHaveBeenCalledWith({ type: 'SUBMIT_ANSWER', isCorrect: false, xpEarned: 0 });
+            expect(mockDispatch).toHaveBeenCalledWith(expect.objectContaining({ type: 'ADD_WRONG_ANSWER' }));
+        });
+
+        it('falls back to pipe-separated answers without acceptedAnswers', () => {
+            typedQuestion({ correctAnswer: 'red', multipleAnswers: 'red|blue' });
+            submit(' Blue ');
+
+            expect(mockDispatch).toHaveBeenCalledWith({ type: 'SUBMIT_ANSWER', isCorrect: true, xpEarned: 5 });
+        });
+    });
 });
@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { useQuiz } from '../../context/QuizContext';
 import { Topic } from '../../types';
-import { TopicConfig, WorksheetConfig, fetchQuestionsFromSheet } from '../../services/googleSheetsService';
+import { TopicConfig, WorksheetConfig, countQuestionsFromIndex, fetchQuestionsFromSheet } from '../../services/googleSheetsService';
 import styles from '../../styles/LandingScreen.module.css';
 import sharedStyles from '../../styles/shared.module.css';
 
@@ -75,6 +75,13 @@ export default function LandingScreen({
 
                     if (wsConfig) {
                         localBasePath = wsConfig.path;
+
+                        // The master index already knows the counts; no need to download the bank
+                        const indexedCount = countQuestionsFromIndex(wsConfig, state.globalDifficulty);
+                        if (indexedCount !== undefined) {
+                            counts[topic.id] = indexedCount;
+                            continue;
+                        }
                     }
 
                     // Only fetch if we have a path (assuming local mostly)
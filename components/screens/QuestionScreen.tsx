@@ -1,6 +1,7 @@
 import React from 'react';
 import { useQuiz } from '../../context/QuizContext';
 import { useAudioFeedback } from '../../hooks/useAudioFeedback';
+import { normalizeAnswer } from '../../services/googleSheetsService';
 import styles from '../../styles/QuestionScreen.module.css';
 import sharedStyles from '../../styles/shared.module.css';
 import KnowMoreModal from '../modals/KnowMoreModal';
@@ -33,10 +34,20 @@ export default function QuestionScreen() {
     const questionType = currentQuestion?.questionType ||
         (currentQuestion?.answers && currentQuestion.answers.length > 0 ? 'MCQ' : 'TTA');
 
+    const acceptedAnswers = React.useMemo(
+        () => currentQuestion?.acceptedAnswers ? new Set(currentQuestion.acceptedAnswers) : undefined,
+        [currentQuestion]
+    );
+
     // Check if answer is correct - supports multiple answers separated by |
     const checkAnswer = (userAnswer: string, correctAnswer: string): boolean => {
         if (!userAnswer || !correctAnswer) return false;
 
+        // Precomputed equivalent forms (4/6 for 2/3, 1 l for 1000ml) when the bank build shipped them
+        if (acceptedAnswers) {
+            return acceptedAnswers.has(normalizeAnswer(userAnswer));
+        }
+
         // Check for multiple allowed answers (pipe-separated)
         const allowedAnswers = (currentQuestion?.multipleAnswers || correctAnswer)
             .split('|')
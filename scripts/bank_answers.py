@@ -0,0 +1,274 @@
+import os
+import re
+from fractions import Fraction
+
+from bank_compile import ARTIFACT_VERSION, iter_questions
+from bank_io import write_json_atomic
+
+# Canonical answers for typed (TTA and FIB) questions. Each answer is parsed
+# once at build time into one of
+#
+#   number     '5/8', '6/9', '0.5', '1 1/2', '12'   -> reduced Fraction
+#   quantity   '1 cup', '1000ml', '6m'              -> number + unit
+#   currency   '$10', '10 dollars'                  -> number + currency
+#   text       'denominator', 'rises'               -> the text itself
+#
+# and expanded into the set of typed forms that should be accepted:
+# equivalent fractions up to MAX_MULTIPLE times the reduced terms, mixed
+# numbers, exact decimals, the same quantity in other units of its kind when
+# the conversion comes out exact, and the usual ways of writing an amount.
+# A repeating decimal such as 2/3 accepts 0.67, 0.667, 0.66 and 0.666 (rounded
+# or cut off at two or three places), since that is what students type.
+#
+# Other spellings of a fraction are only accepted when the question is not
+# about equivalence itself: for "Sentence: 1/2 is equal to "2/4"." or
+# "Simplify 4/8" the value is given and the spelling is the answer, so only
+# the answer as written counts.
+#
+# The 'answers' build stage writes <worksheet>/answers.json:
+#
+#   {"version": 1, "sha256": "...",
+#    "answers": {"<row>": {"kind": "number", "canonical": "2/3",
+#                          "accepted": ["2/3", "4/6", "0.67", ...]}}}
+#
+# so the client grades a typed answer with one set lookup of
+# normalize_answer(typed). Answers that contain a digit or a currency sign
+# but parse as none of the above are reported by validate_banks.
+
+ANSWERS_FILE = 'answers.json'
+MAX_MULTIPLE = 12
+DECIMAL_PLACES = (2, 3)
+
+_WHITESPACE = re.compile(r'\s+')
+_AROUND_SLASH = re.compile(r'\s*/\s*')
+_NUMBER = r'-?(?:\d+\s+\d+/\d+|\d+/\d+|\d[\d,]*(?:\.\d+)?|\.\d+)'
+_QUANTITY = re.compile(rf'^(?P<number>{_NUMBER})\s*(?P<unit>[^\d\s].*)?$')
+_THOUSANDS = re.compile(r'^-?\d{1,3}(?:,\d{3})+(?:\.\d+)?$')
+_EQUIVALENCE_STEM = re.compile(r'\b(?:equal|equivalent|same as|simplif|simplest|lowest terms|reduc)', re.IGNORECASE)
+
+# Currency sign -> words it can be written as
+CURRENCIES = {
+    '$': ('dollar', 'dollars'),
+    '₹': ('rupee', 'rupees', 'rs', 'rs.'),
+    '£': ('pound', 'pounds'),
+    '€': ('euro', 'euros'),
+}
+# Unit -> (kind, size in the kind's smallest unit, spellings); the first
+# spelling is the canonical one
+UNITS = {
+    'mm': ('length', 1, ('mm', 'millimetre', 'millimetres', 'millimeter', 'millimeters')),
+    'cm': ('length', 10, ('cm', 'centimetre', 'centimetres', 'centimeter', 'centimeters')),
+    'm': ('length', 1000, ('m', 'metre', 'metres', 'meter', 'meters')),
+    'km': ('length', 1000000, ('km', 'kilometre', 'kilometres', 'kilometer', 'kilometers')),
+    'ml': ('volume', 1, ('ml', 'millilitre', 'millilitres', 'milliliter', 'milliliters')),
+    'l': ('volume', 1000, ('l', 'litre', 'litres', 'liter', 'liters')),
+    'g': ('mass', 1, ('g', 'gram', 'grams')),
+    'kg': ('mass', 1000, ('kg', 'kilogram', 'kilograms')),
+    's': ('time', 1, ('s', 'sec', 'secs', 'second', 'seconds')),
+    'min': ('time', 60, ('min', 'mins', 'minute', 'minutes')),
+    'h': ('time', 3600, ('h', 'hr', 'hrs', 'hour', 'hours')),
+}
+_UNIT_SPELLINGS = {spelling: unit for unit, (_, _, spellings) in UNITS.items() for spelling in spellings}
+_CURRENCY_WORDS = {word: sign for sign, words in CURRENCIES.items() for word in words}
+
+
+def normalize_answer(text):
+    """Lower-case, trimmed, single-spaced, no spaces around '/'. The client
+    applies the same rules (normalizeAnswer in services/googleSheetsService.ts)
+    before looking a typed answer up."""
+    return _AROUND_SLASH.sub('/', _WHITESPACE.sub(' ', text.strip().lower()))
+
+
+def parse_number(text):
+    """Exact value of '3', '-3/4', '1 1/2', '0.5', '.5' or '1,000', or None."""
+    text = text.strip()
+    if _THOUSANDS.match(text):
+        text = text.replace(',', '')
+    sign = -1 if text.startswith('-') else 1
+    text = text.lstrip('-')
+    whole, _, rest = text.partition(' ')
+    try:
+        if rest:
+            return sign * (Fraction(int(whole)) + Fraction(rest.strip()))
+        return sign * Fraction(text)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def _format_number(value):
+    return str(value.numerator) if value.denominator == 1 else f'{value.numerator}/{value.denominator}'
+
+
+def parse_answer(text):
+    """(kind, value, unit) for one answer, or None when it looks numeric but
+    cannot be parsed. value is a Fraction except for text answers; unit is a
+    UNITS key, a currency sign, a free unit word or None."""
+    normalized = normalize_answer(text)
+    if not normalized:
+        return None
+    if normalized[0] in CURRENCIES or normalized[-1] in CURRENCIES:
+        sign = normalized[0] if normalized[0] in CURRENCIES else normalized[-1]
+        value = parse_number(normalized.strip(sign))
+        return ('currency', value, sign) if value is not None else None
+
+    match = _QUANTITY.match(normalized)
+    if match:
+        value = parse_number(match.group('number'))
+        unit = match.group('unit')
+        if value is None:
+            return None
+        if unit is None:
+            return 'number', value, None
+        if unit in _CURRENCY_WORDS:
+            return 'currency', value, _CURRENCY_WORDS[unit]
+        if unit in _UNIT_SPELLINGS:
+            return 'quantity', value, _UNIT_SPELLINGS[unit]
+        if re.fullmatch(r'[a-z][a-z ]*', unit):
+            return 'quantity', value, unit
+        return None
+    if any(c.isdigit() for c in normalized) or any(c in normalized for c in CURRENCIES):
+        return None
+    return 'text', normalized, None
+
+
+def _decimals(value):
+    """Decimal spellings of value: the exact one when it terminates,
+    otherwise the two- and three-place roundings and truncations."""
+    sign = '-' if value < 0 else ''
+    value = abs(value)
+    forms = set()
+
+    def spell(scaled, places):
+        whole, fraction = divmod(scaled, 10 ** places)
+        digits = f'{fraction:0{places}d}'.rstrip('0')
+        return f'{sign}{whole}.{digits}' if digits else f'{sign}{whole}'
+
+    denominator = value.denominator
+    for factor in (2, 5):
+        while denominator % factor == 0:
+            denominator //= factor
+    if denominator == 1:
+        places = 0
+        while (value * 10 ** places).denominator != 1:
+            places += 1
+        forms.add(spell(int(value * 10 ** places), places))
+    else:
+        for places in DECIMAL_PLACES:
+            forms.add(spell(round(value * 10 ** places), places))
+            forms.add(spell(int(value * 10 ** places), places))
+    # '.5' for '0.5'
+    forms |= {form.replace('0.', '.', 1) for form in forms if form.lstrip('-').startswith('0.')}
+    return forms
+
+
+def number_forms(value, equivalents=True):
+    """Accepted spellings of a number."""
+    forms = {_format_number(value)} | _decimals(value)
+    sign = '-' if value < 0 else ''
+    magnitude = abs(value)
+    if magnitude.denominator != 1:
+        if magnitude > 1:
+            whole, rest = divmod(magnitude.numerator, magnitude.denominator)
+            forms.add(f'{sign}{whole} {rest}/{magnitude.denominator}')
+        if equivalents:
+            forms |= {f'{sign}{magnitude.numerator * k}/{magnitude.denominator * k}'
+                      for k in range(2, MAX_MULTIPLE + 1)}
+    return forms
+
+
+def _unit_spellings(unit):
+    if unit in UNITS:
+        return UNITS[unit][2]
+    # A counted noun such as 'pieces': singular and plural
+    return (unit, unit[:-1]) if unit.endswith('s') else (unit, unit + 's')
+
+
+def accepted_forms(kind, value, unit, equivalents=False):
+    """Every normalized spelling that counts as this answer. A fraction is
+    only spelled other ways (reduced, scaled, mixed, decimal) with
+    equivalents; answer_entry adds the spelling as written."""
+    if kind == 'text':
+        return {value}
+    if kind == 'number':
+        return number_forms(value) if equivalents or value.denominator == 1 else set()
+    if kind == 'currency':
+        numbers = number_forms(value, equivalents=False)
+        if value.denominator in (1, 2, 4, 5, 10, 20, 25, 50, 100):
+            numbers.add(f'{float(value):.2f}')
+        forms = set()
+        for number in numbers:
+            forms |= {f'{unit}{number}', f'{unit} {number}', f'{number}{unit}'}
+            forms |= {f'{number} {word}' for word in CURRENCIES[unit]}
+        return forms
+
+    # Quantities, also in the other units of the same kind when exact
+    targets = [(unit, value)]
+    if unit in UNITS:
+        kind_name, size, _ = UNITS[unit]
+        for other, (other_kind, other_size, _) in UNITS.items():
+            converted = value * size / other_size
+            # 1000ml is 1 l, but 250ml is not offered as 0.08333 cups
+            if other != unit and other_kind == kind_name and (converted * 1000).denominator == 1:
+                targets.append((other, converted))
+    forms = set()
+    for target_unit, target_value in targets:
+        for number in number_forms(target_value, equivalents=False):
+            for spelling in _unit_spellings(target_unit):
+                forms |= {f'{number}{spelling}', f'{number} {spelling}'}
+    return forms
+
+
+def canonical(kind, value, unit):
+    if kind == 'text':
+        return value
+    number = _format_number(value)
+    if kind == 'currency':
+        return f'{unit}{number}'
+    if kind == 'quantity':
+        return f'{number}{unit}' if unit in UNITS else f'{number} {unit}'
+    return number
+
+
+def answer_entry(answer, equivalents=False):
+    """Table entry for one answer cell ('|' separates alternatives), or None
+    if any alternative cannot be parsed."""
+    kinds, canonicals, accepted = [], [], set()
+    for alternative in answer.split('|'):
+        if not alternative.strip():
+            continue
+        parsed = parse_answer(alternative)
+        if parsed is None:
+            return None
+        forms = accepted_forms(*parsed, equivalents=equivalents) | {normalize_answer(alternative)}
+        kinds.append(parsed[0])
+        canonicals.append(canonical(*parsed) if canonical(*parsed) in forms else normalize_answer(alternative))
+        accepted |= forms
+    if not kinds:
+        return None
+    return {
+        'kind': kinds[0] if len(set(kinds)) == 1 else 'mixed',
+        'canonical': '|'.join(canonicals),
+        'accepted': sorted(accepted),
+    }
+
+
+def answers_path(file_path):
+    return os.path.join(os.path.dirname(file_path), ANSWERS_FILE)
+
+
+def build(file_path, source_hash):
+    """Build stage: the accepted-answer table of every typed question."""
+    answers = {}
+    rows = 0
+    for question in iter_questions(file_path):
+        rows += 1
+        if question['questionType'] == 'MCQ':
+            continue
+        entry = answer_entry(question.get('multipleAnswers') or question['correctAnswer'],
+                             equivalents=not _EQUIVALENCE_STEM.search(question['text']))
+        if entry is not None:
+            answers[str(question['row'])] = entry
+
+    path = answers_path(file_path)
+    write_json_atomic(path, {'version': ARTIFACT_VERSION, 'sha256': source_hash, 'answers': answers})
+    return [path], rows
@@ -0,0 +1,128 @@
+import json
+import os
+import re
+
+from bank_io import atomic_file, open_bank
+
+ARTIFACT_VERSION = 1
+ARTIFACT_FILE = 'questions.json'
+
+OPTION_LETTERS = ['A', 'B', 'C', 'D']
+_FIB_SENTENCE = re.compile(r'Sentence:\s*(.+?"([^"]+)".+)', re.IGNORECASE)
+_QUOTED = re.compile(r'"[^"]+"')
+_LEADING_INT = re.compile(r'^\s*[+-]?\d+')
+
+
+def normalize_difficulty(value):
+    value = (value or '').strip().lower()
+    if value in ('easy', 'low'):
+        return 'Easy'
+    if value in ('hard', 'high'):
+        return 'Hard'
+    return 'Medium'
+
+
+def detect_question_type(text, options, type_column):
+    """Python port of detectQuestionType in services/googleSheetsService.ts.
+    Returns (questionType, is_fib, fib_sentence, extracted_answer)."""
+    declared = (type_column or '').strip().upper()
+    if declared in ('FIB', 'FILL IN THE BLANK'):
+        return 'FIB', True, None, None
+    if declared in ('TTA', 'TYPE THE ANSWER'):
+        return 'TTA', False, None, None
+
+    match = _FIB_SENTENCE.search(text)
+    if match:
+        return 'FIB', True, _QUOTED.sub('__________', match.group(1)), match.group(2)
+
+    if sum(1 for o in options if o and o.strip()) >= 2:
+        return 'MCQ', False, None, None
+    return 'TTA', False, None, None
+
+
+def row_to_question(row, row_no):
+    """Convert one CSV row into the Question shape the app renders (see
+    types.ts), following parseCSVToQuestions. The topic-specific fields
+    ('id', 'topic') are added by the client; 'row' lets it rebuild the same
+    '<topic>-q<row>' ids the CSV path produces. Returns None for rows the app
+    would skip."""
+    parts = [cell.strip() for cell in row]
+    if len(parts) < 6:
+        return None
+    parts += [''] * (15 - len(parts))
+
+    text, options, answer_text = parts[0], parts[1:5], parts[5]
+    qtype, is_fib, fib_sentence, extracted = detect_question_type(text, options, parts[11])
+
+    if qtype == 'MCQ':
+        correct = 'A'
+        for letter, option in zip(OPTION_LETTERS, options):
+            if option.lower() == answer_text.lower():
+                correct = letter
+                break
+    else:
+        correct = extracted or answer_text
+
+    question = {'row': row_no, 'text': text}
+    optional = {
+        'hint': parts[6],
+        'knowMore': parts[8],
+        'knowMoreText': parts[7],
+        'imageUrl': parts[10],
+        'youtubeUrl': parts[9],
+    }
+    question.update((key, value) for key, value in optional.items() if value)
+    question['answers'] = ([{'id': letter, 'text': option} for letter, option in zip(OPTION_LETTERS, options)]
+                           if qtype == 'MCQ' else [])
+    question['correctAnswer'] = correct
+
+    worksheet = _LEADING_INT.match(parts[13])
+    if worksheet:
+        question['worksheetNumber'] = int(worksheet.group())
+    question['questionType'] = qtype
+    question['is_fib'] = is_fib
+    if fib_sentence:
+        question['fib_sentence'] = fib_sentence
+    if '|' in answer_text:
+        question['multipleAnswers'] = answer_text
+    question['difficulty'] = normalize_difficulty(parts[14])
+    return question
+
+
+def iter_questions(file_path):
+    """Stream a bank as Question dicts in file order."""
+    with open_bank(file_path) as (_, rows):
+        row_no = 0
+        for row in rows:
+            if not row:
+                continue
+            row_no += 1
+            question = row_to_question(row, row_no)
+            if question is not None:
+                yield question
+
+
+def artifact_path(file_path):
+    return os.path.join(os.path.dirname(file_path), ARTIFACT_FILE)
+
+
+def write_artifact(path, source_hash, questions):
+    # Compact and written via a temp file so the app never sees a partial
+    # artifact. The header fields come first so they can be sniffed cheaply.
+    # Returns the number of questions written.
+    count = 0
+    with atomic_file(path) as f:
+        f.write(f'{{"version":{ARTIFACT_VERSION},"sha256":"{source_hash}","questions":[')
+        for i, question in enumerate(questions):
+            if i:
+                f.write(',')
+            f.write(json.dumps(question, ensure_ascii=False, separators=(',', ':')))
+            count += 1
+        f.write(']}')
+    return count
+
+
+def build(file_path, source_hash):
+    """Build stage: questions.csv -> questions.json next to it."""
+    path = artifact_path(file_path)
+    return [path], write_artifact(path, source_hash, iter_questions(file_path))
@@ -0,0 +1,161 @@
+import json
+import os
+
+from bank_compile import ARTIFACT_VERSION, row_to_question
+from bank_index import stable_keys
+from bank_io import load_json, open_bank, write_json_atomic, write_text_atomic
+
+# Versioned snapshots and deltas of a bank, for clients that already hold an
+# older copy. Every build that changes the compiled questions bumps the
+# worksheet's version and writes, under <worksheet>/versions/:
+#
+#   manifest.json   current version, its snapshot and the chain of deltas
+#   v<N>.json       snapshot: every compiled question, each with a stable 'key'
+#   d<M>-<N>.json   what changed from version M to N: inserted and updated
+#                   questions, deleted keys, and the new row number of
+#                   questions that only moved
+#
+# Keys are content hashes (see bank_index.stable_keys), so they do not move
+# when rows are added or removed elsewhere. A delta is only kept when it is
+# smaller than the snapshot; otherwise the chain is cut and clients that are
+# behind download the snapshot.
+#
+# versions/ is derived from the CSV like every other artifact and is not
+# committed; the deploy workflow restores the previous build's versions/ from
+# the actions cache so the numbering carries over from one deploy to the
+# next. Each version is also identified by the bank's content hash, and a
+# delta records the hash it applies to, so a client whose copy does not match
+# (after the cache was lost and the numbering restarted, say) takes the
+# snapshot instead of patching the wrong questions.
+
+VERSIONS_DIR = 'versions'
+VERSIONS_MANIFEST = 'manifest.json'
+# Deltas kept in the chain; clients further behind take the snapshot
+MAX_DELTAS = 20
+
+
+def versions_dir(file_path):
+    return os.path.join(os.path.dirname(file_path), VERSIONS_DIR)
+
+
+def keyed_questions(file_path):
+    """{key: compiled question} in bank order; every question also carries
+    its key."""
+    questions = {}
+    with open_bank(file_path) as (_, rows):
+        row_no = 0
+        for key, row in stable_keys(row for row in rows if row):
+            row_no += 1
+            question = row_to_question(row, row_no)
+            if question is not None:
+                question['key'] = key
+                questions[key] = question
+    return questions
+
+
+def _without_row(question):
+    return {name: value for name, value in question.items() if name != 'row'}
+
+
+def diff_questions(previous, current):
+    """Changes from previous to current ({key: question} each). A question
+    whose only change is its row number (rows above it were added or
+    removed) goes into 'moved' as key -> new row instead of being resent."""
+    inserted, updated, moved = [], [], {}
+    for key, question in current.items():
+        old = previous.get(key)
+        if old is None:
+            inserted.append(question)
+        elif old != question:
+            if _without_row(old) == _without_row(question):
+                moved[key] = question['row']
+            else:
+                updated.append(question)
+    return {
+        'inserted': inserted,
+        'updated': updated,
+        'deleted': [key for key in previous if key not in current],
+        'moved': moved,
+    }
+
+
+def _compact(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+def _snapshot_text(bank_version, source_hash, questions):
+    return _compact({
+        'version': ARTIFACT_VERSION,
+        'bank_version': bank_version,
+        'sha256': source_hash,
+        'questions': list(questions),
+    })
+
+
+def build(file_path, source_hash):
+    """Build stage: bump the bank version if its questions changed and write
+    the new snapshot plus a delta from the previous version."""
+    directory = versions_dir(file_path)
+    os.makedirs(directory, exist_ok=True)
+    manifest_path = os.path.join(directory, VERSIONS_MANIFEST)
+    manifest = load_json(manifest_path)
+    if not manifest or manifest.get('version') != ARTIFACT_VERSION:
+        manifest = None
+
+    current = keyed_questions(file_path)
+    previous = None
+    if manifest:
+        snapshot = load_json(os.path.join(directory, manifest['snapshot']['file']))
+        if snapshot and snapshot.get('bank_version') == manifest['bank_version']:
+            previous = {q['key']: q for q in snapshot['questions']}
+
+    if previous is not None and list(previous.items()) == list(current.items()):
+        # Same questions (e.g. only whitespace outside cells changed): keep
+        # the version, but the snapshot and manifest carry the new hash
+        if manifest['sha256'] != source_hash:
+            snapshot_text = _snapshot_text(manifest['bank_version'], source_hash, current.values())
+            write_text_atomic(os.path.join(directory, manifest['snapshot']['file']), snapshot_text)
+            manifest['snapshot']['bytes'] = len(snapshot_text.encode('utf-8'))
+            manifest['sha256'] = source_hash
+    else:
+        bank_version = manifest['bank_version'] + 1 if manifest else 1
+        snapshot_file = f'v{bank_version}.json'
+        snapshot_text = _snapshot_text(bank_version, source_hash, current.values())
+        write_text_atomic(os.path.join(directory, snapshot_file), snapshot_text)
+
+        deltas = []
+        if previous is not None:
+            delta_file = f"d{manifest['bank_version']}-{bank_version}.json"
+            delta_text = _compact({
+                'version': ARTIFACT_VERSION,
+                'from': manifest['bank_version'],
+                'to': bank_version,
+                **diff_questions(previous, current),
+            })
+            if len(delta_text.encode('utf-8')) < len(snapshot_text.encode('utf-8')):
+                write_text_atomic(os.path.join(directory, delta_file), delta_text)
+                deltas = manifest['deltas'] + [{
+                    'from': manifest['bank_version'],
+                    'from_sha256': manifest['sha256'],
+                    'to': bank_version,
+                    'file': delta_file,
+                    'bytes': len(delta_text.encode('utf-8')),
+                }]
+        manifest = {
+            'version': ARTIFACT_VERSION,
+            'bank_version': bank_version,
+            'sha256': source_hash,
+            'snapshot': {
+                'file': snapshot_file,
+                'count': len(current),
+                'bytes': len(snapshot_text.encode('utf-8')),
+            },
+            'deltas': deltas[-MAX_DELTAS:],
+        }
+
+    write_json_atomic(manifest_path, manifest)
+    keep = {VERSIONS_MANIFEST, manifest['snapshot']['file']} | {d['file'] for d in manifest['deltas']}
+    for name in os.listdir(directory):
+        if name.endswith('.json') and name not in keep:
+            os.unlink(os.path.join(directory, name))
+    return [os.path.join(directory, name) for name in sorted(keep)], len(current)
@@ -0,0 +1,136 @@
+import csv
+import hashlib
+import io
+import os
+import re
+
+from bank_io import load_json, open_bank, sidecar_path, write_json_atomic
+
+INDEX_VERSION = 1
+
+# Bytes at the end of the bank remembered at save time. If they are still in
+# place when the bank has grown, everything after them was appended and only
+# that tail needs indexing.
+TAIL_BYTES = 64
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def _normalize(text):
+    return _WHITESPACE.sub(' ', text).strip().lower()
+
+
+def content_hash(row):
+    """Hash of a question's identity: the question text, its answer and the
+    set of options, with case and whitespace normalized. Hint, links, padding
+    and Difficulty do not affect it, so schema migrations keep hashes stable."""
+    question = _normalize(row[0]) if row else ''
+    answer = _normalize(row[5]) if len(row) > 5 else ''
+    options = sorted(_normalize(o) for o in row[1:5] if o.strip())
+    key = '\x1f'.join([question, answer] + options)
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def stable_keys(rows):
+    """Yield (key, row) with a key per row that survives edits elsewhere in
+    the bank: the row's content_hash, with '-1', '-2', ... appended for
+    repeats of the same question."""
+    seen = {}
+    for row in rows:
+        digest = content_hash(row)
+        n = seen.get(digest, 0)
+        seen[digest] = n + 1
+        yield (f'{digest}-{n}' if n else digest), row
+
+
+def read_tail(file_path, size):
+    with open(file_path, 'rb') as f:
+        f.seek(max(0, size - TAIL_BYTES))
+        return f.read(min(size, TAIL_BYTES)).hex()
+
+
+class DedupIndex:
+    """Persistent map of content_hash -> row number for one questions.csv,
+    stored as a sidecar next to the bank ('.questions.index.json').
+
+    Row numbers count data rows from 1, matching the question ids the app
+    assigns ('<topic>-q<row>'). The sidecar records the bank's size, mtime and
+    trailing bytes; opening it only scans rows appended since the last save
+    and falls back to a full rebuild if the bank was edited any other way."""
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.index_path = sidecar_path(file_path, 'index.json')
+        self.hashes = {}
+        self.rows = 0
+        self.scanned = 0
+
+    @classmethod
+    def open(cls, file_path):
+        index = cls(file_path)
+        index._sync()
+        return index
+
+    def __contains__(self, digest):
+        return digest in self.hashes
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def get(self, digest):
+        return self.hashes.get(digest)
+
+    def claim(self, row):
+        """Register row as the next row of the bank unless an identical
+        question is already indexed. Returns True if the row is new."""
+        digest = content_hash(row)
+        if digest in self.hashes:
+            return False
+        self.rows += 1
+        self.hashes[digest] = self.rows
+        return True
+
+    def save(self):
+        stat = os.stat(self.file_path)
+        write_json_atomic(self.index_path, {
+            'version': INDEX_VERSION,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'tail': read_tail(self.file_path, stat.st_size),
+            'rows': self.rows,
+            'hashes': self.hashes,
+        })
+
+    def _sync(self):
+        stat = os.stat(self.file_path)
+        data = load_json(self.index_path)
+        if not data or data.get('version') != INDEX_VERSION:
+            return self._rebuild()
+
+        size = data['size']
+        if stat.st_size == size and stat.st_mtime_ns == data['mtime_ns']:
+            self.hashes, self.rows = data['hashes'], data['rows']
+            return
+        if stat.st_size <= size or read_tail(self.file_path, size) != data['tail']:
+            return self._rebuild()
+
+        # Only rows appended after the last save need hashing
+        self.hashes, self.rows = data['hashes'], data['rows']
+        with open(self.file_path, 'rb') as raw:
+            raw.seek(size)
+            with io.TextIOWrapper(raw, encoding='utf-8', newline='') as f:
+                self._scan(csv.reader(f))
+
+    def _rebuild(self):
+        self.hashes, self.rows = {}, 0
+        with open_bank(self.file_path) as (_, rows):
+            self._scan(rows)
+
+    def _scan(self, rows):
+        for row in rows:
+            if not row:
+                continue
+            self.scanned += 1
+            self.rows += 1
+            # Keep the first occurrence when the bank already holds duplicates
+            self.hashes.setdefault(content_hash(row), self.rows)
@@ -0,0 +1,213 @@
+import csv
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+# Column layout of every worksheet questions.csv (see parseCSVToQuestions in
+# services/googleSheetsService.ts). The first 14 columns are the original
+# schema; Difficulty was added later and is optional in older banks.
+COLUMNS = [
+    'Question', 'Option 1', 'Option 2', 'Option 3', 'Option 4', 'Answer',
+    'Hint', 'Know More', 'Link', 'YouTube', 'Image', 'Type',
+    'Concept/Subtopic', 'Worksheet No', 'Difficulty',
+]
+BASE_COLUMN_COUNT = 14
+
+PUBLIC_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'public'))
+BANK_FILE = 'questions.csv'
+
+# The banks in public/ are written with plain '\n' line endings
+LINE_TERMINATOR = '\n'
+
+
+def csv_writer(f):
+    return csv.writer(f, lineterminator=LINE_TERMINATOR)
+
+
+def discover_banks(public_dir=PUBLIC_DIR):
+    """Every public/Worksheet*/questions.csv, found the same way
+    scripts/generate_index.js finds worksheet folders."""
+    banks = []
+    for entry in sorted(os.scandir(public_dir), key=lambda e: e.name):
+        if entry.is_dir() and entry.name.startswith('Worksheet'):
+            file_path = os.path.join(entry.path, BANK_FILE)
+            if os.path.isfile(file_path):
+                banks.append(file_path)
+    return banks
+
+
+@contextmanager
+def open_bank(file_path):
+    """Open a bank for streaming reads. Yields (header, rows) where rows is a
+    lazy iterator over the remaining records, so the bank is never held in
+    memory as a whole."""
+    with open(file_path, 'r', newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        yield header, reader
+
+
+def read_header(file_path):
+    with open_bank(file_path) as (header, _):
+        return header
+
+
+def _copy_mode(tmp_path, file_path):
+    # mkstemp creates files as 0600; give the replacement the permissions of
+    # the file it replaces, or the usual umask-based ones for a new file
+    if os.path.exists(file_path):
+        mode = os.stat(file_path).st_mode & 0o777
+    else:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    os.chmod(tmp_path, mode)
+
+
+@contextmanager
+def atomic_file(file_path, prefix='.write-'):
+    """Yield a text file opened on a temp file in the same directory as
+    file_path. On a clean exit the temp file is fsynced and swapped in with
+    os.replace, so readers see either the old file or the new one, never a
+    half-written one. On error the temp file is discarded and file_path is
+    untouched."""
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, tmp_path = tempfile.mkstemp(prefix=prefix, suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', newline='', encoding='utf-8') as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        _copy_mode(tmp_path, file_path)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+@contextmanager
+def atomic_writer(file_path):
+    """Yield a csv writer onto a temp file that replaces file_path atomically
+    (see atomic_file)."""
+    with atomic_file(file_path, prefix='.questions-') as f:
+        yield csv_writer(f)
+
+
+def atomic_rewrite(file_path, header, rows):
+    """Atomically replace file_path with header + rows. Returns the number of
+    data rows written."""
+    count = 0
+    with atomic_writer(file_path) as writer:
+        writer.writerow(header)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def rewrite_bank(file_path, transform):
+    """Stream an existing bank through transform(header, rows), which returns
+    the new (header, rows), and atomically replace the file with the result.
+    The source is read row by row and closed before the swap. Returns the
+    number of data rows written."""
+    count = 0
+    with atomic_writer(file_path) as writer:
+        with open_bank(file_path) as (header, rows):
+            new_header, new_rows = transform(header, rows)
+            writer.writerow(new_header)
+            for row in new_rows:
+                writer.writerow(row)
+                count += 1
+    return count
+
+
+def append_rows(file_path, rows):
+    """Append rows to the end of an existing bank without touching the rows
+    already on disk. Returns the number of rows appended."""
+    needs_newline = False
+    with open(file_path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() > 0:
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) not in (b'\n', b'\r')
+
+    count = 0
+    with open(file_path, 'a', newline='', encoding='utf-8') as f:
+        if needs_newline:
+            f.write(LINE_TERMINATOR)
+        writer = csv_writer(f)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+        f.flush()
+        os.fsync(f.fileno())
+    return count
+
+
+def question_row(q, concept, worksheet_no):
+    """Build a bank row from a question dict shaped like the ones in the
+    question packs under packs/ ('q', 'options', 'ans', 'hint', 'know_more',
+    'link', 'type', 'difficulty', optional 'image')."""
+    return [
+        q['q'],
+        q['options'][0],
+        q['options'][1],
+        q['options'][2],
+        q['options'][3],
+        q['ans'],
+        q['hint'],
+        q['know_more'],       # Know More Text
+        q['link'],            # Link URL
+        '',                   # YouTube
+        q.get('image', ''),   # Image
+        q['type'],
+        concept,              # Concept
+        str(worksheet_no),    # Worksheet No
+        q['difficulty'],
+    ]
+
+
+def pad_row(row, width, fill=''):
+    if len(row) < width:
+        row.extend([fill] * (width - len(row)))
+    return row
+
+
+def sidecar_path(file_path, suffix):
+    """Path of a tooling sidecar stored next to a bank, e.g.
+    'Worksheet 7 - Fractions/.questions.index.json' for suffix 'index.json'."""
+    directory, name = os.path.split(file_path)
+    stem = os.path.splitext(name)[0]
+    return os.path.join(directory, f'.{stem}.{suffix}')
+
+
+def load_json(file_path, default=None):
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def write_bytes_atomic(file_path, data):
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.write-', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        _copy_mode(tmp_path, file_path)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def write_text_atomic(file_path, text):
+    write_bytes_atomic(file_path, text.encode('utf-8'))
+
+
+def write_json_atomic(file_path, data, indent=None):
+    write_text_atomic(file_path, json.dumps(data, indent=indent, ensure_ascii=False))
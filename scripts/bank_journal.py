@@ -0,0 +1,289 @@
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+import zlib
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+import bank_profile
+from bank_io import PUBLIC_DIR, discover_banks, load_json, sidecar_path, write_json_atomic
+
+# Lets several authors add rows to the same bank at the same time without
+# losing each other's work.
+#
+# A writer first appends its rows to the bank's write-ahead journal
+# ('.questions.journal', one checksummed JSON record per line, fsynced) and
+# then waits for the bank lock ('.questions.lock', an advisory lock). Whoever
+# holds the lock commits every record in the journal at once: one dedup pass
+# and one append to questions.csv for all the authors that were waiting. A
+# writer that finds its record already committed by someone else just picks up
+# its result. '.questions.journal.json' records how far the journal has been
+# committed and the result of each record.
+#
+# Appends to questions.csv are bracketed by a 'pending' marker holding the
+# bank's size beforehand. A crash mid-append leaves the marker behind; the
+# next writer (or `python scripts/bank_journal.py`) truncates the bank back to
+# that size and commits the journal again, so nothing is lost or half-written.
+
+_OPEN_BINARY = getattr(os, 'O_BINARY', 0)
+# Results kept for writers that have not collected theirs yet
+MAX_RESULTS = 4096
+
+_thread_locks = {}
+_thread_locks_guard = threading.Lock()
+_depth = {}
+
+
+def lock_path(file_path):
+    return sidecar_path(file_path, 'lock')
+
+
+def journal_path(file_path):
+    return sidecar_path(file_path, 'journal')
+
+
+def journal_state_path(file_path):
+    return sidecar_path(file_path, 'journal.json')
+
+
+@contextmanager
+def _locked(fd):
+    """Exclusive advisory lock on an open file, held for the with block."""
+    if fcntl:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        while True:
+            try:
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                break
+            except OSError:
+                # LK_LOCK gives up after about 10 seconds; keep waiting
+                continue
+    try:
+        yield
+    finally:
+        if fcntl:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def bank_lock(file_path):
+    """Hold the bank's advisory lock: exclusive between processes and between
+    threads, re-entrant within one thread. Every write to questions.csv takes
+    it."""
+    path = os.path.abspath(lock_path(file_path))
+    with _thread_locks_guard:
+        thread_lock = _thread_locks.setdefault(path, threading.RLock())
+    with thread_lock:
+        if _depth.get(path):
+            _depth[path] += 1
+            try:
+                yield
+            finally:
+                _depth[path] -= 1
+            return
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | _OPEN_BINARY, 0o666)
+        try:
+            with _locked(fd):
+                _depth[path] = 1
+                try:
+                    yield
+                finally:
+                    _depth[path] = 0
+        finally:
+            os.close(fd)
+
+
+def _encode(record):
+    payload = json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return b'%08x %s\n' % (zlib.crc32(payload), payload)
+
+
+def _decode(line):
+    checksum, _, payload = line.rstrip(b'\n').partition(b' ')
+    try:
+        if int(checksum, 16) != zlib.crc32(payload):
+            return None
+        return json.loads(payload.decode('utf-8'))
+    except ValueError:
+        return None
+
+
+class Journal:
+    """Write-ahead journal of one bank. Records are {'id', 'rows'}; offsets
+    are byte offsets into the journal file."""
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.path = journal_path(file_path)
+        self.state_path = journal_state_path(file_path)
+
+    @contextmanager
+    def _open(self):
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT | _OPEN_BINARY, 0o666)
+        try:
+            with _locked(fd):
+                yield fd
+        finally:
+            os.close(fd)
+
+    def _drop_torn_tail(self, fd):
+        # A writer that crashed mid-append leaves a partial last line; cut it
+        # off so the next record starts on a line of its own
+        size = os.fstat(fd).st_size
+        if size == 0:
+            return 0
+        os.lseek(fd, 0, os.SEEK_SET)
+        data = os.read(fd, size)
+        end = data.rfind(b'\n') + 1
+        if end != size:
+            os.ftruncate(fd, end)
+        return end
+
+    def append(self, rows):
+        """Durably journal a batch of rows. Returns the record id."""
+        record_id = uuid.uuid4().hex
+        line = _encode({'id': record_id, 'rows': rows})
+        with self._open() as fd:
+            size = os.fstat(fd).st_size
+            if size:
+                os.lseek(fd, size - 1, os.SEEK_SET)
+                if os.read(fd, 1) != b'\n':
+                    self._drop_torn_tail(fd)
+            os.lseek(fd, 0, os.SEEK_END)
+            view = memoryview(line)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        return record_id
+
+    def state(self):
+        state = load_json(self.state_path, {})
+        return {
+            'committed': state.get('committed', 0),
+            'pending': state.get('pending'),
+            'results': state.get('results', {}),
+        }
+
+    def _save_state(self, state):
+        results = state['results']
+        if len(results) > MAX_RESULTS:
+            state['results'] = dict(list(results.items())[-MAX_RESULTS:])
+        write_json_atomic(self.state_path, state)
+
+    def result(self, record_id):
+        """(inserted, skipped) of a committed record, or None."""
+        result = self.state()['results'].get(record_id)
+        return tuple(result) if result else None
+
+    def pending(self):
+        """(records, end): the uncommitted records in journal order and the
+        offset just past the last one. Call with the bank lock held."""
+        state = self.state()
+        with self._open() as fd:
+            size = os.fstat(fd).st_size
+            start = state['committed']
+            if start > size:
+                # The journal was truncated after its last commit
+                start = 0
+            os.lseek(fd, start, os.SEEK_SET)
+            data = os.read(fd, size - start)
+        end = start + data.rfind(b'\n') + 1
+        records = []
+        for line in data[:end - start].splitlines():
+            record = _decode(line)
+            if record is not None:
+                records.append(record)
+        return records, end
+
+    def recover(self):
+        """Undo a bank append that was interrupted by a crash. Returns the
+        number of bytes cut off the bank. Call with the bank lock held."""
+        state = self.state()
+        pending = state['pending']
+        if not pending:
+            return 0
+        size = os.path.getsize(self.file_path)
+        cut = max(0, size - pending['bank_size'])
+        if cut:
+            with open(self.file_path, 'r+b') as f:
+                f.truncate(pending['bank_size'])
+                f.flush()
+                os.fsync(f.fileno())
+        state['pending'] = None
+        self._save_state(state)
+        return cut
+
+    def begin(self, end):
+        """Mark the start of an append to the bank that commits the journal
+        up to end."""
+        state = self.state()
+        state['pending'] = {'end': end, 'bank_size': os.path.getsize(self.file_path)}
+        self._save_state(state)
+
+    def finish(self, end, results):
+        """Record the journal as committed up to end, with the (inserted,
+        skipped) of each record, and empty the journal if nothing was
+        appended to it meanwhile."""
+        state = self.state()
+        state['committed'] = end
+        state['pending'] = None
+        # A record replayed after a crash keeps the result it first got
+        for record_id, result in results.items():
+            state['results'].setdefault(record_id, result)
+        with self._open() as fd:
+            if os.fstat(fd).st_size == end:
+                # Reset the offset before truncating: a crash in between then
+                # replays records that dedup skips, whereas the other order
+                # would leave an offset past the end of an emptied journal
+                # and skip the records written after it
+                state['committed'] = 0
+                self._save_state(state)
+                os.ftruncate(fd, 0)
+                os.fsync(fd)
+                return
+        self._save_state(state)
+
+
+def main(argv=None):
+    # bank_writer builds on this module, so the commit itself is imported late
+    from bank_writer import commit_pending
+
+    parser = argparse.ArgumentParser(description='Commit journaled rows left behind by interrupted bank writers.')
+    parser.add_argument('banks', nargs='*', help='questions.csv files (default: every public/Worksheet*/questions.csv)')
+    parser.add_argument('--public-dir', default=PUBLIC_DIR)
+    bank_profile.add_arguments(parser)
+    args = parser.parse_args(argv)
+    bank_profile.activate(bank_profile.Profiler.from_args('bank_journal', args))
+
+    start = time.perf_counter()
+    banks = args.banks or discover_banks(args.public_dir)
+    committed = 0
+    for path in banks:
+        results = commit_pending(path)
+        if results:
+            inserted = sum(result[0] for result in results.values())
+            committed += len(results)
+            print(f'  {os.path.basename(os.path.dirname(path))}: committed {len(results)} journaled batches '
+                  f'({inserted} rows inserted)')
+    bank_profile.close(batches=committed)
+    print(f'✅ {len(banks)} banks checked, {committed} journaled batches committed '
+          f'in {time.perf_counter() - start:.2f}s.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,92 @@
+import json
+import os
+import re
+from collections import Counter
+
+from bank_compile import iter_questions
+from bank_io import load_json, sidecar_path, write_json_atomic, write_text_atomic
+
+MASTER_INDEX_FILE = 'master_index.json'
+
+
+def stats_path(file_path):
+    return sidecar_path(file_path, 'stats.json')
+
+
+def build(file_path, source_hash):
+    """Build stage: per-bank statistics for master_index.json (question
+    count, difficulty and type histograms, byte size, content hash)."""
+    difficulty, types = Counter(), Counter()
+    rows = 0
+    for question in iter_questions(file_path):
+        rows += 1
+        difficulty[question['difficulty']] += 1
+        types[question['questionType']] += 1
+
+    path = stats_path(file_path)
+    write_json_atomic(path, {
+        'rows': rows,
+        'bytes': os.path.getsize(file_path),
+        'sha256': source_hash,
+        'difficulty': dict(sorted(difficulty.items())),
+        'types': dict(sorted(types.items())),
+    })
+    return [path], rows
+
+
+def worksheet_id(folder_name):
+    # Same rule as scripts/generate_index.js: "Worksheet 1 - Verbs" -> "ws1"
+    match = re.search(r'\d+', folder_name)
+    return f"ws{match.group() if match else '0'}"
+
+
+def _sort_key(entry):
+    try:
+        return int(entry['id'].replace('ws', ''))
+    except ValueError:
+        return 0
+
+
+def update_master_index(public_dir, banks):
+    """Refresh the 'bank' statistics of every entry in public/master_index.json
+    from the per-bank stats sidecars. Curated fields (icon, color, ...) are
+    kept. Folders without an entry are added the way generate_index.js does,
+    unless their id is already taken by another folder. Returns
+    (written, skipped_folders)."""
+    index_path = os.path.join(public_dir, MASTER_INDEX_FILE)
+    entries = load_json(index_path, [])
+    by_path = {entry['path']: entry for entry in entries}
+    taken = {entry['id'] for entry in entries}
+
+    skipped = []
+    for file_path in banks:
+        folder = os.path.basename(os.path.dirname(file_path))
+        stats = load_json(stats_path(file_path))
+        entry = by_path.get(folder)
+        if entry is None:
+            ws_id = worksheet_id(folder)
+            if ws_id in taken:
+                skipped.append(folder)
+                continue
+            entry = {
+                'id': ws_id,
+                'name': folder,
+                'path': folder,
+                'description': f'Auto-generated from folder {folder}',
+            }
+            entries.append(entry)
+            by_path[folder] = entry
+            taken.add(ws_id)
+        if stats:
+            entry['bank'] = stats
+
+    entries.sort(key=_sort_key)
+    content = json.dumps(entries, indent=2)
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            if f.read() == content:
+                return False, skipped
+    except OSError:
+        pass
+    write_text_atomic(index_path, content)
+    return True, skipped
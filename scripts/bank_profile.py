@@ -0,0 +1,140 @@
+import cProfile
+import json
+import sys
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Per-stage instrumentation for the bank tooling. Commands take
+#
+#   --profile FILE         append one JSON line per stage to FILE ('-' for stderr)
+#   --profile-dump FILE    also write a cProfile dump of the slowest top-level stage
+#
+# Library code marks its stages with bank_profile.stage(); these are no-ops
+# unless a command has activated a Profiler, so the instrumentation costs
+# nothing in normal runs:
+#
+#   with bank_profile.stage('write', bank=file_path) as record:
+#       record['rows'] = append_rows(file_path, rows)
+#
+# A record can carry rows, bytes_read and bytes_written; rows/s and peak RSS
+# are added when the stage ends.
+
+_active = None
+
+
+def peak_rss_kb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+class Profiler:
+    def __init__(self, command, output=None, dump_path=None):
+        self.command = command
+        self.output = output
+        self.dump_path = dump_path
+        self.records = []
+        self._stack = []
+        self._slowest = None
+        self._start = time.perf_counter()
+
+    @classmethod
+    def from_args(cls, command, args):
+        return cls(command, args.profile, args.profile_dump)
+
+    def _emit(self, record):
+        self.records.append(record)
+        line = json.dumps(record, ensure_ascii=False)
+        if self.output == '-':
+            print(line, file=sys.stderr)
+        elif self.output:
+            with open(self.output, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+
+    def record(self, name, seconds, **fields):
+        """Record a stage that was timed elsewhere (e.g. in a worker process)."""
+        record = {'command': self.command, 'stage': name,
+                  'parent': self._stack[-1] if self._stack else None, **fields}
+        self._finish(record, seconds)
+
+    def _finish(self, record, seconds):
+        record['seconds'] = seconds
+        rows = record.get('rows')
+        record['rows_per_s'] = rows / seconds if rows is not None and seconds > 0 else None
+        record['peak_rss_kb'] = peak_rss_kb()
+        record['ts'] = time.time()
+        self._emit(record)
+
+    @contextmanager
+    def stage(self, name, **fields):
+        record = {'command': self.command, 'stage': name,
+                  'parent': self._stack[-1] if self._stack else None, **fields}
+        # Only top-level stages are run under cProfile; it cannot nest
+        profiler = cProfile.Profile() if self.dump_path and not self._stack else None
+        self._stack.append(name)
+        start = time.perf_counter()
+        if profiler:
+            profiler.enable()
+        try:
+            yield record
+        finally:
+            if profiler:
+                profiler.disable()
+            seconds = time.perf_counter() - start
+            self._stack.pop()
+            if profiler and (self._slowest is None or seconds > self._slowest[0]):
+                self._slowest = (seconds, name, profiler)
+            self._finish(record, seconds)
+
+    def close(self, **fields):
+        """Emit the 'total' record and write the cProfile dump, if any."""
+        self._finish({'command': self.command, 'stage': 'total', 'parent': None, **fields},
+                     time.perf_counter() - self._start)
+        if self._slowest:
+            seconds, name, profiler = self._slowest
+            profiler.dump_stats(self.dump_path)
+            print(f'  cProfile dump of the slowest stage ({name}, {seconds:.2f}s) written to {self.dump_path}',
+                  file=sys.stderr)
+
+
+def add_arguments(parser):
+    parser.add_argument('--profile', metavar='FILE',
+                        help="append per-stage timings as JSON lines to FILE ('-' for stderr)")
+    parser.add_argument('--profile-dump', metavar='FILE',
+                        help='write a cProfile dump of the slowest stage to FILE')
+
+
+def activate(profiler):
+    """Make profiler receive the stages marked with stage(). Passing a
+    profiler with no output and no dump path leaves profiling off."""
+    global _active
+    _active = profiler if profiler and (profiler.output or profiler.dump_path) else None
+    return _active
+
+
+@contextmanager
+def stage(name, **fields):
+    if _active is None:
+        yield fields
+        return
+    with _active.stage(name, **fields) as record:
+        yield record
+
+
+def record(name, seconds, **fields):
+    if _active is not None:
+        _active.record(name, seconds, **fields)
+
+
+def close(**fields):
+    global _active
+    if _active is not None:
+        _active.close(**fields)
+        _active = None
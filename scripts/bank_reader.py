@@ -0,0 +1,196 @@
+import argparse
+import csv
+import io
+import mmap
+import os
+import random
+import struct
+import sys
+from array import array
+
+import bank_profile
+from bank_io import csv_writer, sidecar_path, write_bytes_atomic
+
+# Random access to a bank without parsing it. The file is memory-mapped and a
+# sidecar ('.questions.offsets') holds the byte offset of every data row, so a
+# row is read by slicing the map and parsing just that record. The sidecar is
+# rebuilt whenever the bank's size or mtime no longer match the ones it was
+# built from.
+
+OFFSETS_VERSION = 1
+# magic, version, bank size, bank mtime_ns, data rows
+_HEADER = struct.Struct('<4sIQqQ')
+_MAGIC = b'QOFF'
+
+
+def offsets_path(file_path):
+    return sidecar_path(file_path, 'offsets')
+
+
+def scan_offsets(f):
+    """Byte offsets of every record in a binary file object, followed by the
+    file size. A line only starts a record if the quotes before it are
+    balanced, so cells with embedded newlines stay in one record; blank lines
+    outside quotes are skipped the same way csv.reader skips them."""
+    offsets = array('Q')
+    position = 0
+    in_quotes = False
+    for line in f:
+        if not in_quotes and line.strip(b'\r\n'):
+            offsets.append(position)
+        # "" inside a quoted cell adds two quotes, so parity is enough
+        if line.count(b'"') % 2:
+            in_quotes = not in_quotes
+        position += len(line)
+    offsets.append(position)
+    return offsets
+
+
+def _load_offsets(path, stat):
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    if len(data) < _HEADER.size:
+        return None
+    magic, version, size, mtime_ns, count = _HEADER.unpack_from(data)
+    if (magic, version, size, mtime_ns) != (_MAGIC, OFFSETS_VERSION, stat.st_size, stat.st_mtime_ns):
+        return None
+    offsets = array('Q')
+    offsets.frombytes(data[_HEADER.size:])
+    if sys.byteorder != 'little':
+        offsets.byteswap()
+    # count data rows + the header row + the end-of-file sentinel
+    return offsets if len(offsets) == count + 2 else None
+
+
+def _save_offsets(path, stat, offsets):
+    data = array('Q', offsets)
+    if sys.byteorder != 'little':
+        data.byteswap()
+    header = _HEADER.pack(_MAGIC, OFFSETS_VERSION, stat.st_size, stat.st_mtime_ns, len(offsets) - 2)
+    write_bytes_atomic(path, header + data.tobytes())
+
+
+class BankReader:
+    """Read-only, random-access view of one questions.csv.
+
+    Row ids count data rows from 1, like DedupIndex and the '<topic>-q<row>'
+    ids the app assigns. Memory use does not grow with the size of the bank
+    beyond the offset table (8 bytes per row).
+
+        with BankReader.open(path) as bank:
+            quiz = bank.sample(20)
+    """
+
+    def __init__(self, file_path, offsets, f, mapped):
+        self.file_path = file_path
+        self._offsets = offsets
+        self._file = f
+        self._map = mapped
+        self.header = self._parse(0) if len(offsets) > 1 else []
+
+    @classmethod
+    def open(cls, file_path, use_cache=True):
+        f = open(file_path, 'rb')
+        try:
+            stat = os.fstat(f.fileno())
+            path = offsets_path(file_path)
+            offsets = _load_offsets(path, stat) if use_cache else None
+            if offsets is None:
+                offsets = scan_offsets(f)
+                # An empty file has no header row to index (and is free to scan)
+                if len(offsets) >= 2:
+                    _save_offsets(path, stat, offsets)
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else b''
+        except BaseException:
+            f.close()
+            raise
+        return cls(file_path, offsets, f, mapped)
+
+    def close(self):
+        # The map must be released before the bank can be replaced on Windows
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return max(len(self._offsets) - 2, 0)
+
+    def _parse(self, record):
+        start, end = self._offsets[record], self._offsets[record + 1]
+        text = self._map[start:end].decode('utf-8')
+        return next(csv.reader(io.StringIO(text, newline='')), [])
+
+    def row(self, row_id):
+        """The data row with the given 1-based id."""
+        if not 1 <= row_id <= len(self):
+            raise IndexError(f'row {row_id} out of range 1..{len(self)}')
+        return self._parse(row_id)
+
+    def rows(self, start=1, stop=None):
+        """Yield (row_id, row) for row ids start..stop-1."""
+        stop = len(self) + 1 if stop is None else min(stop, len(self) + 1)
+        for row_id in range(max(start, 1), stop):
+            yield row_id, self._parse(row_id)
+
+    def page(self, number, size=20):
+        """The 1-based page number of (row_id, row) pairs."""
+        start = (number - 1) * size + 1
+        return list(self.rows(start, start + size))
+
+    def sample(self, k, rng=None):
+        """k distinct (row_id, row) pairs chosen uniformly at random."""
+        rng = rng or random
+        ids = rng.sample(range(1, len(self) + 1), min(k, len(self)))
+        return [(row_id, self._parse(row_id)) for row_id in ids]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Read rows from a bank by id, page or random sample.')
+    parser.add_argument('bank', help='path to a questions.csv')
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--row', type=int, action='append', help='row id to print (repeatable)')
+    group.add_argument('--page', type=int, help='page number to print')
+    group.add_argument('--sample', type=int, help='number of random rows to print')
+    parser.add_argument('--page-size', type=int, default=20)
+    parser.add_argument('--seed', type=int)
+    bank_profile.add_arguments(parser)
+    args = parser.parse_args(argv)
+    bank_profile.activate(bank_profile.Profiler.from_args('bank_reader', args))
+
+    # Opening covers loading (or rebuilding) the offsets sidecar
+    with bank_profile.stage('open', bank=args.bank) as record:
+        bank = BankReader.open(args.bank)
+        record['rows'] = len(bank)
+    with bank:
+        with bank_profile.stage('read', bank=args.bank) as record:
+            if args.row:
+                selected = [(row_id, bank.row(row_id)) for row_id in args.row]
+            elif args.page:
+                selected = bank.page(args.page, args.page_size)
+            elif args.sample:
+                selected = bank.sample(args.sample, random.Random(args.seed))
+            else:
+                selected = None
+            record['rows'] = len(selected or [])
+        if selected is None:
+            print(f'{len(bank)} rows, {len(bank.header)} columns')
+        else:
+            writer = csv_writer(sys.stdout)
+            writer.writerow(['Row'] + bank.header)
+            for row_id, row in selected:
+                writer.writerow([row_id] + row)
+    bank_profile.close(rows=len(selected or []))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,296 @@
+import argparse
+import csv
+import io
+import json
+import os
+import re
+import sys
+import time
+from functools import lru_cache
+from itertools import accumulate
+
+import bank_profile
+from bank_compile import row_to_question
+from bank_index import read_tail
+from bank_io import BANK_FILE, PUBLIC_DIR, load_json, open_bank, sidecar_path, write_text_atomic
+from bank_reader import BankReader
+from bank_shards import SHARD_DIR, shard_name
+
+# Inverted index over the whole question library, so a search ("every question
+# about denominators", "every Hard MCQ with Concept = Fractions") never has to
+# open a CSV.
+#
+# The 'search' build stage indexes one bank into '.questions.search.json':
+# postings for the stemmed words of the question, hint and know-more text,
+# postings for Concept, Type, Difficulty and Worksheet No, and for every row
+# the shard it was compiled into and its position there. When the bank has
+# only grown since the last build, just the appended rows are read.
+#
+# build_banks then merges the per-bank indexes into public/search_index.json:
+#
+#   {"version": 1,
+#    "banks": [{"path", "sha256", "offset", "rows", "shards": [...],
+#               "locations": [[shard, position] or null per row]}],
+#    "terms": {"denomin": [...]},
+#    "fields": {"concept": {"Fractions": [...]}, "type": {...},
+#               "difficulty": {...}, "worksheet": {...}}}
+#
+# Documents are numbered across the library (a bank's offset plus its row
+# number, counting from 1 as the app does) and every posting list is sorted
+# and delta-encoded: [first, gap, gap, ...].
+
+SEARCH_VERSION = 1
+SEARCH_INDEX_FILE = 'search_index.json'
+FIELDS = ('concept', 'type', 'difficulty', 'worksheet')
+
+_TOKEN = re.compile(r'\d+/\d+|\w+')
+_STOPWORDS = frozenset(
+    'a an and are as at be by can do does for from has have how in is it its of on or that the '
+    'then there this to was what when where which who why will with'.split())
+# Light suffix stripping, first match wins. Queries go through the same
+# function, so 'denominators' finds 'denominator'.
+_SUFFIXES = [('sses', 'ss'), ('ies', 'y'), ('ches', 'ch'), ('shes', 'sh'), ('xes', 'x'),
+             ('ss', 'ss'), ('us', 'us'), ('s', ''), ('ingly', ''), ('ing', ''), ('edly', ''),
+             ('ed', ''), ('ly', '')]
+
+
+# The vocabulary is small next to the number of words indexed
+@lru_cache(maxsize=65536)
+def stem(word):
+    if len(word) <= 3 or not word.isalpha():
+        return word
+    for suffix, replacement in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:len(word) - len(suffix)] + replacement
+            break
+    # 'share' and 'shared' both become 'shar'
+    return word[:-1] if word.endswith('e') and len(word) > 4 else word
+
+
+def tokenize(text):
+    """Distinct stemmed words of text, without stopwords. Fractions such as
+    '3/4' are kept whole."""
+    return {stem(token) for token in set(_TOKEN.findall(text.lower())) - _STOPWORDS}
+
+
+def search_state_path(file_path):
+    return sidecar_path(file_path, 'search.json')
+
+
+def _empty_state():
+    return {
+        'version': SEARCH_VERSION,
+        'rows': 0,
+        'shards': [],
+        'shard_counts': {},
+        'locations': [],
+        'terms': {},
+        'fields': {field: {} for field in FIELDS},
+    }
+
+
+def _index_rows(state, rows):
+    """Add rows to the postings in state. Returns the number of rows added."""
+    start = state['rows']
+    shard_ids = {name: i for i, name in enumerate(state['shards'])}
+    counts = state['shard_counts']
+    for row in rows:
+        if not row:
+            continue
+        state['rows'] += 1
+        row_no = state['rows']
+        question = row_to_question(row, row_no)
+        if question is None:
+            state['locations'].append(None)
+            continue
+
+        # Same key and order as bank_shards.build, so positions match the shards
+        name = shard_name(question.get('worksheetNumber'), question['difficulty'], question['questionType'])
+        if name not in shard_ids:
+            shard_ids[name] = len(state['shards'])
+            state['shards'].append(name)
+        state['locations'].append([shard_ids[name], counts.get(name, 0)])
+        counts[name] = counts.get(name, 0) + 1
+
+        values = {
+            'concept': row[12].strip() if len(row) > 12 else '',
+            'type': question['questionType'],
+            'difficulty': question['difficulty'],
+            'worksheet': str(question.get('worksheetNumber', '')),
+        }
+        for field, value in values.items():
+            if value:
+                state['fields'][field].setdefault(value, []).append(row_no)
+        text = ' '.join([question['text'], question.get('hint', ''), question.get('knowMoreText', '')])
+        for term in tokenize(text):
+            state['terms'].setdefault(term, []).append(row_no)
+    return state['rows'] - start
+
+
+def build(file_path, source_hash):
+    """Build stage: index the bank for search. Row numbers only grow, so rows
+    appended since the last build are indexed on top of the saved postings;
+    any other edit rebuilds the bank's index from scratch."""
+    path = search_state_path(file_path)
+    state = load_json(path)
+    stat = os.stat(file_path)
+    appended = (state and state.get('version') == SEARCH_VERSION and stat.st_size > state['size']
+                and read_tail(file_path, state['size']) == state['tail'])
+    if appended:
+        with open(file_path, 'rb') as raw:
+            raw.seek(state['size'])
+            with io.TextIOWrapper(raw, encoding='utf-8', newline='') as f:
+                indexed = _index_rows(state, csv.reader(f))
+    else:
+        state = _empty_state()
+        with open_bank(file_path) as (_, rows):
+            indexed = _index_rows(state, rows)
+
+    state.update(sha256=source_hash, size=stat.st_size, tail=read_tail(file_path, stat.st_size))
+    write_text_atomic(path, json.dumps(state, ensure_ascii=False, separators=(',', ':')))
+    return [path], indexed
+
+
+def _delta(ids):
+    return [b - a for a, b in zip([0] + ids, ids)]
+
+
+def update_search_index(public_dir, banks):
+    """Merge the per-bank indexes of banks into public/search_index.json.
+    Returns False when every bank is unchanged since the last merge."""
+    index_path = os.path.join(public_dir, SEARCH_INDEX_FILE)
+    states = []
+    for file_path in banks:
+        state = load_json(search_state_path(file_path))
+        if state and state.get('version') == SEARCH_VERSION:
+            states.append((os.path.relpath(os.path.dirname(file_path), public_dir).replace(os.sep, '/'), state))
+
+    previous = load_json(index_path)
+    if previous and previous.get('version') == SEARCH_VERSION and (
+            [[bank['path'], bank['sha256']] for bank in previous['banks']]
+            == [[path, state['sha256']] for path, state in states]):
+        return False
+
+    entries, terms, fields = [], {}, {field: {} for field in FIELDS}
+    offset = 0
+    for path, state in states:
+        entries.append({
+            'path': path,
+            'sha256': state['sha256'],
+            'offset': offset,
+            'rows': state['rows'],
+            'shards': [f'{SHARD_DIR}/{name}' for name in state['shards']],
+            'locations': state['locations'],
+        })
+        # Banks are merged in order with growing offsets, so lists stay sorted
+        for term, rows in state['terms'].items():
+            terms.setdefault(term, []).extend(offset + row for row in rows)
+        for field in FIELDS:
+            for value, rows in state['fields'][field].items():
+                fields[field].setdefault(value, []).extend(offset + row for row in rows)
+        offset += state['rows']
+
+    write_text_atomic(index_path, json.dumps({
+        'version': SEARCH_VERSION,
+        'banks': entries,
+        'terms': {term: _delta(ids) for term, ids in sorted(terms.items())},
+        'fields': {field: {value: _delta(ids) for value, ids in sorted(values.items())}
+                   for field, values in fields.items()},
+    }, ensure_ascii=False, separators=(',', ':')))
+    return True
+
+
+class SearchIndex:
+    """Queries over public/search_index.json. Posting lists are decoded on
+    first use."""
+
+    def __init__(self, data):
+        self.banks = data['banks']
+        self.terms = data['terms']
+        self.fields = data['fields']
+        self._decoded = {}
+
+    @classmethod
+    def load(cls, public_dir=PUBLIC_DIR):
+        data = load_json(os.path.join(public_dir, SEARCH_INDEX_FILE))
+        if not data or data.get('version') != SEARCH_VERSION:
+            raise ValueError(f'{SEARCH_INDEX_FILE} is missing or outdated; run scripts/build_banks.py')
+        return cls(data)
+
+    def _postings(self, key, encoded):
+        if key not in self._decoded:
+            self._decoded[key] = list(accumulate(encoded or []))
+        return self._decoded[key]
+
+    def search(self, text='', **filters):
+        """Documents matching every word of text and every field filter
+        (concept='Fractions', difficulty='Hard', ...), in library order."""
+        lists = [self._postings(('term', term), self.terms.get(term)) for term in tokenize(text)]
+        for field, value in filters.items():
+            if value is not None:
+                lists.append(self._postings((field, value), self.fields[field].get(str(value))))
+        if not lists:
+            return []
+        lists.sort(key=len)
+        hits = set(lists[0])
+        for postings in lists[1:]:
+            hits.intersection_update(postings)
+            if not hits:
+                break
+        return sorted(hits)
+
+    def locate(self, doc):
+        """(bank folder, row, shard file, position in the shard) of a
+        document."""
+        low, high = 0, len(self.banks) - 1
+        while low < high:
+            mid = (low + high + 1) // 2
+            if self.banks[mid]['offset'] < doc:
+                low = mid
+            else:
+                high = mid - 1
+        bank = self.banks[low]
+        row = doc - bank['offset']
+        shard, position = bank['locations'][row - 1]
+        return bank['path'], row, bank['shards'][shard], position
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Search the question library through public/search_index.json.')
+    parser.add_argument('query', nargs='*', help='words that must all appear (question, hint, know more)')
+    parser.add_argument('--public-dir', default=PUBLIC_DIR)
+    parser.add_argument('--concept')
+    parser.add_argument('--type', choices=['MCQ', 'TTA', 'FIB'])
+    parser.add_argument('--difficulty', choices=['Easy', 'Medium', 'Hard'])
+    parser.add_argument('--worksheet', help='Worksheet No')
+    parser.add_argument('--limit', type=int, default=20, help='hits to print (default: 20)')
+    bank_profile.add_arguments(parser)
+    args = parser.parse_args(argv)
+    bank_profile.activate(bank_profile.Profiler.from_args('bank_search', args))
+
+    with bank_profile.stage('load'):
+        index = SearchIndex.load(args.public_dir)
+    start = time.perf_counter()
+    with bank_profile.stage('query') as record:
+        hits = index.search(' '.join(args.query), concept=args.concept, type=args.type,
+                            difficulty=args.difficulty, worksheet=args.worksheet)
+        record['rows'] = len(hits)
+    elapsed = time.perf_counter() - start
+
+    readers = {}
+    try:
+        for doc in hits[:args.limit]:
+            path, row, shard, position = index.locate(doc)
+            if path not in readers:
+                readers[path] = BankReader.open(os.path.join(args.public_dir, path, BANK_FILE))
+            print(f'  {path}:{row}  {shard}#{position}  {readers[path].row(row)[0][:100]}')
+    finally:
+        for reader in readers.values():
+            reader.close()
+    bank_profile.close(rows=len(hits))
+    print(f'✅ {len(hits)} questions match ({elapsed * 1000:.2f} ms).')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,73 @@
+import json
+import os
+from contextlib import ExitStack
+
+from bank_compile import ARTIFACT_VERSION, iter_questions
+from bank_io import atomic_file, write_json_atomic
+
+SHARD_DIR = 'shards'
+SHARD_MANIFEST = 'manifest.json'
+
+
+def shard_dir(file_path):
+    return os.path.join(os.path.dirname(file_path), SHARD_DIR)
+
+
+def shard_name(worksheet, difficulty, qtype):
+    return f"w{worksheet if worksheet is not None else 'x'}-{difficulty.lower()}-{qtype.lower()}.json"
+
+
+def build(file_path, source_hash):
+    """Build stage: split the compiled questions into one shard per
+    (worksheet, difficulty, type) plus a small manifest, so the client only
+    downloads the slice a quiz needs.
+
+    Questions are streamed straight into the open shard files; shards left
+    over from an earlier build that no longer have rows are removed."""
+    directory = shard_dir(file_path)
+    os.makedirs(directory, exist_ok=True)
+
+    shards = {}
+    # Each shard goes through its own atomic temp file; if the stage fails,
+    # every temp file is discarded and the previous shards stay in place
+    with ExitStack() as stack:
+        for question in iter_questions(file_path):
+            key = (question.get('worksheetNumber'), question['difficulty'], question['questionType'])
+            shard = shards.get(key)
+            if shard is None:
+                name = shard_name(*key)
+                f = stack.enter_context(atomic_file(os.path.join(directory, name)))
+                f.write(f'{{"version":{ARTIFACT_VERSION},"sha256":"{source_hash}","questions":[')
+                shard = shards[key] = {'name': name, 'file': f, 'count': 0}
+            if shard['count']:
+                shard['file'].write(',')
+            shard['file'].write(json.dumps(question, ensure_ascii=False, separators=(',', ':')))
+            shard['count'] += 1
+        for shard in shards.values():
+            shard['file'].write(']}')
+
+    entries = []
+    for (worksheet, difficulty, qtype), shard in sorted(shards.items(), key=lambda item: item[1]['name']):
+        path = os.path.join(directory, shard['name'])
+        entries.append({
+            'file': shard['name'],
+            'worksheet': worksheet,
+            'difficulty': difficulty,
+            'type': qtype,
+            'count': shard['count'],
+            'bytes': os.path.getsize(path),
+        })
+
+    keep = {entry['file'] for entry in entries} | {SHARD_MANIFEST}
+    for name in os.listdir(directory):
+        if name.endswith('.json') and name not in keep:
+            os.unlink(os.path.join(directory, name))
+
+    manifest_path = os.path.join(directory, SHARD_MANIFEST)
+    write_json_atomic(manifest_path, {
+        'version': ARTIFACT_VERSION,
+        'sha256': source_hash,
+        'shards': entries,
+    })
+    outputs = [manifest_path] + [os.path.join(directory, entry['file']) for entry in entries]
+    return outputs, sum(entry['count'] for entry in entries)
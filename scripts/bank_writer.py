@@ -0,0 +1,121 @@
+import itertools
+import os
+
+import bank_profile
+from bank_index import DedupIndex
+from bank_io import append_rows, read_header, rewrite_bank
+from bank_journal import Journal, bank_lock
+from migrations import SCHEMA_VERSION, current_version, upgrade, write_manifest
+
+
+def add_rows(file_path, rows):
+    """Add rows to a bank, skipping questions it already holds. Safe to call
+    from several processes at once on the same bank.
+
+    The rows are journaled first (see bank_journal) and then committed under
+    the bank lock, together with whatever other writers journaled meanwhile.
+    Banks that are already on the current schema get the new rows appended
+    in place. Older banks are streamed through the pending migrations into a
+    temp file with the new rows at the end and swapped in atomically.
+    Returns (inserted, skipped)."""
+    journal = Journal(file_path)
+    with bank_profile.stage('journal', bank=file_path) as record:
+        rows = list(rows)
+        record_id = journal.append(rows)
+        record['rows'] = len(rows)
+    with bank_profile.stage('lock-wait', bank=file_path):
+        with bank_lock(file_path):
+            # Another writer may have committed this batch while we waited
+            result = journal.result(record_id) or commit_pending(file_path).get(record_id)
+            if result is None:
+                # Neither committed nor in the journal any more (its result
+                # aged out, or the journal was damaged): journal the rows again
+                # and commit them while still holding the lock. Dedup skips
+                # any that did reach the bank.
+                record_id = journal.append(rows)
+                result = commit_pending(file_path)[record_id]
+    return tuple(result)
+
+
+def commit_pending(file_path):
+    """Commit every journaled batch of a bank in one pass: undo an append
+    that a crash interrupted, dedup all batches in journal order and write
+    the fresh rows with a single append (or migration rewrite). Returns
+    {record id: (inserted, skipped)} for the batches committed."""
+    journal = Journal(file_path)
+    with bank_lock(file_path):
+        journal.recover()
+        records, end = journal.pending()
+        if not records:
+            return {}
+
+        with bank_profile.stage('dedup-index', bank=file_path) as record:
+            index = DedupIndex.open(file_path)
+            record['rows'] = index.scanned
+        results = {}
+        fresh_rows = []
+        with bank_profile.stage('dedup', bank=file_path, batches=len(records)) as record:
+            for entry in records:
+                fresh = [row for row in entry['rows'] if index.claim(row)]
+                results[entry['id']] = (len(fresh), len(entry['rows']) - len(fresh))
+                fresh_rows.extend(fresh)
+            record['rows'] = sum(len(entry['rows']) for entry in records)
+
+        size = os.path.getsize(file_path)
+        version = current_version(file_path)
+        if version == SCHEMA_VERSION or 'Difficulty' in read_header(file_path):
+            with bank_profile.stage('append', bank=file_path) as record:
+                journal.begin(end)
+                record['rows'] = append_rows(file_path, fresh_rows)
+                record['bytes_written'] = os.path.getsize(file_path) - size
+        else:
+            def migrate_and_append(header, body):
+                header, migrated = upgrade(header, body, version)
+                return header, itertools.chain(migrated, fresh_rows)
+
+            with bank_profile.stage('migrate-append', bank=file_path, bytes_read=size) as record:
+                record['rows'] = rewrite_bank(file_path, migrate_and_append)
+                record['bytes_written'] = os.path.getsize(file_path)
+            version = SCHEMA_VERSION
+
+        with bank_profile.stage('save-index', bank=file_path):
+            index.save()
+            if version == SCHEMA_VERSION:
+                write_manifest(file_path)
+        journal.finish(end, results)
+    return results
+
+
+def update_rows(file_path, update):
+    """Stream every row of a bank through update(row), which edits the row in
+    place and returns True if it changed it, and atomically swap in the
+    result. Pending schema migrations are applied in the same pass, so the
+    rewritten bank is always on the current schema. Returns the number of
+    rows changed. Journaled rows are committed first, and the bank lock is
+    held throughout, so concurrent add_rows calls are not lost."""
+    with bank_lock(file_path):
+        commit_pending(file_path)
+        return _update_rows(file_path, update)
+
+
+def _update_rows(file_path, update):
+    version = current_version(file_path)
+    changed = 0
+
+    def transform(header, body):
+        header, migrated = upgrade(header, body, version)
+
+        def updated():
+            nonlocal changed
+            for row in migrated:
+                if update(row):
+                    changed += 1
+                yield row
+
+        return header, updated()
+
+    with bank_profile.stage('rewrite', bank=file_path, bytes_read=os.path.getsize(file_path)) as record:
+        record['rows'] = rewrite_bank(file_path, transform)
+        record['bytes_written'] = os.path.getsize(file_path)
+    write_manifest(file_path)
+    return changed
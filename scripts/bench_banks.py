@@ -0,0 +1,225 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from bank_index import DedupIndex
+from bank_io import COLUMNS, BANK_FILE, append_rows, csv_writer
+import bank_profile
+from bank_profile import peak_rss_kb
+from bank_writer import add_rows
+from build_banks import build_bank
+from migrations import migrate_bank
+from validate_banks import validate_bank
+
+# Benchmarks the bank tooling on synthetic banks. Every stage runs in a fresh
+# process against the same bank, in order, so each one sees the state the
+# previous one left behind (the way a real bank update runs) and its peak RSS
+# is its own.
+
+RESULTS_VERSION = 1
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+# Rows added by the append and dedup stages, as a fraction of the bank
+APPEND_FRACTION = 0.01
+DEDUP_BATCH = 1_000
+
+_TOPICS = ['Fractions', 'Verbs', 'Simple Present', 'Decimals', 'Measurement']
+_DIFFICULTIES = ['Easy', 'Medium', 'Hard']
+
+
+def synthetic_row(i):
+    """Row i of a synthetic bank. Deterministic in i, so a stage can rebuild
+    rows that are already in the bank. Cells carry quoted commas and
+    embedded newlines, like the hints and explanations in the real banks."""
+    rng = random.Random(i)
+    a, b = rng.randint(1, 999), rng.randint(1, 999)
+    answer = str(a + b)
+    options = [answer, str(a + b + 1), str(a + b - 1), str(a + b + 10)]
+    rng.shuffle(options)
+    kind = i % 10
+    return [
+        f'Q{i}: {a} + {b} = ?' if kind else f'Q{i}: Read this, then answer: what is {a} + {b}?',
+        *options,
+        answer,
+        f'Add the ones, then the tens, then the hundreds.\nStart with {a % 10} + {b % 10}.',
+        'Carrying: when a column adds up to 10 or more, write the ones digit and carry 1, "regroup" it.'
+        if kind < 3 else '',
+        'https://example.com/addition',
+        '',
+        '',
+        'MCQ',
+        _TOPICS[i % len(_TOPICS)],
+        str(1 + i % 12),
+        _DIFFICULTIES[i % len(_DIFFICULTIES)],
+    ]
+
+
+def write_synthetic_bank(file_path, rows):
+    with open(file_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv_writer(f)
+        writer.writerow(COLUMNS)
+        for i in range(rows):
+            writer.writerow(synthetic_row(i))
+
+
+def _stage_migrate(file_path, rows):
+    # No manifest yet, so the whole bank is streamed through upgrade()
+    return migrate_bank(file_path)['rows']
+
+
+def _stage_index(file_path, rows):
+    index = DedupIndex.open(file_path)
+    index.save()
+    return index.scanned
+
+
+def _stage_append(file_path, rows):
+    count = max(1, int(rows * APPEND_FRACTION))
+    return append_rows(file_path, (synthetic_row(i) for i in range(rows, rows + count)))
+
+
+def _stage_dedup(file_path, rows):
+    # Half the batch is already in the bank, half is new
+    appended = max(1, int(rows * APPEND_FRACTION))
+    rng = random.Random(rows)
+    old = rng.sample(range(rows), min(rows, DEDUP_BATCH // 2))
+    new = range(rows + appended, rows + appended + DEDUP_BATCH // 2)
+    inserted, skipped = add_rows(file_path, [synthetic_row(i) for i in [*old, *new]])
+    return inserted + skipped
+
+
+def _stage_validate(file_path, rows):
+    return validate_bank(file_path, use_cache=False)['rows']
+
+
+def _stage_build(file_path, rows):
+    build_bank(file_path, force=True)
+    return rows
+
+
+# Run in this order; each stage works on the bank the previous one left
+STAGES = [
+    ('migrate', _stage_migrate),
+    ('index', _stage_index),
+    ('append', _stage_append),
+    ('dedup', _stage_dedup),
+    ('validate', _stage_validate),
+    ('build', _stage_build),
+]
+
+
+def _run_stage(name, file_path, rows):
+    stage = dict(STAGES)[name]
+    size = os.path.getsize(file_path)
+    start = time.perf_counter()
+    processed = stage(file_path, rows)
+    seconds = time.perf_counter() - start
+    return {
+        'stage': name,
+        'rows': processed,
+        'bytes': size,
+        'seconds': seconds,
+        'rows_per_s': processed / seconds if seconds > 0 else None,
+        'peak_rss_kb': peak_rss_kb(),
+    }
+
+
+def run_size(rows, work_dir, stages):
+    """Generate a bank of the given size and run the stages on it. Returns the
+    per-stage results."""
+    bank_dir = os.path.join(work_dir, f'Worksheet {rows}')
+    os.makedirs(bank_dir)
+    file_path = os.path.join(bank_dir, BANK_FILE)
+    write_synthetic_bank(file_path, rows)
+
+    results = []
+    # One short-lived process per stage keeps the peak RSS figures separate
+    context = multiprocessing.get_context('spawn')
+    for name, _ in STAGES:
+        if stages and name not in stages:
+            continue
+        with context.Pool(1) as pool:
+            result = pool.apply(_run_stage, (name, file_path, rows))
+        result['bank_rows'] = rows
+        results.append(result)
+    shutil.rmtree(bank_dir)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Results whose rows/s dropped by more than tolerance against the
+    baseline run, as (result, baseline_rows_per_s) pairs."""
+    previous = {(r['bank_rows'], r['stage']): r for r in baseline.get('results', [])}
+    regressions = []
+    for result in results:
+        old = previous.get((result['bank_rows'], result['stage']))
+        if old and old['rows_per_s'] and result['rows_per_s'] is not None:
+            if result['rows_per_s'] < old['rows_per_s'] * (1 - tolerance):
+                regressions.append((result, old['rows_per_s']))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the question-bank tooling on synthetic banks.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='bank sizes in rows')
+    parser.add_argument('--stage', action='append', choices=[name for name, _ in STAGES],
+                        help='only run this stage (repeatable)')
+    parser.add_argument('--output', default='bench_results.json', help='where to write the JSON results')
+    parser.add_argument('--baseline', help='earlier results file to compare rows/s against')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='allowed rows/s drop against the baseline (default: 0.2)')
+    parser.add_argument('--work-dir', help='where to create the synthetic banks (default: a temp dir)')
+    bank_profile.add_arguments(parser)
+    args = parser.parse_args(argv)
+    # Stages run in worker processes, so they are recorded from the results
+    # and --profile-dump covers nothing here
+    bank_profile.activate(bank_profile.Profiler.from_args('bench_banks', args))
+
+    work_dir = tempfile.mkdtemp(prefix='bank-bench-', dir=args.work_dir)
+    results = []
+    try:
+        for rows in args.sizes:
+            print(f'{rows:,} rows:')
+            for result in run_size(rows, work_dir, args.stage):
+                rss = result['peak_rss_kb']
+                print(f"  {result['stage']}: {result['rows']:,} rows in {result['seconds'] * 1000:.1f} ms "
+                      f"({result['rows_per_s'] or 0:,.0f} rows/s"
+                      + (f', peak RSS {rss / 1024:.1f} MB)' if rss is not None else ')'))
+                bank_profile.record(result['stage'], result['seconds'], rows=result['rows'],
+                                    bank_rows=rows, bytes_read=result['bytes'], worker_peak_rss_kb=rss)
+                results.append(result)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'version': RESULTS_VERSION,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'results': results,
+        }, f, indent=2)
+        f.write('\n')
+
+    bank_profile.close(rows=len(results))
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for result, old in regressions:
+            print(f"  {result['stage']} @ {result['bank_rows']:,} rows: "
+                  f"{result['rows_per_s']:,.0f} rows/s, was {old:,.0f}")
+        if regressions:
+            print(f'❌ {len(regressions)} regressions against {args.baseline}; results in {args.output}.')
+            return 1
+    print(f'✅ {len(results)} measurements written to {args.output}.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
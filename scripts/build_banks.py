@@ -0,0 +1,107 @@
+import argparse
+import os
+import sys
+import time
+
+import bank_answers
+import bank_compile
+import bank_delta
+import bank_master_index
+import bank_profile
+import bank_search
+import bank_shards
+from bank_io import PUBLIC_DIR, discover_banks, load_json, sidecar_path, write_json_atomic
+from migrations import file_sha256
+
+# Build stages, in order. Each takes (file_path, source_hash) and returns
+# (paths it wrote, rows it processed). A stage only re-runs when the bank's content hash differs
+# from the one recorded for it in '.questions.build.json', or when one of its
+# outputs has gone missing. The hash itself is only recomputed when the
+# bank's size or mtime moved.
+STAGES = [
+    ('compile', bank_compile.build),
+    ('shards', bank_shards.build),
+    ('delta', bank_delta.build),
+    ('search', bank_search.build),
+    ('answers', bank_answers.build),
+    ('stats', bank_master_index.build),
+]
+
+
+def build_state_path(file_path):
+    return sidecar_path(file_path, 'build.json')
+
+
+def build_bank(file_path, stages=None, force=False):
+    start = time.perf_counter()
+    state_path = build_state_path(file_path)
+    state = load_json(state_path, {})
+    stat = os.stat(file_path)
+    source = state.get('_source', {})
+    if source.get('size') == stat.st_size and source.get('mtime_ns') == stat.st_mtime_ns:
+        source_hash = source['sha256']
+    else:
+        with bank_profile.stage('hash', bank=file_path, bytes_read=stat.st_size):
+            source_hash = file_sha256(file_path)
+
+    ran = []
+    for name, stage in STAGES:
+        if stages and name not in stages:
+            continue
+        recorded = state.get(name)
+        if (not force and recorded and recorded['sha256'] == source_hash
+                and all(os.path.exists(p) for p in recorded['outputs'])):
+            continue
+        with bank_profile.stage(name, bank=file_path, bytes_read=stat.st_size) as record:
+            outputs, rows = stage(file_path, source_hash)
+            record.update(rows=rows, bytes_written=sum(os.path.getsize(p) for p in outputs))
+        state[name] = {'sha256': source_hash, 'outputs': outputs}
+        ran.append(name)
+
+    current = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': source_hash}
+    if ran or source != current:
+        state['_source'] = current
+        write_json_atomic(state_path, state, indent=2)
+    return {'path': file_path, 'ran': ran, 'seconds': time.perf_counter() - start}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build the client artifacts for every worksheet bank.')
+    parser.add_argument('banks', nargs='*', help='questions.csv files (default: every public/Worksheet*/questions.csv)')
+    parser.add_argument('--public-dir', default=PUBLIC_DIR)
+    parser.add_argument('--stage', action='append', choices=[name for name, _ in STAGES],
+                        help='only run this stage (repeatable)')
+    parser.add_argument('--force', action='store_true', help='rebuild even if the source is unchanged')
+    bank_profile.add_arguments(parser)
+    args = parser.parse_args(argv)
+    bank_profile.activate(bank_profile.Profiler.from_args('build_banks', args))
+
+    start = time.perf_counter()
+    banks = args.banks or discover_banks(args.public_dir)
+    rebuilt = 0
+    for file_path in banks:
+        result = build_bank(file_path, args.stage, args.force)
+        name = os.path.basename(os.path.dirname(file_path))
+        if result['ran']:
+            rebuilt += 1
+            print(f"  {name}: {', '.join(result['ran'])} ({result['seconds'] * 1000:.1f} ms)")
+        else:
+            print(f'  {name}: up to date')
+
+    with bank_profile.stage('master-index'):
+        written, skipped = bank_master_index.update_master_index(args.public_dir, banks)
+    for folder in skipped:
+        print(f'  {folder}: not added to {bank_master_index.MASTER_INDEX_FILE} (its id is already used by another folder)')
+    if written:
+        print(f'  Updated {bank_master_index.MASTER_INDEX_FILE}')
+    # Merged over every bank, not just the ones named on the command line
+    with bank_profile.stage('search-index'):
+        if bank_search.update_search_index(args.public_dir, discover_banks(args.public_dir)):
+            print(f'  Updated {bank_search.SEARCH_INDEX_FILE}')
+    bank_profile.close(banks=len(banks))
+    print(f'✅ Built {rebuilt} of {len(banks)} banks in {time.perf_counter() - start:.2f}s.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,359 @@
+import argparse
+import csv
+import hashlib
+import io
+import json
+import math
+import os
+import re
+import sys
+import time
+
+import bank_profile
+from bank_index import content_hash
+from bank_io import BANK_FILE, PUBLIC_DIR, load_json, open_bank, write_json_atomic
+from bank_writer import update_rows
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Calibrates Difficulty from how students actually answer. Reads exported
+# attempt logs, one answer per JSONL line or CSV row:
+#
+#   {"session": "s-91f2", "worksheet": "Worksheet 7 - Fractions",
+#    "question_id": "fractions-q12", "correct": true, "seconds": 14.2}
+#
+# ('row' may be given instead of 'question_id'; 'seconds' is optional.) A
+# session is one quiz run and must be exported whole, in one segment.
+#
+# Per question it keeps additive sums, so a re-run only reads log bytes it has
+# not seen before (log files are append-only segments; the state file records
+# how far each one was read) and folds them into the totals:
+#
+#   p-value          share of answers that were correct
+#   discrimination   point-biserial correlation between answering this
+#                    question correctly and the rest of the session's score
+#   mean time        average seconds per answer
+#
+# Questions are keyed by content hash, so the statistics follow a question
+# when rows move. Questions with enough answers get their Difficulty column
+# rewritten from the p-value. The aggregation is vectorized with NumPy when
+# it is installed and falls back to plain loops otherwise.
+
+STATE_VERSION = 1
+DEFAULT_STATE = 'calibration_state.json'
+MIN_ATTEMPTS = 30
+# p-value at or above EASY_P is Easy, below HARD_P is Hard, Medium in between
+EASY_P = 0.8
+HARD_P = 0.5
+# Items that separate strong and weak sessions less than this are reported
+LOW_DISCRIMINATION = 0.2
+LOG_EXTENSIONS = ('.jsonl', '.csv')
+# Bytes at the start of a segment remembered to notice it being replaced
+HEAD_BYTES = 4096
+
+# Per-question sums: answers and correct answers; for discrimination, the
+# answers from sessions with other answers, how many of those were correct,
+# and the sums of the rest score, its square and correct x rest score; and
+# the answers with a time and their seconds
+_FIELDS = ('n', 'correct', 'paired', 'paired_correct', 'rest', 'rest_sq', 'correct_rest', 'timed', 'seconds')
+_QUESTION_ID = re.compile(r'-q(\d+)$')
+_TRUE = {'1', 'true', 'yes', 'y', 't'}
+
+
+def _head(file_path, length):
+    with open(file_path, 'rb') as f:
+        return hashlib.sha256(f.read(min(length, HEAD_BYTES))).hexdigest()
+
+
+def find_segments(paths):
+    segments = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                segments.extend(os.path.join(root, name) for name in sorted(files)
+                                if name.endswith(LOG_EXTENSIONS))
+        else:
+            segments.append(path)
+    return sorted(segments)
+
+
+def read_segment(file_path, offset):
+    """Records in file_path from byte offset up to the last complete line, and
+    the offset after them."""
+    with open(file_path, 'rb') as f:
+        header = f.readline() if file_path.endswith('.csv') else b''
+        f.seek(max(offset, len(header)))
+        data = f.read()
+    end = data.rfind(b'\n') + 1
+    text = data[:end].decode('utf-8')
+    if file_path.endswith('.csv'):
+        fields = next(csv.reader([header.decode('utf-8-sig')]))
+        records = csv.DictReader(io.StringIO(text, newline=''), fieldnames=fields)
+    else:
+        records = (json.loads(line) for line in text.splitlines() if line.strip())
+    return list(records), max(offset, len(header)) + end
+
+
+def _row_number(record):
+    if record.get('row') not in (None, ''):
+        return int(record['row'])
+    match = _QUESTION_ID.search(str(record.get('question_id', '')))
+    return int(match.group(1)) if match else None
+
+
+def _correct(value):
+    return value is True or str(value).strip().lower() in _TRUE
+
+
+class ItemKeys:
+    """(worksheet, row) -> content hash, reading each bank at most once."""
+
+    def __init__(self, public_dir):
+        self.public_dir = public_dir
+        self.banks = {}
+
+    def hashes(self, worksheet):
+        if worksheet not in self.banks:
+            file_path = os.path.join(self.public_dir, worksheet, BANK_FILE)
+            hashes = []
+            if os.path.isfile(file_path):
+                with open_bank(file_path) as (_, rows):
+                    hashes = [content_hash(row) for row in rows if row]
+            self.banks[worksheet] = hashes
+        return self.banks[worksheet]
+
+    def key(self, record):
+        worksheet = record.get('worksheet')
+        row = _row_number(record)
+        if not worksheet or row is None:
+            return None
+        hashes = self.hashes(worksheet)
+        return (worksheet, hashes[row - 1]) if 0 < row <= len(hashes) else None
+
+
+def _columns(records, keys):
+    """Parallel columns (item, session, correct, seconds) of the records that
+    resolve to a question, plus the item keys and the skipped count."""
+    item_ids, session_ids = {}, {}
+    items, sessions, correct, seconds = [], [], [], []
+    skipped = 0
+    for number, record in enumerate(records):
+        key = keys.key(record)
+        if key is None:
+            skipped += 1
+            continue
+        items.append(item_ids.setdefault(key, len(item_ids)))
+        # An answer without a session stands alone and adds nothing to discrimination
+        session = record.get('session') or ('', number)
+        sessions.append(session_ids.setdefault(session, len(session_ids)))
+        correct.append(1.0 if _correct(record.get('correct')) else 0.0)
+        value = record.get('seconds')
+        seconds.append(float(value) if value not in (None, '') else math.nan)
+    return list(item_ids), (items, sessions, correct, seconds), skipped
+
+
+def _aggregate_numpy(columns, item_count):
+    items, sessions, correct, seconds = (numpy.asarray(c) for c in columns)
+    session_n = numpy.bincount(sessions)
+    session_correct = numpy.bincount(sessions, weights=correct)
+    others = session_n[sessions] - 1
+    paired = others > 0
+    # Share of the session's other answers that were correct
+    rest = numpy.divide(session_correct[sessions] - correct, others,
+                        out=numpy.zeros(len(correct)), where=paired)
+    timed = ~numpy.isnan(seconds)
+
+    def total(weights=None):
+        return numpy.bincount(items, weights=weights, minlength=item_count)
+
+    paired_correct = numpy.where(paired, correct, 0.0)
+    return numpy.column_stack([
+        total(), total(correct), total(paired.astype(float)), total(paired_correct), total(rest),
+        total(rest * rest), total(paired_correct * rest), total(timed.astype(float)),
+        total(numpy.where(timed, seconds, 0.0)),
+    ]).tolist()
+
+
+def _aggregate_python(columns, item_count):
+    items, sessions, correct, seconds = columns
+    session_n, session_correct = {}, {}
+    for session, x in zip(sessions, correct):
+        session_n[session] = session_n.get(session, 0) + 1
+        session_correct[session] = session_correct.get(session, 0.0) + x
+    sums = [[0.0] * len(_FIELDS) for _ in range(item_count)]
+    for item, session, x, t in zip(items, sessions, correct, seconds):
+        s = sums[item]
+        s[0] += 1
+        s[1] += x
+        others = session_n[session] - 1
+        if others > 0:
+            y = (session_correct[session] - x) / others
+            s[2] += 1
+            s[3] += x
+            s[4] += y
+            s[5] += y * y
+            s[6] += x * y
+        if not math.isnan(t):
+            s[7] += 1
+            s[8] += t
+    return sums
+
+
+def aggregate(records, keys):
+    """Per-question sums for a batch of records: {(worksheet, hash): sums},
+    and the number of records that did not resolve to a question."""
+    item_keys, columns, skipped = _columns(records, keys)
+    if not item_keys:
+        return {}, skipped
+    aggregate_fn = _aggregate_numpy if numpy is not None else _aggregate_python
+    return dict(zip(item_keys, aggregate_fn(columns, len(item_keys)))), skipped
+
+
+def statistics(sums):
+    """p-value, discrimination and mean time from one question's sums."""
+    n, correct, paired, paired_correct, rest, rest_sq, correct_rest, timed, seconds = sums
+    discrimination = None
+    # Point-biserial: Pearson correlation of the 0/1 answer with the rest score
+    x_spread = paired * paired_correct - paired_correct * paired_correct
+    y_spread = paired * rest_sq - rest * rest
+    if x_spread > 0 and y_spread > 1e-12:
+        discrimination = (paired * correct_rest - paired_correct * rest) / math.sqrt(x_spread * y_spread)
+    return {
+        'attempts': int(n),
+        'p_value': correct / n if n else None,
+        'discrimination': discrimination,
+        'mean_seconds': seconds / timed if timed else None,
+    }
+
+
+def difficulty(stats, min_attempts=MIN_ATTEMPTS):
+    """Easy, Medium or Hard from the p-value, or None with too few answers."""
+    if stats['attempts'] < min_attempts:
+        return None
+    if stats['p_value'] >= EASY_P:
+        return 'Easy'
+    return 'Hard' if stats['p_value'] < HARD_P else 'Medium'
+
+
+def load_state(state_path):
+    state = load_json(state_path)
+    if not state or state.get('version') != STATE_VERSION:
+        return {'version': STATE_VERSION, 'segments': {}, 'items': {}}
+    return state
+
+
+def ingest(state, segments, keys):
+    """Fold the unread part of every segment into state. Returns (records
+    read, records skipped, segments that were replaced and ignored)."""
+    read = skipped = 0
+    replaced = []
+    for path in segments:
+        name = os.path.abspath(path)
+        seen = state['segments'].get(name)
+        size = os.path.getsize(path)
+        if seen and (size < seen['offset'] or _head(path, seen['offset']) != seen['head']):
+            # Segments are append-only; a rewritten one cannot be folded in
+            # without counting its old answers twice
+            replaced.append(path)
+            continue
+        offset = seen['offset'] if seen else 0
+        if offset == size:
+            continue
+        with bank_profile.stage('ingest', segment=path, bytes_read=size - offset) as record:
+            records, end = read_segment(path, offset)
+            batch, batch_skipped = aggregate(records, keys)
+            record['rows'] = len(records)
+        for (worksheet, digest), sums in batch.items():
+            totals = state['items'].setdefault(worksheet, {}).setdefault(digest, [0.0] * len(_FIELDS))
+            for i, value in enumerate(sums):
+                totals[i] += value
+        state['segments'][name] = {'offset': end, 'head': _head(path, end)}
+        read += len(records)
+        skipped += batch_skipped
+    return read, skipped, replaced
+
+
+def calibrate_bank(file_path, items, min_attempts=MIN_ATTEMPTS, dry_run=False):
+    """Rewrite the Difficulty of every question in the bank with enough
+    answers. items maps content hash -> sums. Returns (changed, calibrated)."""
+    levels = {}
+    for digest, sums in items.items():
+        level = difficulty(statistics(sums), min_attempts)
+        if level:
+            levels[digest] = level
+    if not levels:
+        return 0, 0
+    if dry_run:
+        with open_bank(file_path) as (_, rows):
+            changed = 0
+            for row in rows:
+                level = levels.get(content_hash(row)) if row else None
+                changed += level is not None and (row[14] if len(row) > 14 else '') != level
+        return changed, len(levels)
+
+    def set_difficulty(row):
+        level = levels.get(content_hash(row))
+        if level is None or row[14] == level:
+            return False
+        row[14] = level
+        return True
+
+    return update_rows(file_path, set_difficulty), len(levels)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Calibrate question Difficulty from exported attempt logs.')
+    parser.add_argument('logs', nargs='+', help='attempt log files or folders (*.jsonl, *.csv)')
+    parser.add_argument('--public-dir', default=PUBLIC_DIR)
+    parser.add_argument('--state', default=DEFAULT_STATE,
+                        help=f'running totals and read offsets (default: {DEFAULT_STATE})')
+    parser.add_argument('--min-attempts', type=int, default=MIN_ATTEMPTS,
+                        help=f'answers needed before a Difficulty is rewritten (default: {MIN_ATTEMPTS})')
+    parser.add_argument('--report', help='also write per-question statistics to this JSON file')
+    parser.add_argument('--dry-run', action='store_true', help='report changes without touching the banks or state')
+    bank_profile.add_arguments(parser)
+    args = parser.parse_args(argv)
+    bank_profile.activate(bank_profile.Profiler.from_args('calibrate_banks', args))
+
+    start = time.perf_counter()
+    state = load_state(args.state)
+    keys = ItemKeys(args.public_dir)
+    read, skipped, replaced = ingest(state, find_segments(args.logs), keys)
+    for path in replaced:
+        print(f'  {path}: rewritten since it was last read, ignored (segments must be append-only)')
+
+    report = {}
+    changed_total = 0
+    for worksheet, items in sorted(state['items'].items()):
+        file_path = os.path.join(args.public_dir, worksheet, BANK_FILE)
+        if not os.path.isfile(file_path):
+            continue
+        stats = {digest: statistics(sums) for digest, sums in items.items()}
+        report[worksheet] = stats
+        weak = sum(1 for s in stats.values()
+                   if s['attempts'] >= args.min_attempts and s['discrimination'] is not None
+                   and s['discrimination'] < LOW_DISCRIMINATION)
+        with bank_profile.stage('calibrate', bank=file_path) as record:
+            changed, calibrated = calibrate_bank(file_path, items, args.min_attempts, args.dry_run)
+            record['rows'] = calibrated
+        changed_total += changed
+        verb = 'would change' if args.dry_run else 'changed'
+        print(f'  {worksheet}: {len(items)} questions answered, {calibrated} calibrated, {changed} {verb}, '
+              f'{weak} with discrimination below {LOW_DISCRIMINATION}')
+
+    if not args.dry_run:
+        write_json_atomic(args.state, state)
+    if args.report:
+        write_json_atomic(args.report, report, indent=2)
+    bank_profile.close(rows=read)
+    engine = 'numpy' if numpy is not None else 'python'
+    print(f'✅ Folded in {read} answers ({skipped} unmatched) with {engine}; '
+          f'{changed_total} Difficulty values updated in {time.perf_counter() - start:.2f}s.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
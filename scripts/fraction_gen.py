@@ -0,0 +1,334 @@
+import argparse
+import sys
+import time
+from fractions import Fraction
+from random import Random
+
+import bank_profile
+from bank_io import COLUMNS, csv_writer, question_row
+
+# Seedable generators for the fraction question categories that the
+# hand-written packs in packs/Worksheet 7 - Fractions cover. Every generator
+# takes a Random and returns a question dict in the same shape as a pack's;
+# answers are computed exactly with Fraction and distractors come from common
+# misconceptions rather than random noise.
+
+NAMES = ['Sarah', 'Tom', 'John', 'Mary', 'Bob', 'Lisa', 'Amy', 'Ben', 'Sue', 'Sam',
+         'Jerry', 'Joe', 'Priya', 'Arjun', 'Meera', 'Ravi', 'Kani', 'Leo', 'Nina', 'Omar']
+
+# (plural noun, container phrase)
+ITEMS = [
+    ('apples', 'a basket'), ('marbles', 'a bag'), ('stickers', 'an album'),
+    ('cookies', 'a jar'), ('candies', 'a box'), ('pencils', 'a case'),
+    ('flowers', 'a garden'), ('books', 'a shelf'), ('cards', 'a deck'),
+    ('balloons', 'a bunch'), ('toy cars', 'a toy box'), ('shells', 'a bucket'),
+]
+
+FRACTION_OF_LINK = 'https://www.mathsisfun.com/fractions_multiplication.html'
+ADDITION_LINK = 'https://www.mathsisfun.com/fractions_addition.html'
+COMPARING_LINK = 'https://www.mathsisfun.com/fractions_comparing.html'
+
+AR_OPTIONS = [
+    'Both A and R are true and R is the correct explanation of A',
+    'Both A and R are true but R is NOT the correct explanation of A',
+    'A is true but R is false',
+    'A is false but R is true',
+]
+
+
+def fmt(value):
+    """Format a Fraction the way the banks write it: '3/4', or '2' for whole
+    numbers."""
+    value = Fraction(value)
+    if value.denominator == 1:
+        return str(value.numerator)
+    return f'{value.numerator}/{value.denominator}'
+
+
+def _pick_distractors(answer, candidates, fallback):
+    """Three distinct distractors whose value differs from the answer. Takes
+    misconception candidates first, then fallback() values."""
+    seen = {answer}
+    picked = []
+    for value in candidates:
+        if value is not None and value > 0 and value not in seen:
+            seen.add(value)
+            picked.append(value)
+        if len(picked) == 3:
+            break
+    while len(picked) < 3:
+        value = fallback()
+        if value > 0 and value not in seen:
+            seen.add(value)
+            picked.append(value)
+    return picked
+
+
+def _options(rng, answer, distractors, render=fmt):
+    options = [render(answer)] + [render(d) for d in distractors]
+    rng.shuffle(options)
+    return options, render(answer)
+
+
+def fraction_of_quantity(rng):
+    d = rng.randint(2, 12)
+    n = rng.randint(1, d - 1)
+    k = rng.randint(1, 12)
+    total = d * k
+    part = n * k
+    name = rng.choice(NAMES)
+    items, container = rng.choice(ITEMS)
+
+    if rng.random() < 0.3:
+        q = f'{name} has {container} of {total} {items}. {name} gives away {n}/{d} of them. How many {items} are left?'
+        answer = total - part
+        candidates = [part, total - k, k, total - n]
+        hint = f'Find {n}/{d} of {total} ({part}), then subtract it from {total}.'
+        know_more = f'What is left is {d - n}/{d} of the whole.'
+    else:
+        q = f'{name} has {container} of {total} {items}. {n}/{d} of them are for sharing. How many {items} are for sharing?'
+        answer = part
+        # Misconceptions: stopping at the unit fraction, taking the
+        # complement, dividing by the numerator, or just multiplying.
+        candidates = [k, total - part, Fraction(total, n) if total % n == 0 else None, total * n]
+        hint = f'Divide {total} by the denominator ({d}), then multiply by {n}.'
+        know_more = f'1/{d} of {total} is {k}, so {n}/{d} is {n} times {k}.'
+
+    distractors = _pick_distractors(answer, candidates, lambda: answer + rng.randint(-k - 2, k + 2))
+    options, ans = _options(rng, answer, distractors)
+    return {
+        'q': q,
+        'options': options,
+        'ans': ans,
+        'hint': hint,
+        'know_more': know_more,
+        'link': FRACTION_OF_LINK,
+        'type': 'MCQ',
+        'difficulty': 'Medium' if n == 1 else 'Hard',
+    }
+
+
+def like_denominator_addition(rng):
+    d = rng.randint(3, 12)
+    a = rng.randint(1, d - 2)
+    b = rng.randint(1, d - 1 - a)
+    answer = Fraction(a + b, d)
+    # Keep the unreduced form the banks use for like-denominator sums
+    answer_text = f'{a + b}/{d}'
+
+    # Misconceptions: adding denominators too, dropping an addend,
+    # multiplying numerators, and off-by-one counting.
+    candidates = [
+        (a + b, 2 * d),
+        (max(a, b), d),
+        (a * b, d),
+        (a + b + 1, d),
+        (a + b - 1, d),
+    ]
+    seen = {answer}
+    distractors = []
+    while len(distractors) < 3:
+        num, den = candidates.pop(0) if candidates else (rng.randint(1, 2 * d), d)
+        value = Fraction(num, den)
+        if num > 0 and value not in seen:
+            seen.add(value)
+            distractors.append(f'{num}/{den}')
+    options = [answer_text] + distractors
+    rng.shuffle(options)
+
+    return {
+        'q': f'{a}/{d} + {b}/{d} = ?',
+        'options': options,
+        'ans': answer_text,
+        'hint': f'{a} + {b} = {a + b}. Keep the denominator {d}.',
+        'know_more': (f'{answer_text} simplifies to {fmt(answer)}.' if answer.denominator != d
+                      else 'When denominators are the same, just add the top numbers.'),
+        'link': ADDITION_LINK,
+        'type': 'MCQ',
+        'difficulty': 'Easy' if d <= 5 else 'Medium',
+    }
+
+
+def comparison(rng):
+    if rng.random() < 0.5:
+        # Same denominator: the larger numerator wins
+        d = rng.randint(3, 12)
+        a, b = rng.sample(range(1, d), 2)
+        left, right = Fraction(a, d), Fraction(b, d)
+        left_text, right_text = f'{a}/{d}', f'{b}/{d}'
+        hint = 'The denominators are the same, so compare the numerators.'
+        difficulty = 'Easy'
+    else:
+        # Same numerator: the smaller denominator wins
+        n = rng.randint(1, 5)
+        c, e = rng.sample(range(n + 1, 13), 2)
+        left, right = Fraction(n, c), Fraction(n, e)
+        left_text, right_text = f'{n}/{c}', f'{n}/{e}'
+        hint = 'The numerators are the same, so the smaller denominator means bigger parts.'
+        difficulty = 'Medium'
+
+    greater = left_text if left > right else right_text
+    smaller = right_text if greater == left_text else left_text
+    options = [greater, smaller, 'They are equal', 'Cannot tell']
+    rng.shuffle(options)
+    return {
+        'q': f'Which fraction is greater: {left_text} or {right_text}?',
+        'options': options,
+        'ans': greater,
+        'hint': hint,
+        'know_more': f'{greater} > {smaller}',
+        'link': COMPARING_LINK,
+        'type': 'MCQ',
+        'difficulty': difficulty,
+    }
+
+
+# Reasons for assertion/reason items: (text, is_true). The first two are the
+# true rules that explain a comparison; the rest are stock misconceptions.
+SAME_DENOMINATOR_RULE = ('When denominators are the same, the fraction with the larger numerator is larger.', True)
+SAME_NUMERATOR_RULE = ('When numerators are the same, the fraction with the smaller denominator is larger.', True)
+FALSE_RULES = [
+    ('The fraction with the larger denominator is always larger.', False),
+    ('To add fractions, we add the numerators and add the denominators.', False),
+    ('A fraction gets bigger when its denominator gets bigger.', False),
+]
+
+
+def assertion_reason(rng):
+    if rng.random() < 0.5:
+        d = rng.randint(3, 12)
+        a, b = rng.sample(range(1, d), 2)
+        left, right = Fraction(a, d), Fraction(b, d)
+        left_text, right_text = f'{a}/{d}', f'{b}/{d}'
+        true_rule = SAME_DENOMINATOR_RULE
+    else:
+        n = rng.randint(1, 5)
+        c, e = rng.sample(range(n + 1, 13), 2)
+        left, right = Fraction(n, c), Fraction(n, e)
+        left_text, right_text = f'{n}/{c}', f'{n}/{e}'
+        true_rule = SAME_NUMERATOR_RULE
+
+    assertion_true = left > right
+    if assertion_true and rng.random() < 0.35:
+        reason, reason_true = rng.choice(FALSE_RULES)
+    else:
+        reason, reason_true = true_rule
+
+    if assertion_true and reason_true:
+        ans = AR_OPTIONS[0]
+    elif assertion_true:
+        ans = AR_OPTIONS[2]
+    else:
+        ans = AR_OPTIONS[3]
+
+    return {
+        'q': f'Assertion (A): {left_text} is greater than {right_text}. Reason (R): {reason}',
+        'options': list(AR_OPTIONS),
+        'ans': ans,
+        'hint': f'First decide whether {left_text} > {right_text}, then check whether the rule is true.',
+        'know_more': f'{left_text if left > right else right_text} is the greater fraction.',
+        'link': COMPARING_LINK,
+        'type': 'MCQ',
+        'difficulty': 'Hard',
+    }
+
+
+GENERATORS = {
+    'word': fraction_of_quantity,
+    'addition': like_denominator_addition,
+    'comparison': comparison,
+    'assertion': assertion_reason,
+}
+
+
+def verify(q):
+    """Raise ValueError unless q is a well-formed MCQ: four distinct options,
+    the answer among them, and (for fraction options) exactly one option
+    equal in value to the answer."""
+    options = q['options']
+    if len(options) != 4 or len(set(options)) != 4:
+        raise ValueError(f"expected 4 distinct options: {q['q']!r}")
+    if q['ans'] not in options:
+        raise ValueError(f"answer {q['ans']!r} is not an option: {q['q']!r}")
+    try:
+        values = [Fraction(o) for o in options]
+    except ValueError:
+        return q
+    if values.count(Fraction(q['ans'])) != 1:
+        raise ValueError(f"more than one option equals the answer: {q['q']!r}")
+    return q
+
+
+# A category that produces this many duplicates in a row is treated as
+# exhausted (the small ones, like same-denominator addition, only have a few
+# hundred distinct items) and dropped from the rotation.
+MAX_CONSECUTIVE_DUPLICATES = 200
+
+
+def generate(count, seed=None, categories=None):
+    """Yield up to count unique, verified question dicts drawn round-robin
+    from the given categories (default: all)."""
+    rng = Random(seed)
+    active = [[GENERATORS[name], 0] for name in (categories or GENERATORS)]
+    seen = set()
+    produced = 0
+    turn = 0
+    while produced < count and active:
+        slot = active[turn % len(active)]
+        turn += 1
+        q = slot[0](rng)
+        if q['q'] in seen:
+            slot[1] += 1
+            if slot[1] >= MAX_CONSECUTIVE_DUPLICATES:
+                active.remove(slot)
+            continue
+        slot[1] = 0
+        seen.add(q['q'])
+        produced += 1
+        yield verify(q)
+
+
+def generate_rows(count, seed=None, categories=None, concept='Fractions', worksheet_no=7):
+    for q in generate(count, seed, categories):
+        yield question_row(q, concept, worksheet_no)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate verified fraction questions in the questions.csv schema.')
+    parser.add_argument('--count', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--category', action='append', choices=sorted(GENERATORS),
+                        help='restrict to a category (repeatable; default: all)')
+    parser.add_argument('--worksheet-no', default='7')
+    parser.add_argument('--bank', help='append to this questions.csv (skipping questions it already has) '
+                                       'instead of writing CSV to stdout')
+    bank_profile.add_arguments(parser)
+    args = parser.parse_args(argv)
+    bank_profile.activate(bank_profile.Profiler.from_args('fraction_gen', args))
+
+    start = time.perf_counter()
+    rows = generate_rows(args.count, args.seed, args.category, worksheet_no=args.worksheet_no)
+    if args.bank:
+        from bank_writer import add_rows
+        with bank_profile.stage('generate') as record:
+            rows = list(rows)
+            record['rows'] = len(rows)
+        with bank_profile.stage('add', bank=args.bank) as record:
+            inserted, skipped = add_rows(args.bank, rows)
+            record['rows'] = inserted + skipped
+        elapsed = time.perf_counter() - start
+        bank_profile.close(rows=inserted)
+        print(f"Successfully added {inserted} questions ({skipped} already present) in {elapsed:.2f}s.")
+    else:
+        writer = csv_writer(sys.stdout)
+        writer.writerow(COLUMNS)
+        with bank_profile.stage('generate') as record:
+            produced = record['rows'] = sum(1 for _ in map(writer.writerow, rows))
+        elapsed = time.perf_counter() - start
+        bank_profile.close(rows=produced)
+        print(f'Generated {produced} questions in {elapsed:.2f}s.', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
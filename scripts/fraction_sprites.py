@@ -0,0 +1,208 @@
+import argparse
+import math
+import os
+import re
+import sys
+
+import bank_profile
+from bank_io import open_bank, write_text_atomic
+from bank_writer import update_rows
+
+# Renders fraction diagrams for the rows of a bank straight from the question
+# data, packs every distinct diagram into one SVG sprite next to the bank and
+# points each row's Image column at its fragment:
+#
+#   Worksheet 7 - Fractions/fractions.svg#pie-4-9
+#
+# Each diagram is a <view> in the sprite, so the browser downloads the sprite
+# once and renders any fragment of it from cache.
+
+SPRITE_FILE = 'fractions.svg'
+
+FILLED = '#4CAF50'
+EMPTY = '#fff'
+STROKE = '#333'
+
+PIE_SIZE = (200, 200)
+BAR_SIZE = (200, 80)
+# Pies with more slices than this are unreadable; those become bars
+MAX_PIE_DENOMINATOR = 12
+MAX_DENOMINATOR = 24
+SPRITE_WIDTH = 8 * PIE_SIZE[0]
+
+_FRACTION = re.compile(r'(?<![\d/])(\d+)/(\d+)(?![\d/])')
+# Items that ask the student to read the fraction off the picture must show
+# it exactly as written (2/4 as four slices, not two)
+_READ_FROM_IMAGE = re.compile(r'\b(shown|shaded|image|picture|diagram)\b', re.IGNORECASE)
+# Sums, comparisons and assertion/reason items: a picture of one operand
+# would contradict the question rather than illustrate it
+_ARITHMETIC = re.compile(r'[+=×÷<>]|\s[-−x*]\s|\bassertion\b', re.IGNORECASE)
+_LOCAL_FRACTION_SVG = re.compile(r'(^|/)fraction_\d+\.svg$')
+
+
+def _num(value):
+    text = f'{value:.2f}'.rstrip('0').rstrip('.')
+    return '0' if text == '-0' else text
+
+
+def render_pie(n, d):
+    cx, cy, r = 100, 100, 80
+    if d == 1:
+        fill = FILLED if n else EMPTY
+        return f'<circle cx="{cx}" cy="{cy}" r="{r}" fill="{fill}" stroke="{STROKE}" stroke-width="2"/>'
+
+    def point(i):
+        angle = 2 * math.pi * i / d - math.pi / 2
+        return _num(cx + r * math.cos(angle)), _num(cy + r * math.sin(angle))
+
+    filled, empty = [], []
+    for i in range(d):
+        (x0, y0), (x1, y1) = point(i), point(i + 1)
+        (filled if i < n else empty).append(f'M{cx} {cy}L{x0} {y0}A{r} {r} 0 0 1 {x1} {y1}Z')
+    return _paths(filled, empty)
+
+
+def render_bar(n, d):
+    x, y, width, height = 10, 10, 180, 60
+    step = width / d
+    filled, empty = [], []
+    for i in range(d):
+        (filled if i < n else empty).append(f'M{_num(x + i * step)} {y}h{_num(step)}v{height}h-{_num(step)}Z')
+    return _paths(filled, empty)
+
+
+def _paths(filled, empty):
+    # One path per colour instead of one element per slice
+    parts = [f'<g stroke="{STROKE}" stroke-width="2">']
+    if filled:
+        parts.append(f'<path fill="{FILLED}" d="{"".join(filled)}"/>')
+    if empty:
+        parts.append(f'<path fill="{EMPTY}" d="{"".join(empty)}"/>')
+    parts.append('</g>')
+    return ''.join(parts)
+
+
+RENDERERS = {'pie': (render_pie, PIE_SIZE), 'bar': (render_bar, BAR_SIZE)}
+
+
+def diagram_for(row, style='pie'):
+    """(style, n, d) of the diagram a row should show, or None.
+
+    Questions that ask what fraction is shown use the answer; any other
+    question gets a diagram only when it mentions a single fraction and is
+    not arithmetic or an assertion. The fraction is drawn as written (2/4 as
+    four slices), so only identical diagrams are shared."""
+    question, answer = row[0], row[5].strip()
+    if _READ_FROM_IMAGE.search(question) and _FRACTION.fullmatch(answer):
+        match = _FRACTION.fullmatch(answer)
+    else:
+        fractions = _FRACTION.findall(question)
+        if len(set(fractions)) != 1 or _ARITHMETIC.search(question):
+            return None
+        match = _FRACTION.search(question)
+    n, d = int(match.group(1)), int(match.group(2))
+    if d == 0 or n > d or d > MAX_DENOMINATOR:
+        return None
+    if style == 'pie' and d > MAX_PIE_DENOMINATOR:
+        style = 'bar'
+    return style, n, d
+
+
+def fragment_id(key):
+    style, n, d = key
+    return f'{style}-{n}-{d}'
+
+
+def build_sprite(keys):
+    """Pack the diagrams into rows of a single SVG, one <view> per diagram."""
+    views, cells = [], []
+    x = y = row_height = 0
+    for key in sorted(keys, key=lambda k: (k[0], k[2], k[1])):
+        render, (width, height) = RENDERERS[key[0]]
+        if x + width > SPRITE_WIDTH:
+            x, y, row_height = 0, y + row_height, 0
+        views.append(f'<view id="{fragment_id(key)}" viewBox="{x} {y} {width} {height}"/>')
+        cells.append(f'<svg x="{x}" y="{y}" width="{width}" height="{height}">{render(key[1], key[2])}</svg>')
+        x += width
+        row_height = max(row_height, height)
+    total_height = y + row_height
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {SPRITE_WIDTH} {total_height}">'
+            + ''.join(views) + ''.join(cells) + '</svg>')
+
+
+def _wants_diagram(row, concept, replace_local, sprite_url):
+    if len(row) < 13 or concept.lower() not in row[12].lower():
+        return False
+    image = row[10].strip()
+    return (not image or image.startswith(sprite_url + '#')
+            or (replace_local and _LOCAL_FRACTION_SVG.search(image)))
+
+
+def pack_bank(file_path, style='pie', concept='Fraction', replace_local=False):
+    """Render, dedupe and pack the diagrams for a bank and write the fragment
+    URLs into its Image column. Returns (diagrams, rows_updated)."""
+    folder = os.path.basename(os.path.dirname(os.path.abspath(file_path)))
+    sprite_url = f'{folder}/{SPRITE_FILE}'
+
+    # Pass 1 (read-only): which diagrams does the sprite need?
+    keys = set()
+    with bank_profile.stage('scan', bank=file_path, bytes_read=os.path.getsize(file_path)) as record:
+        with open_bank(file_path) as (_, rows):
+            scanned = 0
+            for row in rows:
+                scanned += 1
+                if row and _wants_diagram(row, concept, replace_local, sprite_url):
+                    key = diagram_for(row, style)
+                    if key:
+                        keys.add(key)
+        record['rows'] = scanned
+    if not keys:
+        return 0, 0
+
+    # The sprite goes in first so the rewritten bank never points at a
+    # fragment that does not exist yet
+    with bank_profile.stage('sprite', bank=file_path) as record:
+        sprite = build_sprite(keys)
+        write_text_atomic(os.path.join(os.path.dirname(file_path), SPRITE_FILE), sprite)
+        record.update(rows=len(keys), bytes_written=len(sprite.encode('utf-8')))
+
+    def set_image(row):
+        if not _wants_diagram(row, concept, replace_local, sprite_url):
+            return False
+        key = diagram_for(row, style)
+        if not key:
+            # A fragment from an earlier run may no longer be in the sprite;
+            # other images (fraction_N.svg) are left alone
+            if not row[10].startswith(sprite_url + '#'):
+                return False
+            row[10] = ''
+            return True
+        url = f'{sprite_url}#{fragment_id(key)}'
+        if row[10] == url:
+            return False
+        row[10] = url
+        return True
+
+    return len(keys), update_rows(file_path, set_image)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Render fraction diagrams for a bank and pack them into one SVG sprite.')
+    parser.add_argument('bank', help='path to a questions.csv')
+    parser.add_argument('--style', choices=sorted(RENDERERS), default='pie')
+    parser.add_argument('--concept', default='Fraction',
+                        help='only rows whose Concept/Subtopic contains this text (default: Fraction)')
+    parser.add_argument('--replace-local', action='store_true',
+                        help='also replace Image values that point at individual fraction_N.svg files')
+    bank_profile.add_arguments(parser)
+    args = parser.parse_args(argv)
+    bank_profile.activate(bank_profile.Profiler.from_args('fraction_sprites', args))
+
+    diagrams, updated = pack_bank(args.bank, args.style, args.concept, args.replace_local)
+    bank_profile.close(rows=updated)
+    print(f'Packed {diagrams} diagrams into {SPRITE_FILE}; updated {updated} rows.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
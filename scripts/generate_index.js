@@ -16,6 +16,18 @@ function generateIndex() {
         process.exit(1);
     }
 
+    // Keep every field of an existing entry (curated icon/color, the 'sheet'
+    // source used by scripts/sheet_sync.py, the 'bank' stats written by
+    // scripts/build_banks.py); only folders without an entry get defaults
+    const existing = new Map();
+    if (fs.existsSync(OUTPUT_FILE)) {
+        try {
+            JSON.parse(fs.readFileSync(OUTPUT_FILE, 'utf8')).forEach(entry => existing.set(entry.path, entry));
+        } catch (err) {
+            console.error(`Could not read existing master_index.json (${err.message}); regenerating it.`);
+        }
+    }
+
     const items = fs.readdirSync(PUBLIC_DIR, { withFileTypes: true });
     const worksheets = [];
 
@@ -30,7 +42,8 @@ function generateIndex() {
                 id: id,
                 name: item.name,
                 path: item.name,
-                description: `Auto-generated from folder ${item.name}`
+                description: `Auto-generated from folder ${item.name}`,
+                ...existing.get(item.name)
             });
         }
     });
@@ -0,0 +1,67 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import bank_profile
+from bank_io import PUBLIC_DIR, discover_banks
+from migrations import MIGRATIONS, SCHEMA_VERSION, migrate_bank
+
+
+def _rate(amount, seconds):
+    return amount / seconds if seconds > 0 else float('inf')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Apply pending schema migrations to every worksheet questions.csv.')
+    parser.add_argument('--public-dir', default=PUBLIC_DIR, help='folder containing the Worksheet* directories')
+    parser.add_argument('--workers', type=int, default=None, help='process pool size (default: CPU count)')
+    parser.add_argument('--list', action='store_true', help='list the registered migration steps and exit')
+    bank_profile.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for version, description, _ in MIGRATIONS:
+            print(f'  v{version}: {description}')
+        return 0
+
+    print('Scanning for Worksheet folders...')
+    banks = discover_banks(args.public_dir)
+    if not banks:
+        print('No worksheet banks found.')
+        return 1
+
+    # Banks are migrated in worker processes, so their stages are recorded
+    # from the results and --profile-dump covers nothing here
+    bank_profile.activate(bank_profile.Profiler.from_args('migrate_banks', args))
+    start = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for result in pool.map(migrate_bank, banks):
+            results.append(result)
+            bank_profile.record('migrate', result['seconds'], bank=result['path'], rows=result['rows'],
+                                bytes_read=result['bytes'] if result['changed'] else 0,
+                                bytes_written=os.path.getsize(result['path']) if result['changed'] else 0)
+            name = os.path.basename(os.path.dirname(result['path']))
+            if not result['changed']:
+                print(f"  {name}: already at v{SCHEMA_VERSION}, skipped")
+                continue
+            print(f"  {name}: v{result['from_version']} -> v{SCHEMA_VERSION}, {result['rows']} rows "
+                  f"in {result['seconds'] * 1000:.1f} ms "
+                  f"({_rate(result['rows'], result['seconds']):,.0f} rows/s, "
+                  f"{_rate(result['bytes'], result['seconds']) / 1e6:.1f} MB/s)")
+    elapsed = time.perf_counter() - start
+
+    migrated = [r for r in results if r['changed']]
+    total_rows = sum(r['rows'] for r in migrated)
+    total_bytes = sum(r['bytes'] for r in migrated)
+    bank_profile.close(rows=total_rows, bytes_read=total_bytes)
+    print(f"✅ {len(results)} banks ({len(migrated)} migrated, {len(results) - len(migrated)} skipped), {total_rows} rows, "
+          f"{total_bytes / 1e6:.2f} MB in {elapsed:.2f}s "
+          f"({_rate(total_rows, elapsed):,.0f} rows/s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,128 @@
+import hashlib
+import os
+import time
+
+from bank_io import (BASE_COLUMN_COUNT, COLUMNS, load_json, pad_row, rewrite_bank,
+                     sidecar_path, write_json_atomic)
+from bank_journal import bank_lock
+
+# Ordered schema steps. A bank at version N has had steps 1..N applied.
+#
+# Each step takes the header and returns (new_header, row_fn); row_fn upgrades
+# one data row in place. Pending steps are composed and applied in a single
+# streaming pass. Steps must be idempotent: banks without a manifest are
+# replayed from version 0.
+MIGRATIONS = []
+
+
+def migration(description):
+    def register(step):
+        MIGRATIONS.append((len(MIGRATIONS) + 1, description, step))
+        return step
+    return register
+
+
+@migration('pad rows to the original 14 columns')
+def pad_to_base_columns(header):
+    header = pad_row(header, BASE_COLUMN_COUNT)
+    for i in range(BASE_COLUMN_COUNT):
+        header[i] = header[i] or COLUMNS[i]
+    return header, lambda row: pad_row(row, BASE_COLUMN_COUNT)
+
+
+@migration('add Difficulty column (default Medium)')
+def add_difficulty(header):
+    if 'Difficulty' not in header:
+        header.append('Difficulty')
+    width = header.index('Difficulty') + 1
+    return header, lambda row: pad_row(row, width, 'Medium')
+
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def upgrade(header, rows, from_version=0):
+    """Apply every step after from_version. Returns (header, rows) suitable as
+    a rewrite_bank transform result; rows is a lazy generator."""
+    header = list(header)
+    row_fns = []
+    for _, _, step in MIGRATIONS[from_version:]:
+        header, row_fn = step(header)
+        row_fns.append(row_fn)
+
+    def upgraded():
+        for row in rows:
+            if not row:
+                continue
+            for row_fn in row_fns:
+                row_fn(row)
+            yield row
+
+    return header, upgraded()
+
+
+# --- Manifest ---------------------------------------------------------------
+#
+# '.questions.manifest.json' next to each bank records the schema version and
+# a sha256 of the file contents. A bank whose size and mtime still match its
+# manifest is skipped without being opened; if only the mtime moved, the raw
+# bytes are hashed (but not parsed) to confirm nothing changed.
+
+def manifest_path(file_path):
+    return sidecar_path(file_path, 'manifest.json')
+
+
+def file_sha256(file_path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_manifest(file_path, version=SCHEMA_VERSION):
+    stat = os.stat(file_path)
+    manifest = {
+        'schema_version': version,
+        'sha256': file_sha256(file_path),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+    }
+    write_json_atomic(manifest_path(file_path), manifest, indent=2)
+    return manifest
+
+
+def current_version(file_path):
+    """Schema version of a bank according to its manifest, or 0 when there is
+    no manifest or the file changed since it was written."""
+    manifest = load_json(manifest_path(file_path))
+    if not manifest:
+        return 0
+    stat = os.stat(file_path)
+    if stat.st_size != manifest['size']:
+        return 0
+    if stat.st_mtime_ns != manifest['mtime_ns']:
+        if file_sha256(file_path) != manifest['sha256']:
+            return 0
+        # Same bytes, new mtime (e.g. a fresh checkout): refresh the stamp
+        write_manifest(file_path, manifest['schema_version'])
+    return manifest['schema_version']
+
+
+def migrate_bank(file_path):
+    start = time.perf_counter()
+    with bank_lock(file_path):
+        size = os.path.getsize(file_path)
+        version = current_version(file_path)
+        rows = None
+        if version < SCHEMA_VERSION:
+            rows = rewrite_bank(file_path, lambda header, body: upgrade(header, body, version))
+            write_manifest(file_path)
+    return {
+        'path': file_path,
+        'from_version': version,
+        'rows': rows,
+        'bytes': size,
+        'changed': rows is not None,
+        'seconds': time.perf_counter() - start,
+    }
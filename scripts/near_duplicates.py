@@ -0,0 +1,283 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import struct
+import sys
+import time
+import unicodedata
+from array import array
+
+import bank_profile
+from bank_io import PUBLIC_DIR, discover_banks, open_bank, sidecar_path, write_bytes_atomic, write_json_atomic
+
+# Finds near-duplicate questions across the whole library with MinHash and
+# locality-sensitive hashing, in time roughly linear in the number of rows.
+#
+# Each question is normalized (case, punctuation, whitespace; with --template
+# every number becomes 0 as well; a word that is only punctuation is spelled
+# out by its character names instead of dropped), cut into character shingles and reduced to
+# a one-permutation MinHash signature. Signatures are banded and only
+# questions that share a band bucket are compared, so the all-pairs
+# comparison never happens. Those candidates are checked on their exact
+# shingle sets: a 64-value estimate is too coarse for short questions that
+# differ in a single word.
+#
+# Signatures are kept per bank in a '.questions.minhash' sidecar (one per
+# normalization mode) keyed by the hash of the normalized text. A bank whose
+# size and mtime are unchanged is not read at all; otherwise it is re-read,
+# but only new or edited questions get a signature computed.
+
+STORE_VERSION = 2
+NUM_PERM = 64
+SHINGLE_SIZE = 5
+DEFAULT_THRESHOLD = 0.7
+_MASK = 0xFFFFFFFF
+_EMPTY = _MASK + 1
+_ROTATION = 0x9E3779B1
+# magic, version, num_perm, template flag, bank size, bank mtime_ns, rows, signatures
+_HEADER = struct.Struct('<4sIIIQqQQ')
+_MAGIC = b'QMNH'
+_NUMBER = re.compile(r'\d+')
+_NON_WORD = re.compile(r'[^\w]+')
+
+
+def _spell(token):
+    return ' '.join(unicodedata.name(c, '').lower() for c in token)
+
+
+def normalize(text, template=False):
+    text = text.lower()
+    if template:
+        text = _NUMBER.sub('0', text)
+    # In "Identify the punctuation: ;" the ';' is what the question is about
+    words = (_NON_WORD.sub(' ', token).strip() or _spell(token) for token in text.split())
+    return ' '.join(word for word in words if word)
+
+
+def text_key(normalized):
+    return hashlib.blake2b(normalized.encode('utf-8'), digest_size=8).digest()
+
+
+def shingles(normalized):
+    if len(normalized) <= SHINGLE_SIZE:
+        return {normalized}
+    return {normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)}
+
+
+def signature(normalized):
+    """MinHash signature by one-permutation hashing: each shingle is hashed
+    once and lands in one of NUM_PERM bins, each bin keeps its smallest value,
+    and empty bins borrow from the next non-empty bin (rotation
+    densification). Collision probability per position still tracks Jaccard
+    similarity, at one hash per shingle instead of NUM_PERM."""
+    bins = [_EMPTY] * NUM_PERM
+    for s in shingles(normalized):
+        h = int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=8).digest(), 'little')
+        b, value = h % NUM_PERM, (h // NUM_PERM) & _MASK
+        if value < bins[b]:
+            bins[b] = value
+    sig = list(bins)
+    for b in range(NUM_PERM):
+        if bins[b] == _EMPTY:
+            offset = 1
+            while bins[(b + offset) % NUM_PERM] == _EMPTY:
+                offset += 1
+            # The offset keeps borrowed values distinct from the donor bin's
+            sig[b] = (bins[(b + offset) % NUM_PERM] + offset * _ROTATION) & _MASK
+    return array('I', sig)
+
+
+def lsh_bands(threshold, num_perm=NUM_PERM):
+    """(bands, rows per band) whose S-curve midpoint (1/b)^(1/r) is closest
+    to the threshold."""
+    options = [(num_perm // r, r) for r in range(1, num_perm + 1) if num_perm % r == 0]
+    return min(options, key=lambda br: abs((1 / br[0]) ** (1 / br[1]) - threshold))
+
+
+def store_path(file_path, template=False):
+    return sidecar_path(file_path, 'minhash-template' if template else 'minhash')
+
+
+class SignatureStore:
+    """Per-bank MinHash signatures. 'keys' and 'texts' hold the text key and
+    question text of every data row in file order (row ids count from 1, as
+    in DedupIndex); 'signatures' maps each distinct text key to its
+    signature."""
+
+    def __init__(self, file_path, template=False):
+        self.file_path = file_path
+        self.template = template
+        self.keys = []
+        self.signatures = {}
+        self.texts = []
+        self.computed = 0
+
+    @classmethod
+    def open(cls, file_path, template=False):
+        store = cls(file_path, template)
+        stat = os.stat(file_path)
+        previous = store._load()
+        if previous and previous[0] == (stat.st_size, stat.st_mtime_ns):
+            store.keys, store.signatures, store.texts = previous[1:]
+            return store
+        store._scan(previous[2] if previous else {})
+        store._save(stat)
+        return store
+
+    def _scan(self, known_signatures):
+        with open_bank(self.file_path) as (_, rows):
+            for row in rows:
+                if not row:
+                    continue
+                text = row[0]
+                normalized = normalize(text, self.template)
+                key = text_key(normalized)
+                self.keys.append(key)
+                self.texts.append(text)
+                if key in self.signatures:
+                    continue
+                sig = known_signatures.get(key)
+                if sig is None:
+                    sig = signature(normalized)
+                    self.computed += 1
+                self.signatures[key] = sig
+
+    def _load(self):
+        try:
+            with open(store_path(self.file_path, self.template), 'rb') as f:
+                data = f.read()
+            magic, version, num_perm, template, size, mtime_ns, rows, count = _HEADER.unpack_from(data)
+        except (OSError, struct.error):
+            return None
+        if (magic, version, num_perm, bool(template)) != (_MAGIC, STORE_VERSION, NUM_PERM, self.template):
+            return None
+        offset = _HEADER.size
+        keys = [data[offset + 8 * i:offset + 8 * i + 8] for i in range(rows)]
+        offset += 8 * rows
+        signatures = {}
+        record = 8 + 4 * NUM_PERM
+        for i in range(count):
+            start = offset + i * record
+            sig = array('I')
+            sig.frombytes(data[start + 8:start + record])
+            signatures[data[start:start + 8]] = sig
+        offset += count * record
+        texts = json.loads(data[offset:].decode('utf-8'))
+        return (size, mtime_ns), keys, signatures, texts
+
+    def _save(self, stat):
+        parts = [_HEADER.pack(_MAGIC, STORE_VERSION, NUM_PERM, int(self.template), stat.st_size,
+                              stat.st_mtime_ns, len(self.keys), len(self.signatures))]
+        parts.extend(self.keys)
+        for key, sig in self.signatures.items():
+            parts.append(key)
+            parts.append(sig.tobytes())
+        parts.append(json.dumps(self.texts, ensure_ascii=False).encode('utf-8'))
+        write_bytes_atomic(store_path(self.file_path, self.template), b''.join(parts))
+
+
+def find_clusters(stores, threshold=DEFAULT_THRESHOLD):
+    """Group the questions of all stores into near-duplicate clusters.
+    Returns a list of clusters, each a list of (file_path, row_id, text),
+    largest first. Questions with the same normalized text always share a
+    cluster."""
+    # One item per distinct text across the library
+    occurrences = {}
+    signatures = {}
+    for store in stores:
+        for row_id, (key, text) in enumerate(zip(store.keys, store.texts), start=1):
+            occurrences.setdefault(key, []).append((store.file_path, row_id, text, store.template))
+        for key, sig in store.signatures.items():
+            signatures.setdefault(key, sig)
+    shingle_sets = {}
+
+    def shingle_set(key):
+        if key not in shingle_sets:
+            _, _, text, template = occurrences[key][0]
+            shingle_sets[key] = shingles(normalize(text, template))
+        return shingle_sets[key]
+
+    def jaccard(key_a, key_b):
+        a, b = shingle_set(key_a), shingle_set(key_b)
+        return len(a & b) / len(a | b)
+
+    keys = list(signatures)
+    parent = list(range(len(keys)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    bands, rows = lsh_bands(threshold)
+    for band in range(bands):
+        buckets = {}
+        for i, key in enumerate(keys):
+            sig = signatures[key]
+            buckets.setdefault(tuple(sig[band * rows:(band + 1) * rows]), []).append(i)
+        for members in buckets.values():
+            # Comparing against the bucket's first member keeps big buckets linear
+            first = members[0]
+            for other in members[1:]:
+                root_a, root_b = find(first), find(other)
+                if root_a != root_b and jaccard(keys[first], keys[other]) >= threshold:
+                    parent[root_b] = root_a
+
+    groups = {}
+    for i, key in enumerate(keys):
+        groups.setdefault(find(i), []).append(key)
+    clusters = []
+    for members in groups.values():
+        cluster = [(path, row_id, text) for key in members for path, row_id, text, _ in occurrences[key]]
+        if len(cluster) > 1:
+            clusters.append(sorted(cluster))
+    clusters.sort(key=lambda c: (-len(c), c[0]))
+    return clusters
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Report near-duplicate questions across all worksheet banks.')
+    parser.add_argument('banks', nargs='*', help='questions.csv files (default: every public/Worksheet*/questions.csv)')
+    parser.add_argument('--public-dir', default=PUBLIC_DIR)
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Jaccard similarity of the question shingles to report (default: {DEFAULT_THRESHOLD})')
+    parser.add_argument('--template', action='store_true',
+                        help='treat all numbers as equal, to find templated copies such as "1/2 of 10" / "1/4 of 8"')
+    parser.add_argument('--json', help='also write the clusters to this file')
+    bank_profile.add_arguments(parser)
+    args = parser.parse_args(argv)
+    bank_profile.activate(bank_profile.Profiler.from_args('near_duplicates', args))
+
+    start = time.perf_counter()
+    banks = args.banks or discover_banks(args.public_dir)
+    stores = []
+    for path in banks:
+        with bank_profile.stage('signatures', bank=path) as record:
+            store = SignatureStore.open(path, args.template)
+            record.update(rows=len(store.keys), computed=store.computed)
+        stores.append(store)
+    computed = sum(store.computed for store in stores)
+    with bank_profile.stage('cluster') as record:
+        clusters = find_clusters(stores, args.threshold)
+        record.update(rows=sum(len(store.signatures) for store in stores), clusters=len(clusters))
+
+    for number, cluster in enumerate(clusters, start=1):
+        print(f'  cluster {number} ({len(cluster)} rows):')
+        for path, row_id, text in cluster:
+            print(f'    {os.path.basename(os.path.dirname(path))}:{row_id}  {text[:100]}')
+    if args.json:
+        write_json_atomic(args.json, [[{'bank': path, 'row': row_id, 'text': text} for path, row_id, text in cluster]
+                                      for cluster in clusters], indent=2)
+
+    rows = sum(len(store.keys) for store in stores)
+    bank_profile.close(rows=rows)
+    print(f'✅ {len(clusters)} near-duplicate clusters among {rows} rows in {len(banks)} banks '
+          f'({computed} signatures computed) in {time.perf_counter() - start:.2f}s.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
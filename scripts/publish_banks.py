@@ -0,0 +1,174 @@
+import argparse
+import gzip
+import hashlib
+import os
+import re
+import sys
+import time
+
+import bank_profile
+from bank_io import load_json, write_bytes_atomic, write_json_atomic
+from bank_master_index import MASTER_INDEX_FILE
+from bank_search import SEARCH_INDEX_FILE
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Publish step for a built site (run after `npm run build`, on dist/). Every
+# bank artifact gets a content-hashed copy next to it
+#
+#   Worksheet 7 - Fractions/questions.json -> Worksheet 7 - Fractions/questions.3f2a9c01be.json
+#
+# plus .gz (and, when the brotli package is installed, .br) variants of both
+# names. asset-manifest.json maps each logical name to its hashed one; the app
+# loads the manifest with revalidation and then fetches hashed names, which
+# can be cached as immutable. Hashed files are content-addressed, so an
+# unchanged artifact is never rewritten or recompressed.
+
+MANIFEST_FILE = 'asset-manifest.json'
+MANIFEST_VERSION = 1
+HASH_LENGTH = 10
+ARTIFACT_EXTENSIONS = ('.csv', '.json', '.svg')
+# Below this, the compressed variant is not worth the extra request headers
+MIN_COMPRESS_BYTES = 256
+VARIANT_SUFFIXES = ('.gz', '.br')
+_HASHED = re.compile(rf'\.[0-9a-f]{{{HASH_LENGTH}}}\.[a-z]+$')
+
+
+def find_artifacts(root):
+    """Logical names (relative, '/'-separated) of the bank artifacts under a
+    site root: master_index.json, search_index.json and every csv/json/svg in
+    Worksheet*, excluding the hashed copies written by earlier runs."""
+    names = []
+    for name in (MASTER_INDEX_FILE, SEARCH_INDEX_FILE):
+        if os.path.isfile(os.path.join(root, name)):
+            names.append(name)
+    for entry in sorted(os.scandir(root), key=lambda e: e.name):
+        if not (entry.is_dir() and entry.name.startswith('Worksheet')):
+            continue
+        for directory, dirs, files in os.walk(entry.path):
+            dirs.sort()
+            for name in sorted(files):
+                if (name.endswith(ARTIFACT_EXTENSIONS) and not name.startswith('.')
+                        and not _HASHED.search(name)):
+                    names.append(os.path.relpath(os.path.join(directory, name), root).replace(os.sep, '/'))
+    return names
+
+
+def hashed_name(name, digest):
+    stem, ext = os.path.splitext(name)
+    return f'{stem}.{digest[:HASH_LENGTH]}{ext}'
+
+
+def compressed_variants(data):
+    """{suffix: bytes} of the encodings worth serving for data."""
+    variants = {}
+    if len(data) < MIN_COMPRESS_BYTES:
+        return variants
+    # mtime=0 keeps the output identical across builds
+    gz = gzip.compress(data, compresslevel=9, mtime=0)
+    if len(gz) < len(data):
+        variants['.gz'] = gz
+    if brotli is not None:
+        br = brotli.compress(data, quality=11)
+        if len(br) < len(data):
+            variants['.br'] = br
+    return variants
+
+
+def _read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def publish_artifact(root, name):
+    """Write the hashed copy and compressed variants of one artifact. Returns
+    (manifest entry, whether the hashed copy is new)."""
+    path = os.path.join(root, name)
+    data = _read(path)
+    digest = hashlib.sha256(data).hexdigest()
+    hashed = hashed_name(name, digest)
+    hashed_path = os.path.join(root, hashed)
+
+    new = not os.path.exists(hashed_path)
+    if new:
+        variants = compressed_variants(data)
+        for suffix, payload in variants.items():
+            write_bytes_atomic(hashed_path + suffix, payload)
+        # Written last, so its presence means the variants are complete
+        write_bytes_atomic(hashed_path, data)
+    else:
+        variants = {suffix: _read(hashed_path + suffix) for suffix in VARIANT_SUFFIXES
+                    if os.path.exists(hashed_path + suffix)}
+
+    for suffix in VARIANT_SUFFIXES:
+        if suffix in variants:
+            write_bytes_atomic(path + suffix, variants[suffix])
+        elif os.path.exists(path + suffix):
+            os.unlink(path + suffix)
+
+    entry = {'file': hashed, 'sha256': digest, 'bytes': len(data)}
+    entry.update((suffix.lstrip('.'), len(payload)) for suffix, payload in variants.items())
+    return entry, new
+
+
+def publish(root):
+    """Publish every artifact under root and write the manifest. Hashed files
+    of artifacts that changed since the previous publish of the same root
+    are removed. Returns (manifest, new_files)."""
+    previous = load_json(os.path.join(root, MANIFEST_FILE), {}).get('assets', {})
+    assets = {}
+    new_files = 0
+    for name in find_artifacts(root):
+        with bank_profile.stage('publish', artifact=name) as record:
+            assets[name], new = publish_artifact(root, name)
+            record.update(bytes_read=assets[name]['bytes'], new=bool(new))
+        new_files += new
+
+    current = {entry['file'] for entry in assets.values()}
+    for entry in previous.values():
+        if entry['file'] not in current:
+            for suffix in ('',) + VARIANT_SUFFIXES:
+                stale = os.path.join(root, entry['file'] + suffix)
+                if os.path.exists(stale):
+                    os.unlink(stale)
+
+    manifest = {'version': MANIFEST_VERSION, 'assets': assets}
+    write_json_atomic(os.path.join(root, MANIFEST_FILE), manifest, indent=1)
+    return manifest, new_files
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Write precompressed, content-hashed copies of the bank artifacts.')
+    parser.add_argument('root', nargs='?', default='dist', help='built site to publish (default: dist)')
+    parser.add_argument('--require-brotli', action='store_true',
+                        help='fail instead of writing gzip variants only when brotli is missing')
+    bank_profile.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.root):
+        print(f'{args.root} does not exist; run `npm run build` first.')
+        return 1
+    if brotli is None:
+        if args.require_brotli:
+            print('❌ brotli is not installed; run `pip install brotli`.')
+            return 1
+        print('  brotli is not installed; writing gzip variants only')
+
+    bank_profile.activate(bank_profile.Profiler.from_args('publish_banks', args))
+    start = time.perf_counter()
+    manifest, new_files = publish(args.root)
+    assets = manifest['assets'].values()
+    raw = sum(entry['bytes'] for entry in assets)
+    gz = sum(entry.get('gz', entry['bytes']) for entry in assets)
+    bank_profile.close(rows=len(manifest['assets']), bytes_read=raw)
+    print(f'  {len(manifest["assets"])} artifacts, {raw / 1e3:.1f} kB raw, {gz / 1e3:.1f} kB gzipped')
+    print(f'✅ Published {len(manifest["assets"])} artifacts ({new_files} new) to {MANIFEST_FILE} '
+          f'in {time.perf_counter() - start:.2f}s.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,190 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+import bank_profile
+from bank_io import BANK_FILE, COLUMNS, PUBLIC_DIR, load_json, question_row, sidecar_path, write_json_atomic
+
+# Question packs: hand-written questions kept as data instead of Python
+# literals, one JSON file per pack under packs/<worksheet folder>/:
+#
+#   {"description": "...", "concept": "Fractions", "worksheet_no": 7,
+#    "questions": [{"q", "options", "ans", "hint", "know_more", "link",
+#                   "type", "difficulty", optional "image"}, ...]}
+#
+# The registry finds packs by listing directories only; a pack file is read
+# when that pack is selected. Its rows are parsed, turned into bank rows and
+# checked with the validate_banks rules once, then cached in a sidecar next
+# to the pack ('.<name>.cache.json') keyed by the file's hash, so later runs
+# only hash the file and load the cached rows.
+
+PACKS_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'packs'))
+PACK_EXTENSION = '.json'
+# Bump when the row layout or the checks change so cached packs are rebuilt
+CACHE_VERSION = 1
+
+
+class PackError(ValueError):
+    """A pack file that cannot be read or has questions that fail validation."""
+
+
+def _file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+
+class QuestionPack:
+    """One pack file. Nothing is read until rows() is called."""
+
+    def __init__(self, worksheet, name, path):
+        self.worksheet = worksheet
+        self.name = name
+        self.path = path
+        self.cached = None
+
+    @property
+    def ref(self):
+        return f'{self.worksheet}/{self.name}'
+
+    @property
+    def bank_path(self):
+        return os.path.join(PUBLIC_DIR, self.worksheet, BANK_FILE)
+
+    def cache_path(self):
+        return sidecar_path(self.path, 'cache.json')
+
+    def rows(self):
+        """The pack's questions as validated bank rows. Raises PackError."""
+        digest = _file_hash(self.path)
+        cache = load_json(self.cache_path())
+        if cache and cache.get('version') == CACHE_VERSION and cache.get('hash') == digest:
+            self.cached = True
+            return cache['rows']
+        self.cached = False
+        rows = self._parse()
+        write_json_atomic(self.cache_path(), {'version': CACHE_VERSION, 'hash': digest, 'rows': rows})
+        return rows
+
+    def _parse(self):
+        # Only needed on a cache miss, so kept out of the startup path
+        from validate_banks import check_row
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            concept, worksheet_no = data['concept'], data['worksheet_no']
+            questions = data['questions']
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            raise PackError(f'{self.path}: not a question pack ({e})') from e
+
+        rows, problems = [], []
+        for number, question in enumerate(questions, start=1):
+            question = {'hint': '', 'know_more': '', 'link': '', **question}
+            try:
+                row = question_row(question, concept, worksheet_no)
+            except (KeyError, IndexError, TypeError) as e:
+                problems.append(f'question {number}: missing or malformed {e}')
+                continue
+            problems.extend(f'question {number}: {issue}' for issue in check_row(row, len(COLUMNS)))
+            rows.append(row)
+        if problems:
+            raise PackError(f'{self.path}:\n' + '\n'.join(f'  {problem}' for problem in problems))
+        return rows
+
+
+class PackRegistry:
+    """Packs under a packs/ directory, one subdirectory per worksheet folder
+    in public/."""
+
+    def __init__(self, root=PACKS_DIR):
+        self.root = root
+
+    def worksheets(self):
+        try:
+            return sorted(entry.name for entry in os.scandir(self.root) if entry.is_dir())
+        except FileNotFoundError:
+            return []
+
+    def packs(self, worksheet=None):
+        packs = []
+        for folder in [worksheet] if worksheet else self.worksheets():
+            directory = os.path.join(self.root, folder)
+            if not os.path.isdir(directory):
+                continue
+            for entry in sorted(os.scandir(directory), key=lambda e: e.name):
+                if entry.name.endswith(PACK_EXTENSION) and not entry.name.startswith('.'):
+                    packs.append(QuestionPack(folder, entry.name[:-len(PACK_EXTENSION)], entry.path))
+        return packs
+
+    def get(self, ref):
+        """A pack by '<worksheet>/<name>', or by bare name when only one
+        worksheet has a pack of that name."""
+        worksheet, _, name = ref.rpartition('/')
+        path = os.path.join(self.root, worksheet, name + PACK_EXTENSION) if worksheet else None
+        if path and os.path.isfile(path):
+            return QuestionPack(worksheet, name, path)
+        matches = [pack for pack in self.packs() if pack.name == name] if not worksheet else []
+        if len(matches) != 1:
+            raise PackError(f'no question pack {ref!r}' if not matches
+                            else f'{ref!r} is ambiguous: ' + ', '.join(pack.ref for pack in matches))
+        return matches[0]
+
+
+def add_packs(packs):
+    """Add the rows of each pack to its worksheet's bank, skipping questions
+    the bank already holds. Returns [(pack, inserted, skipped)]."""
+    from bank_writer import add_rows
+
+    results = []
+    for pack in packs:
+        with bank_profile.stage('load-pack', pack=pack.ref) as record:
+            rows = pack.rows()
+            record.update(rows=len(rows), cached=pack.cached)
+        with bank_profile.stage('add', bank=pack.bank_path) as record:
+            inserted, skipped = add_rows(pack.bank_path, rows)
+            record['rows'] = inserted + skipped
+        results.append((pack, inserted, skipped))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='List question packs or add them to their worksheet banks.')
+    parser.add_argument('packs', nargs='*', help="packs to add, as '<worksheet folder>/<name>' or a unique name")
+    parser.add_argument('--worksheet', help='add (or list) every pack of this worksheet folder')
+    parser.add_argument('--list', action='store_true', help='list the packs without reading them')
+    parser.add_argument('--packs-dir', default=PACKS_DIR)
+    bank_profile.add_arguments(parser)
+    args = parser.parse_args(argv)
+    bank_profile.activate(bank_profile.Profiler.from_args('question_packs', args))
+
+    start = time.perf_counter()
+    registry = PackRegistry(args.packs_dir)
+    if args.list:
+        for pack in registry.packs(args.worksheet):
+            print(f'  {pack.ref}')
+        return 0
+
+    try:
+        selected = [registry.get(ref) for ref in args.packs]
+        if args.worksheet:
+            selected += registry.packs(args.worksheet)
+        if not selected:
+            parser.error('name packs to add, or use --worksheet or --list')
+        results = add_packs(selected)
+    except PackError as e:
+        print(f'❌ {e}')
+        return 1
+
+    for pack, inserted, skipped in results:
+        print(f"  {pack.ref}: {inserted} added, {skipped} already present{' (cached)' if pack.cached else ''}")
+    inserted = sum(result[1] for result in results)
+    bank_profile.close(rows=inserted)
+    print(f'✅ Added {inserted} questions from {len(results)} packs in {(time.perf_counter() - start) * 1000:.1f} ms.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
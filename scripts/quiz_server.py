@@ -0,0 +1,347 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+from collections import OrderedDict
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from bank_compile import iter_questions, normalize_difficulty
+from bank_io import BANK_FILE, PUBLIC_DIR, discover_banks, load_json
+from bank_master_index import MASTER_INDEX_FILE, stats_path, worksheet_id
+from build_banks import build_state_path
+
+# Serves the local banks over HTTP so a quiz starts with one small request:
+#
+#   GET /api/worksheets
+#       every worksheet with its question count and Difficulty/Type mix
+#   GET /api/quiz?worksheet=ws7&count=20[&difficulty=Easy][&type=MCQ][&seed=1]
+#       a ready-to-render quiz of app Questions (id, topic, ...), sampled
+#       evenly across the Difficulty/Type mix
+#   GET /spreadsheets/d/<worksheet>/export?format=csv[&gid=0]
+#   GET /spreadsheets/d/e/<worksheet>/pub?output=csv
+#       the raw questions.csv, in the URL shapes of a Google Sheets CSV
+#       export, so a topic's sheetUrl can point here instead
+#
+# <worksheet> is a folder name ('Worksheet 7 - Fractions') or its id from
+# master_index.json ('ws7'). Parsed banks are kept in an LRU and reloaded when
+# the file's size or mtime changes.
+
+DEFAULT_PORT = 8765
+MAX_QUIZ_SIZE = 200
+MAX_REQUEST_LINE = 8192
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class LoadedBank:
+    def __init__(self, file_path, stat, questions):
+        self.file_path = file_path
+        self.size = stat.st_size
+        self.mtime_ns = stat.st_mtime_ns
+        self.etag = f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+        self.questions = questions
+        self.strata = {}
+        for question in questions:
+            key = (question['difficulty'], question['questionType'])
+            self.strata.setdefault(key, []).append(question)
+
+
+class BankCache:
+    """LRU of parsed banks keyed by path. A cached bank is served only while
+    the file's size and mtime are unchanged. Concurrent requests for a bank
+    that is not loaded yet share one parse, which runs in a worker thread so
+    the event loop keeps serving."""
+
+    def __init__(self, max_banks=8):
+        self.max_banks = max_banks
+        self._banks = OrderedDict()
+        self._loading = {}
+
+    async def get(self, file_path):
+        stat = os.stat(file_path)
+        bank = self.peek(file_path, stat)
+        if bank:
+            self._banks.move_to_end(file_path)
+            return bank
+
+        task = self._loading.get(file_path)
+        if task is None:
+            task = asyncio.ensure_future(asyncio.to_thread(self._load, file_path, stat))
+            self._loading[file_path] = task
+            task.add_done_callback(lambda _: self._loading.pop(file_path, None))
+        bank = await task
+        self._banks[file_path] = bank
+        self._banks.move_to_end(file_path)
+        while len(self._banks) > self.max_banks:
+            self._banks.popitem(last=False)
+        return bank
+
+    def peek(self, file_path, stat):
+        """The cached bank if it is loaded and current, without touching the
+        LRU order."""
+        bank = self._banks.get(file_path)
+        if bank and bank.size == stat.st_size and bank.mtime_ns == stat.st_mtime_ns:
+            return bank
+        return None
+
+    @staticmethod
+    def _load(file_path, stat):
+        return LoadedBank(file_path, stat, list(iter_questions(file_path)))
+
+
+def stratified_sample(strata, count, rng):
+    """Pick count questions so each stratum contributes in proportion to its
+    size (largest remainder first), then shuffle them."""
+    strata = {key: rows for key, rows in strata.items() if rows}
+    total = sum(len(rows) for rows in strata.values())
+    count = min(count, total)
+    if not count:
+        return []
+
+    quotas = {key: count * len(rows) / total for key, rows in strata.items()}
+    taken = {key: int(quota) for key, quota in quotas.items()}
+    by_remainder = sorted(strata, key=lambda key: (quotas[key] - taken[key], len(strata[key])), reverse=True)
+    for key in by_remainder[:count - sum(taken.values())]:
+        taken[key] += 1
+
+    picked = []
+    for key in sorted(strata):
+        picked.extend(rng.sample(strata[key], taken[key]))
+    rng.shuffle(picked)
+    return picked
+
+
+class QuizServer:
+    def __init__(self, public_dir=PUBLIC_DIR, max_banks=8):
+        self.public_dir = public_dir
+        self.cache = BankCache(max_banks)
+
+    def _ids(self):
+        """Folder name -> id of every bank. master_index ids come first; a
+        folder without an entry gets the id generate_index.js would give it,
+        unless another folder already has that id (as in build_banks), in
+        which case it is reachable by folder name only and its id is None."""
+        folders = [os.path.basename(os.path.dirname(p)) for p in discover_banks(self.public_dir)]
+        ids = dict.fromkeys(folders)
+        for entry in load_json(os.path.join(self.public_dir, MASTER_INDEX_FILE), []):
+            if entry.get('path') in ids and entry.get('id'):
+                ids[entry['path']] = entry['id']
+        taken = {ws_id for ws_id in ids.values() if ws_id}
+        for folder in folders:
+            if ids[folder] is None and worksheet_id(folder) not in taken:
+                ids[folder] = worksheet_id(folder)
+                taken.add(ids[folder])
+        return ids
+
+    def resolve(self, worksheet):
+        """(path, id) of the bank for a folder name or id."""
+        ids = self._ids()
+        folder = worksheet if worksheet in ids else next(
+            (folder for folder, ws_id in ids.items() if ws_id == worksheet), None)
+        if folder is None:
+            raise HttpError(404, f'unknown worksheet {worksheet!r}')
+        return os.path.join(self.public_dir, folder, BANK_FILE), ids[folder]
+
+    async def worksheets(self, query):
+        # Counts come from a bank already in the LRU, else from the stats that
+        # build_banks recorded for the bank's current content. Only a bank with
+        # neither is parsed, and it is not put in the LRU, so listing never
+        # evicts the banks that quizzes are using.
+        listing = []
+        for folder, ws_id in self._ids().items():
+            file_path = os.path.join(self.public_dir, folder, BANK_FILE)
+            stat = os.stat(file_path)
+            bank = self.cache.peek(file_path, stat)
+            stats = _bank_stats(bank) if bank else _built_stats(file_path, stat)
+            if stats is None:
+                stats = _bank_stats(await asyncio.to_thread(BankCache._load, file_path, stat))
+            listing.append({'id': ws_id, 'path': folder, **stats})
+        return 200, 'application/json', _json({'worksheets': listing}), {}
+
+    async def quiz(self, query):
+        worksheet = _param(query, 'worksheet')
+        if not worksheet:
+            raise HttpError(400, 'missing worksheet')
+        try:
+            count = int(_param(query, 'count') or 20)
+            seed = _param(query, 'seed')
+            rng = random.Random(int(seed)) if seed is not None else random.Random()
+        except ValueError:
+            raise HttpError(400, 'count and seed must be integers')
+        if not 1 <= count <= MAX_QUIZ_SIZE:
+            raise HttpError(400, f'count must be between 1 and {MAX_QUIZ_SIZE}')
+
+        file_path, ws_id = self.resolve(worksheet)
+        bank = await self.cache.get(file_path)
+        difficulty = _param(query, 'difficulty')
+        qtype = _param(query, 'type')
+        strata = {
+            (d, t): rows for (d, t), rows in bank.strata.items()
+            if (not difficulty or d == normalize_difficulty(difficulty))
+            and (not qtype or t == qtype.upper())
+        }
+        # Same shape as the app's Question (fromCompiled in
+        # services/googleSheetsService.ts); a folder without an id of its own
+        # uses its name as the topic
+        folder = os.path.basename(os.path.dirname(file_path))
+        topic = ws_id or folder
+        questions = [{**{k: v for k, v in question.items() if k != 'row'},
+                      'id': f"{topic}-q{question['row']}", 'topic': topic}
+                     for question in stratified_sample(strata, count, rng)]
+        return 200, 'application/json', _json({
+            'worksheet': folder,
+            'id': ws_id,
+            'questions': questions,
+        }), {'Cache-Control': 'no-store'}
+
+    async def export_csv(self, worksheet, headers):
+        file_path, _ = self.resolve(worksheet)
+        bank = await self.cache.get(file_path)
+        extra = {'ETag': bank.etag, 'Cache-Control': 'no-cache'}
+        if headers.get('if-none-match') == bank.etag:
+            return 304, None, b'', extra
+        with open(file_path, 'rb') as f:
+            body = await asyncio.to_thread(f.read)
+        return 200, 'text/csv; charset=utf-8', body, extra
+
+    async def dispatch(self, method, target, headers):
+        if method not in ('GET', 'HEAD'):
+            raise HttpError(405, f'{method} not allowed')
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        parts = [unquote(p) for p in url.path.split('/') if p]
+
+        if parts == ['api', 'worksheets']:
+            return await self.worksheets(query)
+        if parts == ['api', 'quiz']:
+            return await self.quiz(query)
+        if len(parts) >= 4 and parts[:2] == ['spreadsheets', 'd']:
+            if parts[2] == 'e' and len(parts) == 5 and parts[4] == 'pub' and _param(query, 'output') == 'csv':
+                return await self.export_csv(parts[3], headers)
+            if len(parts) == 4 and parts[3] == 'export' and _param(query, 'format') == 'csv':
+                return await self.export_csv(parts[2], headers)
+        raise HttpError(404, f'no route for {url.path}')
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, target, version, headers = request
+                try:
+                    status, content_type, body, extra = await self.dispatch(method, target, headers)
+                except HttpError as e:
+                    status, content_type, body, extra = e.status, 'application/json', _json({'error': str(e)}), {}
+                except OSError as e:
+                    status, content_type, body, extra = 500, 'application/json', _json({'error': str(e)}), {}
+
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and (version == 'HTTP/1.1' or headers.get('connection', '').lower() == 'keep-alive'))
+                _write_response(writer, status, content_type, b'' if method == 'HEAD' else body,
+                                len(body), extra, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+_REASONS = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found',
+            405: 'Method Not Allowed', 500: 'Internal Server Error'}
+
+
+def _bank_stats(bank):
+    difficulty, types = {}, {}
+    for (d, t), rows in bank.strata.items():
+        difficulty[d] = difficulty.get(d, 0) + len(rows)
+        types[t] = types.get(t, 0) + len(rows)
+    return {'questions': len(bank.questions), 'difficulty': dict(sorted(difficulty.items())),
+            'types': dict(sorted(types.items()))}
+
+
+def _built_stats(file_path, stat):
+    """The stats build_banks wrote for the bank, if the bank has not changed
+    since (same size and mtime as the build recorded, same content hash)."""
+    source = load_json(build_state_path(file_path), {}).get('_source', {})
+    stats = load_json(stats_path(file_path))
+    if (not stats or source.get('size') != stat.st_size or source.get('mtime_ns') != stat.st_mtime_ns
+            or stats.get('sha256') != source.get('sha256')):
+        return None
+    return {'questions': stats['rows'], 'difficulty': stats['difficulty'], 'types': stats['types']}
+
+
+def _param(query, name):
+    values = query.get(name)
+    return values[0] if values else None
+
+
+def _json(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+async def _read_request(reader):
+    line = await reader.readline()
+    if not line:
+        return None
+    if len(line) > MAX_REQUEST_LINE:
+        raise ValueError('request line too long')
+    method, target, version = line.decode('latin-1').split()
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    # Quiz requests carry no body; discard one if a client sends it anyway
+    length = int(headers.get('content-length') or 0)
+    if length:
+        await reader.readexactly(length)
+    return method, target, version, headers
+
+
+def _write_response(writer, status, content_type, body, length, extra, keep_alive):
+    lines = [f'HTTP/1.1 {status} {_REASONS.get(status, "")}']
+    if content_type:
+        lines.append(f'Content-Type: {content_type}')
+    lines.append(f'Content-Length: {length if status != 304 else 0}')
+    lines.append('Access-Control-Allow-Origin: *')
+    lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+    lines.extend(f'{name}: {value}' for name, value in extra.items())
+    writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+
+
+async def serve(host, port, public_dir=PUBLIC_DIR, max_banks=8):
+    server = QuizServer(public_dir, max_banks)
+    tcp = await asyncio.start_server(server.handle, host, port)
+    for sock in tcp.sockets:
+        print(f'Serving {public_dir} on http://{sock.getsockname()[0]}:{sock.getsockname()[1]}')
+    async with tcp:
+        await tcp.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve quizzes from the local worksheet banks over HTTP.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--public-dir', default=PUBLIC_DIR)
+    parser.add_argument('--cache-size', type=int, default=8, help='parsed banks kept in memory (default: 8)')
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.public_dir, args.cache_size))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
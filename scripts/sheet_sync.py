@@ -0,0 +1,236 @@
+import argparse
+import csv
+import hashlib
+import io
+import os
+import re
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+import bank_profile
+from bank_index import stable_keys
+from bank_io import (BANK_FILE, PUBLIC_DIR, append_rows, atomic_rewrite, load_json, open_bank, sidecar_path,
+                     write_json_atomic)
+from bank_journal import bank_lock
+from bank_master_index import MASTER_INDEX_FILE
+from bank_writer import commit_pending
+
+# Mirrors Google Sheets tabs into the local banks. A worksheet takes part when
+# its master_index.json entry (or an entry in --config) has a 'sheet' field:
+#
+#   {"path": "Worksheet 7 - Fractions",
+#    "sheet": {"url": "https://docs.google.com/spreadsheets/d/<id>/edit", "gid": "0"}}
+#
+# Each tab is fetched with the ETag / Last-Modified of the previous pull, so an
+# unchanged sheet costs one 304 and the bank is not even read. A changed sheet
+# is diffed row by row against the bank, keyed by content hash, and only the
+# difference is written: appended when the sheet only grew, otherwise one
+# atomic rewrite.
+
+DEFAULT_WORKERS = 8
+TIMEOUT = 30
+_GID = re.compile(r'gid=\d+')
+_SHEET_ID = re.compile(r'/d/([a-zA-Z0-9-_]+)')
+
+
+def sheet_csv_url(base_url, gid=None):
+    """CSV export URL of one tab; Python port of buildCsvUrlWithWorksheet in
+    services/googleSheetsService.ts."""
+    existing = re.search(r'[?&]gid=(\d+)', base_url)
+    gid = gid or (existing.group(1) if existing else '0')
+    separator = '&' if '?' in base_url else '?'
+    if '/pub' in base_url:
+        if 'gid=' in base_url:
+            return _GID.sub(f'gid={gid}', base_url)
+        return f'{base_url}{separator}gid={gid}&single=true&output=csv'
+    if '/export' in base_url:
+        if 'gid=' in base_url:
+            return _GID.sub(f'gid={gid}', base_url)
+        return f'{base_url}{separator}gid={gid}'
+    if '/edit' in base_url:
+        match = _SHEET_ID.search(base_url)
+        if match:
+            return f'https://docs.google.com/spreadsheets/d/{match.group(1)}/export?format=csv&gid={gid}'
+    return base_url
+
+
+def sync_state_path(file_path):
+    return sidecar_path(file_path, 'sync.json')
+
+
+def fetch(url, state):
+    """GET url with the validators from the previous pull. Returns
+    (status, body, etag, last_modified); body is None on 304."""
+    request = urllib.request.Request(url, headers={'User-Agent': 'bank-sync'})
+    if state.get('url') == url:
+        if state.get('etag'):
+            request.add_header('If-None-Match', state['etag'])
+        if state.get('last_modified'):
+            request.add_header('If-Modified-Since', state['last_modified'])
+    try:
+        with urllib.request.urlopen(request, timeout=TIMEOUT) as response:
+            return response.status, response.read(), response.headers.get('ETag'), response.headers.get('Last-Modified')
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return 304, None, state.get('etag'), state.get('last_modified')
+        raise
+
+
+def _keyed(rows):
+    # Identical questions can appear more than once; stable_keys numbers the
+    # repeats so every row still has its own key
+    return dict(stable_keys(rows))
+
+
+def diff_rows(local_rows, remote_rows):
+    """Row-level diff keyed by content hash. Returns a dict of inserted,
+    updated (same question, other cells changed) and deleted rows."""
+    local, remote = _keyed(local_rows), _keyed(remote_rows)
+    return {
+        'inserted': [row for key, row in remote.items() if key not in local],
+        'updated': [row for key, row in remote.items() if key in local and local[key] != row],
+        'deleted': [row for key, row in local.items() if key not in remote],
+    }
+
+
+def _strip(rows):
+    # Empty spreadsheet rows come through as empty lists or all-empty cells
+    return [row for row in rows if any(cell.strip() for cell in row)]
+
+
+def sync_bank(file_path, url, keep_local=False, dry_run=False):
+    """Pull one tab into one bank. Returns a result dict; 'action' is one of
+    'not-modified', 'unchanged', 'appended', 'rewritten' or 'created'."""
+    start = time.perf_counter()
+    state_path = sync_state_path(file_path)
+    state = load_json(state_path, {})
+    status, body, etag, last_modified = fetch(url, state)
+    result = {'path': file_path, 'url': url, 'inserted': 0, 'updated': 0, 'deleted': 0}
+
+    def finish(action, remote_hash=None):
+        if not dry_run:
+            write_json_atomic(state_path, {
+                'url': url,
+                'etag': etag,
+                'last_modified': last_modified,
+                'sha256': remote_hash or state.get('sha256'),
+            })
+        result.update(action=action, seconds=time.perf_counter() - start)
+        return result
+
+    if status == 304:
+        return finish('not-modified')
+    remote_hash = hashlib.sha256(body).hexdigest()
+    if remote_hash == state.get('sha256') and os.path.exists(file_path):
+        return finish('unchanged', remote_hash)
+
+    reader = csv.reader(io.StringIO(body.decode('utf-8-sig'), newline=''))
+    remote_header = next(reader, [])
+    remote_rows = _strip(reader)
+
+    if not dry_run:
+        # The lock sits next to the bank, so a new worksheet needs its folder first
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with nullcontext() if dry_run else bank_lock(file_path):
+        # Rows journaled by other writers go in before the bank is diffed
+        if not dry_run and os.path.exists(file_path):
+            commit_pending(file_path)
+        if not os.path.exists(file_path):
+            result['inserted'] = len(remote_rows)
+            if not dry_run:
+                atomic_rewrite(file_path, remote_header, remote_rows)
+            return finish('created', remote_hash)
+
+        with open_bank(file_path) as (local_header, rows):
+            local_rows = _strip(rows)
+        diff = diff_rows(local_rows, remote_rows)
+        if keep_local:
+            diff['deleted'] = []
+        result.update((name, len(rows)) for name, rows in diff.items())
+
+        if local_header == remote_header and not any(diff.values()):
+            return finish('unchanged', remote_hash)
+
+        grew_only = (local_header == remote_header and not diff['updated'] and not diff['deleted']
+                     and remote_rows[:len(local_rows)] == local_rows)
+        if grew_only:
+            if not dry_run:
+                append_rows(file_path, remote_rows[len(local_rows):])
+            return finish('appended', remote_hash)
+
+        if not dry_run:
+            rows = remote_rows
+            if keep_local:
+                remote_keys = _keyed(remote_rows)
+                rows = remote_rows + [row for key, row in _keyed(local_rows).items() if key not in remote_keys]
+            atomic_rewrite(file_path, remote_header, rows)
+        return finish('rewritten', remote_hash)
+
+
+def load_sources(public_dir, config_path=None):
+    """(bank path, CSV URL) for every worksheet with a 'sheet' entry."""
+    entries = load_json(config_path or os.path.join(public_dir, MASTER_INDEX_FILE), [])
+    sources = []
+    for entry in entries:
+        sheet = entry.get('sheet')
+        if sheet and sheet.get('url'):
+            sources.append((os.path.join(public_dir, entry['path'], BANK_FILE),
+                            sheet_csv_url(sheet['url'], sheet.get('gid'))))
+    return sources
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Mirror Google Sheets tabs into the local worksheet banks.')
+    parser.add_argument('--public-dir', default=PUBLIC_DIR)
+    parser.add_argument('--config', help='JSON list of {"path", "sheet": {"url", "gid"}} (default: master_index.json)')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='tabs fetched concurrently')
+    parser.add_argument('--keep-local', action='store_true', help='keep rows that exist only in the local bank')
+    parser.add_argument('--dry-run', action='store_true', help='report the diff without writing anything')
+    bank_profile.add_arguments(parser)
+    args = parser.parse_args(argv)
+    # Tabs sync in worker threads, so their stages are recorded from the
+    # results and --profile-dump covers nothing here
+    bank_profile.activate(bank_profile.Profiler.from_args('sheet_sync', args))
+
+    sources = load_sources(args.public_dir, args.config)
+    if not sources:
+        print('No worksheets with a "sheet" source configured.')
+        return 1
+
+    start = time.perf_counter()
+    failures = changed = 0
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(sync_bank, path, url, args.keep_local, args.dry_run) for path, url in sources]
+        for (path, url), future in zip(sources, futures):
+            name = os.path.basename(os.path.dirname(path))
+            try:
+                result = future.result()
+            except (OSError, ValueError) as e:
+                failures += 1
+                print(f'  {name}: failed to sync from {url}: {e}')
+                continue
+            bank_profile.record('sync', result['seconds'], bank=path, action=result['action'],
+                                rows=result['inserted'] + result['updated'] + result['deleted'])
+            if result['action'] in ('not-modified', 'unchanged'):
+                print(f"  {name}: {result['action']}")
+                continue
+            changed += 1
+            print(f"  {name}: {result['action']}, +{result['inserted']} ~{result['updated']} -{result['deleted']} "
+                  f"({result['seconds'] * 1000:.1f} ms)")
+
+    elapsed = time.perf_counter() - start
+    bank_profile.close(worksheets=len(sources), changed=changed, failures=failures)
+    if failures:
+        print(f'❌ {failures} of {len(sources)} worksheets failed to sync.')
+        return 1
+    verb = 'would change' if args.dry_run else 'changed'
+    print(f'✅ Synced {len(sources)} worksheets ({changed} {verb}) in {elapsed:.2f}s.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""Shared fixtures for the tooling tests: small banks in a temp public/ dir
+and a quiz server running on a background thread."""
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+from bank_io import BANK_FILE, COLUMNS, atomic_rewrite  # noqa: E402
+
+
+def question_row(text, answer='a', options=('a', 'b', 'c', 'd'), qtype='MCQ', difficulty='Easy',
+                 concept='Smoke', worksheet_no='1'):
+    return [text, *options, answer, '', '', '', '', '', qtype, concept, worksheet_no, difficulty]
+
+
+class PublicDirTestCase(unittest.TestCase):
+    """A temp public/ dir; write_bank() adds worksheet folders to it."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.public_dir = os.path.join(self._tmp.name, 'public')
+        os.makedirs(self.public_dir)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def write_bank(self, folder, rows, header=COLUMNS):
+        file_path = os.path.join(self.public_dir, folder, BANK_FILE)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        atomic_rewrite(file_path, header, rows)
+        return file_path
+
+    def write_master_index(self, entries):
+        with open(os.path.join(self.public_dir, 'master_index.json'), 'w', encoding='utf-8') as f:
+            json.dump(entries, f)
+
+
+class ServerThread:
+    """quiz_server.QuizServer on 127.0.0.1 and a free port, on its own event
+    loop in a daemon thread."""
+
+    def __init__(self, public_dir, max_banks=8):
+        from quiz_server import QuizServer
+
+        self.server = QuizServer(public_dir, max_banks)
+        self.loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        async def start():
+            self._tcp = await asyncio.start_server(self.server.handle, '127.0.0.1', 0)
+            self.port = self._tcp.sockets[0].getsockname()[1]
+            started.set()
+
+        def run():
+            asyncio.set_event_loop(self.loop)
+            self.loop.run_until_complete(start())
+            self.loop.run_forever()
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        started.wait(5)
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.port}'
+
+    def close(self):
+        async def stop():
+            self._tcp.close()
+            await self._tcp.wait_closed()
+
+        asyncio.run_coroutine_threadsafe(stop(), self.loop).result(5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(5)
+        self.loop.close()
@@ -0,0 +1,78 @@
+import json
+import unittest
+from fractions import Fraction
+
+from support import PublicDirTestCase, question_row
+
+from bank_answers import (accepted_forms, answer_entry, answers_path, build, normalize_answer,  # noqa: E402
+                          parse_answer, parse_number)
+
+
+def forms(answer, equivalents=True):
+    return accepted_forms(*parse_answer(answer), equivalents=equivalents)
+
+
+class AcceptedFormsTest(unittest.TestCase):
+    def test_parse_answer(self):
+        self.assertEqual(parse_answer('6/9'), ('number', Fraction(2, 3), None))
+        self.assertEqual(parse_answer('1 1/2'), ('number', Fraction(3, 2), None))
+        self.assertEqual(parse_answer('$10'), ('currency', 10, '$'))
+        self.assertEqual(parse_answer('1000ml'), ('quantity', 1000, 'ml'))
+        self.assertEqual(parse_answer('Denominator'), ('text', 'denominator', None))
+        self.assertIsNone(parse_answer('3 and a bit/'))
+
+    def test_parse_number(self):
+        self.assertEqual(parse_number('1 1/2'), Fraction(3, 2))
+        self.assertEqual(parse_number('-3/4'), Fraction(-3, 4))
+        self.assertEqual(parse_number('.5'), Fraction(1, 2))
+        self.assertEqual(parse_number('1,000'), 1000)
+        self.assertIsNone(parse_number('3/0'))
+
+    def test_fractions(self):
+        accepted = forms('2/3')
+        self.assertTrue({'2/3', '4/6', '0.67', '0.667', '0.66', '.67'} <= accepted)
+        self.assertNotIn('3/4', accepted)
+        self.assertTrue({'3/2', '1 1/2', '1.5', '6/4'} <= forms('3/2'))
+
+    def test_units_and_currency(self):
+        self.assertTrue({'1000ml', '1000 ml', '1 l', '1l', '1 litre'} <= forms('1000ml'))
+        self.assertIn('0.25 l', forms('250ml'))
+        self.assertTrue({'$10', '$ 10', '10 dollars', '$10.00'} <= forms('$10'))
+
+    def test_every_form_is_normalized(self):
+        for answer in ('2/3', '1 1/2', '1000ml', '$10', '6 pieces'):
+            for form in forms(answer):
+                self.assertEqual(normalize_answer(form), form)
+
+    def test_answer_entry(self):
+        entry = answer_entry('red|Blue')
+        self.assertEqual(entry['kind'], 'text')
+        self.assertEqual(entry['accepted'], ['blue', 'red'])
+        self.assertIsNone(answer_entry('5/0'))
+
+    def test_equivalents_are_opt_in(self):
+        self.assertEqual(answer_entry('2/4'), {'kind': 'number', 'canonical': '2/4', 'accepted': ['2/4']})
+        entry = answer_entry('2/4', equivalents=True)
+        self.assertEqual(entry['canonical'], '1/2')
+        self.assertTrue({'2/4', '1/2', '0.5', '4/8'} <= set(entry['accepted']))
+        self.assertEqual(answer_entry('12')['accepted'], ['12'])
+
+
+class BuildTest(PublicDirTestCase):
+    def test_equivalence_questions_accept_only_the_answer_as_written(self):
+        # Worksheet 4 - Fractions row 12
+        bank = self.write_bank('Worksheet 4', [
+            question_row('2/9 + 4/9 = ?', answer='6/9', options=('', '', '', ''), qtype='TTA'),
+            question_row('Sentence: 1/2 is equal to "2/4".', answer='2/4', options=('', '', '', ''), qtype=''),
+            question_row('Simplify 4/8', answer='1/2', options=('', '', '', ''), qtype='TTA'),
+        ])
+        build(bank, 'abc')
+        with open(answers_path(bank), encoding='utf-8') as f:
+            answers = json.load(f)['answers']
+        self.assertTrue({'6/9', '2/3', '0.67'} <= set(answers['1']['accepted']))
+        self.assertEqual(answers['2']['accepted'], ['2/4'])
+        self.assertEqual(answers['3']['accepted'], ['1/2'])
+
+
+if __name__ == '__main__':
+    unittest.main()
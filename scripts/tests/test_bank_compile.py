@@ -0,0 +1,51 @@
+import json
+import unittest
+
+from support import PublicDirTestCase, question_row
+
+from bank_compile import ARTIFACT_VERSION, build, row_to_question  # noqa: E402
+
+
+class RowToQuestionTest(unittest.TestCase):
+    def test_mcq(self):
+        question = row_to_question(question_row(' Pick one ', answer='C'), 4)
+        self.assertEqual(question['row'], 4)
+        self.assertEqual(question['text'], 'Pick one')
+        self.assertEqual(question['correctAnswer'], 'C')
+        self.assertEqual([a['id'] for a in question['answers']], ['A', 'B', 'C', 'D'])
+        self.assertEqual((question['questionType'], question['worksheetNumber'], question['difficulty']),
+                         ('MCQ', 1, 'Easy'))
+        self.assertNotIn('hint', question)
+
+    def test_fib_sentence_is_detected_from_the_text(self):
+        question = row_to_question(question_row('Sentence: The cat "sat" on the mat.', answer='',
+                                                options=('', '', '', ''), qtype=''), 1)
+        self.assertEqual(question['questionType'], 'FIB')
+        self.assertEqual(question['fib_sentence'], 'The cat __________ on the mat.')
+        self.assertEqual(question['correctAnswer'], 'sat')
+
+    def test_typed_answer_and_labels(self):
+        question = row_to_question(question_row('1/2 + 1/4 = ?', answer='3/4|0.75', options=('', '', '', ''),
+                                                qtype='TTA', difficulty='high'), 2)
+        self.assertEqual((question['questionType'], question['answers']), ('TTA', []))
+        self.assertEqual(question['multipleAnswers'], '3/4|0.75')
+        self.assertEqual(question['difficulty'], 'Hard')
+
+    def test_short_rows_are_skipped(self):
+        self.assertIsNone(row_to_question(['Question?', 'a'], 1))
+
+
+class BuildTest(PublicDirTestCase):
+    def test_rows_are_numbered_like_the_app_with_quoted_newlines_and_blank_lines(self):
+        bank = self.write_bank('Worksheet 1', [question_row('First\nline?'), [], question_row('Second?')])
+        [path], rows = build(bank, 'abc')
+        self.assertEqual(rows, 2)
+        with open(path, encoding='utf-8') as f:
+            artifact = json.load(f)
+        self.assertEqual((artifact['version'], artifact['sha256']), (ARTIFACT_VERSION, 'abc'))
+        self.assertEqual([(q['row'], q['text']) for q in artifact['questions']],
+                         [(1, 'First\nline?'), (2, 'Second?')])
+
+
+if __name__ == '__main__':
+    unittest.main()
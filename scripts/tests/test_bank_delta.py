@@ -0,0 +1,54 @@
+import json
+import os
+import unittest
+
+from support import PublicDirTestCase, question_row
+
+from bank_delta import VERSIONS_MANIFEST, build, diff_questions, versions_dir  # noqa: E402
+
+
+class DiffQuestionsTest(unittest.TestCase):
+    def test_row_only_changes_are_moves(self):
+        previous = {'a': {'key': 'a', 'row': 1, 'text': 'A'}, 'b': {'key': 'b', 'row': 2, 'text': 'B'}}
+        current = {'b': {'key': 'b', 'row': 1, 'text': 'B'}, 'c': {'key': 'c', 'row': 2, 'text': 'C'}}
+        self.assertEqual(diff_questions(previous, current), {
+            'inserted': [current['c']], 'updated': [], 'deleted': ['a'], 'moved': {'b': 1}})
+
+
+class VersionsTest(PublicDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.rows = [question_row(f'Question {i}?') for i in range(1, 31)]
+        self.bank = self.write_bank('Worksheet 1', self.rows)
+
+    def read(self, name):
+        with open(os.path.join(versions_dir(self.bank), name), encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_versions_count_up_with_a_delta_per_change(self):
+        build(self.bank, 'h1')
+        self.assertEqual(self.read(VERSIONS_MANIFEST)['bank_version'], 1)
+
+        self.write_bank('Worksheet 1', [question_row('New?')] + self.rows[1:])
+        build(self.bank, 'h2')
+        manifest = self.read(VERSIONS_MANIFEST)
+        self.assertEqual((manifest['bank_version'], manifest['snapshot']['file']), (2, 'v2.json'))
+        self.assertEqual(manifest['deltas'], [{'from': 1, 'from_sha256': 'h1', 'to': 2, 'file': 'd1-2.json',
+                                               'bytes': os.path.getsize(os.path.join(versions_dir(self.bank),
+                                                                                     'd1-2.json'))}])
+        delta = self.read('d1-2.json')
+        self.assertEqual([q['text'] for q in delta['inserted']], ['New?'])
+        self.assertEqual((len(delta['deleted']), delta['updated'], delta['moved']), (1, [], {}))
+        self.assertEqual(sorted(os.listdir(versions_dir(self.bank))), ['d1-2.json', VERSIONS_MANIFEST, 'v2.json'])
+
+    def test_same_questions_keep_the_version_and_take_the_new_hash(self):
+        build(self.bank, 'h1')
+        build(self.bank, 'h2')
+        manifest = self.read(VERSIONS_MANIFEST)
+        snapshot = self.read(manifest['snapshot']['file'])
+        self.assertEqual((manifest['bank_version'], manifest['sha256'], manifest['deltas']), (1, 'h2', []))
+        self.assertEqual((snapshot['bank_version'], snapshot['sha256']), (1, 'h2'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import unittest
+
+from support import PublicDirTestCase, question_row
+
+from bank_index import DedupIndex, content_hash, stable_keys  # noqa: E402
+from bank_io import append_rows  # noqa: E402
+
+
+class ContentHashTest(unittest.TestCase):
+    def test_identity_ignores_case_spacing_option_order_and_difficulty(self):
+        row = question_row('What is 1/2 of 8?', answer='4', options=('2', '4', '6', '8'))
+        same = question_row('what is  1/2 of 8? ', answer='4', options=('8', '6', '4', '2'), difficulty='Hard')
+        self.assertEqual(content_hash(row), content_hash(same))
+        self.assertNotEqual(content_hash(row), content_hash(question_row('What is 1/2 of 8?', answer='2')))
+
+    def test_stable_keys_number_repeats(self):
+        a, b = question_row('A?'), question_row('B?')
+        keys = [key for key, _ in stable_keys([a, b, a])]
+        self.assertEqual(keys, [content_hash(a), content_hash(b), content_hash(a) + '-1'])
+
+
+class DedupIndexTest(PublicDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.rows = [question_row(f'Question {i}?') for i in range(1, 5)]
+        self.bank = self.write_bank('Worksheet 1', self.rows)
+
+    def test_rows_are_numbered_from_one_and_first_repeat_wins(self):
+        append_rows(self.bank, [self.rows[1]])
+        index = DedupIndex.open(self.bank)
+        self.assertEqual((index.rows, len(index)), (5, 4))
+        self.assertEqual(index.get(content_hash(self.rows[1])), 2)
+
+    def test_reopen_scans_only_appended_rows(self):
+        DedupIndex.open(self.bank).save()
+        self.assertEqual(DedupIndex.open(self.bank).scanned, 0)
+
+        append_rows(self.bank, [question_row('Question 5?')])
+        index = DedupIndex.open(self.bank)
+        self.assertEqual((index.scanned, index.rows), (1, 5))
+        self.assertIn(content_hash(question_row('Question 5?')), index)
+
+    def test_rewritten_bank_is_rebuilt(self):
+        DedupIndex.open(self.bank).save()
+        self.write_bank('Worksheet 1', self.rows[2:] + [question_row('Question 9?')])
+        index = DedupIndex.open(self.bank)
+        self.assertEqual((index.scanned, index.rows), (3, 3))
+        self.assertNotIn(content_hash(self.rows[0]), index)
+
+    def test_claim_is_idempotent(self):
+        index = DedupIndex.open(self.bank)
+        self.assertFalse(index.claim(self.rows[0]))
+        self.assertTrue(index.claim(question_row('New?')))
+        self.assertFalse(index.claim(question_row('new? ')))
+        self.assertEqual(index.rows, 5)
+        self.assertFalse(os.path.exists(index.index_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
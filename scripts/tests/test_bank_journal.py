@@ -0,0 +1,72 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bank_io import COLUMNS, atomic_rewrite, open_bank  # noqa: E402
+from bank_journal import Journal, journal_path  # noqa: E402
+from bank_writer import add_rows, commit_pending  # noqa: E402
+
+
+def _row(text):
+    return [text, 'a', 'b', 'c', 'd', 'a', '', '', '', '', '', 'MCQ', 'Smoke', '1', 'Easy']
+
+
+class JournalRecoveryTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.bank = os.path.join(self.tmp.name, 'Worksheet 1', 'questions.csv')
+        os.makedirs(os.path.dirname(self.bank))
+        atomic_rewrite(self.bank, COLUMNS, [_row('Existing?')])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def questions(self):
+        with open_bank(self.bank) as (_, rows):
+            return [row[0] for row in rows if row]
+
+    def test_add_rows_skips_duplicates(self):
+        self.assertEqual(add_rows(self.bank, [_row('One?'), _row('Existing?')]), (1, 1))
+        self.assertEqual(add_rows(self.bank, [_row('One?')]), (0, 1))
+        self.assertEqual(self.questions(), ['Existing?', 'One?'])
+
+    def test_interrupted_append_is_rolled_back_and_replayed(self):
+        journal = Journal(self.bank)
+        journal.append([_row('Journaled?')])
+        _, end = journal.pending()
+        # A writer that crashed halfway through its append to the bank
+        journal.begin(end)
+        with open(self.bank, 'a', encoding='utf-8') as f:
+            f.write('Journaled?,a,b')
+
+        self.assertEqual(set(commit_pending(self.bank).values()), {(1, 0)})
+        self.assertEqual(self.questions(), ['Existing?', 'Journaled?'])
+
+    def test_torn_journal_tail_is_dropped(self):
+        Journal(self.bank).append([_row('Kept?')])
+        with open(journal_path(self.bank), 'ab') as f:
+            f.write(b'0000 {"id": "torn", "ro')
+
+        self.assertEqual(add_rows(self.bank, [_row('After?')]), (1, 0))
+        self.assertEqual(self.questions(), ['Existing?', 'Kept?', 'After?'])
+
+    def test_crash_before_truncating_the_journal_loses_nothing(self):
+        add_rows(self.bank, [_row('First?')])
+        # Journal.finish saved its state but the truncate never happened:
+        # the already committed records are still in the journal
+        journal = Journal(self.bank)
+        journal.append([_row('First?')])
+        state = journal.state()
+        state['committed'] = 0
+        journal._save_state(state)
+
+        for i in range(20):
+            self.assertEqual(add_rows(self.bank, [_row(f'Later {i}?')]), (1, 0))
+        self.assertEqual(self.questions(), ['Existing?', 'First?'] + [f'Later {i}?' for i in range(20)])
+
+
+if __name__ == '__main__':
+    unittest.main()
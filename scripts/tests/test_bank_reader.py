@@ -0,0 +1,56 @@
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bank_reader import BankReader, offsets_path  # noqa: E402
+
+
+class BankReaderTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.bank = os.path.join(self.tmp.name, 'questions.csv')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, text):
+        with open(self.bank, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+
+    def test_rows_with_quoted_newlines_and_blank_lines(self):
+        self.write('Question,Answer\nOne?,1\n\n"Two,\nlines?",2\nThree?,3\n')
+        with BankReader.open(self.bank) as bank:
+            self.assertEqual(len(bank), 3)
+            self.assertEqual(bank.header, ['Question', 'Answer'])
+            self.assertEqual(bank.row(2), ['Two,\nlines?', '2'])
+            self.assertEqual(bank.page(2, 2), [(3, ['Three?', '3'])])
+            self.assertEqual(len(bank.sample(5, random.Random(1))), 3)
+            with self.assertRaises(IndexError):
+                bank.row(4)
+        # The second open uses the saved offsets
+        self.assertTrue(os.path.exists(offsets_path(self.bank)))
+        with BankReader.open(self.bank) as bank:
+            self.assertEqual(bank.row(3), ['Three?', '3'])
+
+    def test_offsets_are_rebuilt_after_an_edit(self):
+        self.write('Question,Answer\nOne?,1\n')
+        BankReader.open(self.bank).close()
+        self.write('Question,Answer\nOne?,1\nTwo?,2\n')
+        with BankReader.open(self.bank) as bank:
+            self.assertEqual(bank.row(2), ['Two?', '2'])
+
+    def test_empty_bank(self):
+        self.write('')
+        with BankReader.open(self.bank) as bank:
+            self.assertEqual(len(bank), 0)
+            self.assertEqual(bank.header, [])
+            self.assertEqual(bank.sample(3), [])
+        self.assertFalse(os.path.exists(offsets_path(self.bank)))
+
+
+if __name__ == '__main__':
+    unittest.main()
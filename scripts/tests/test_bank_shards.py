@@ -0,0 +1,43 @@
+import json
+import os
+import unittest
+
+from support import PublicDirTestCase, question_row
+
+from bank_shards import SHARD_MANIFEST, build, shard_dir  # noqa: E402
+
+
+class ShardsTest(PublicDirTestCase):
+    def read(self, bank, name):
+        with open(os.path.join(shard_dir(bank), name), encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_one_shard_per_worksheet_difficulty_and_type(self):
+        bank = self.write_bank('Worksheet 1', [
+            question_row('A?'),
+            question_row('B?', difficulty='Hard'),
+            question_row('C?'),
+            question_row('D?', answer='4', options=('', '', '', ''), qtype='TTA', worksheet_no=''),
+        ])
+        build(bank, 'abc')
+        manifest = self.read(bank, SHARD_MANIFEST)
+        self.assertEqual(manifest['sha256'], 'abc')
+        self.assertEqual([(s['file'], s['count']) for s in manifest['shards']],
+                         [('w1-easy-mcq.json', 2), ('w1-hard-mcq.json', 1), ('wx-easy-tta.json', 1)])
+        shard = self.read(bank, 'w1-easy-mcq.json')
+        self.assertEqual([(q['row'], q['text']) for q in shard['questions']], [(1, 'A?'), (3, 'C?')])
+        for entry in manifest['shards']:
+            self.assertEqual(entry['bytes'], os.path.getsize(os.path.join(shard_dir(bank), entry['file'])))
+
+    def test_emptied_shards_are_removed(self):
+        bank = self.write_bank('Worksheet 1', [question_row('A?'), question_row('B?', difficulty='Hard')])
+        build(bank, 'abc')
+        self.write_bank('Worksheet 1', [question_row('A?')])
+        outputs, rows = build(bank, 'def')
+        self.assertEqual(rows, 1)
+        self.assertEqual(sorted(os.listdir(shard_dir(bank))), [SHARD_MANIFEST, 'w1-easy-mcq.json'])
+        self.assertEqual(sorted(map(os.path.basename, outputs)), [SHARD_MANIFEST, 'w1-easy-mcq.json'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import contextlib
+import io
+import unittest
+
+from support import PublicDirTestCase
+
+import migrate_banks  # noqa: E402
+from bank_io import COLUMNS, open_bank  # noqa: E402
+
+
+class MigrateBanksCliTest(PublicDirTestCase):
+    def run_cli(self, *args):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            status = migrate_banks.main(['--public-dir', self.public_dir, '--workers', '2', *args])
+        return status, out.getvalue()
+
+    def test_migrates_every_bank_in_parallel_then_skips_them(self):
+        banks = [self.write_bank(f'Worksheet {n}', [['Q?', 'a', 'b', '', '', 'a']], header=COLUMNS[:6])
+                 for n in range(1, 4)]
+        status, out = self.run_cli()
+        self.assertEqual(status, 0)
+        self.assertIn('3 banks (3 migrated, 0 skipped)', out)
+        for bank in banks:
+            with open_bank(bank) as (header, rows):
+                self.assertEqual((header, [len(row) for row in rows]), (COLUMNS, [len(COLUMNS)]))
+
+        status, out = self.run_cli()
+        self.assertIn('3 banks (0 migrated, 3 skipped)', out)
+
+    def test_no_banks(self):
+        self.assertEqual(self.run_cli()[0], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import unittest
+
+from support import PublicDirTestCase
+
+from bank_io import COLUMNS, open_bank  # noqa: E402
+from migrations import SCHEMA_VERSION, current_version, manifest_path, migrate_bank, upgrade  # noqa: E402
+
+OLD_HEADER = COLUMNS[:-1]
+OLD_ROWS = [['Short row?', 'a', 'b', '', '', 'a'], ['Full row?', 'a', 'b', 'c', 'd', 'b', '', '', '', '', '',
+                                                      'MCQ', 'Verbs', '1']]
+
+
+class UpgradeTest(unittest.TestCase):
+    def test_rows_are_padded_and_get_a_default_difficulty(self):
+        header, rows = upgrade(['Question'], [OLD_ROWS[0], [], ['x'] * 15])
+        rows = list(rows)
+        self.assertEqual(header, COLUMNS)
+        self.assertEqual([len(row) for row in rows], [15, 15])
+        self.assertEqual((rows[0][-1], rows[1][-1]), ('Medium', 'x'))
+
+    def test_upgrade_from_the_latest_version_is_a_no_op(self):
+        header, rows = upgrade(OLD_HEADER, [list(OLD_ROWS[0])], SCHEMA_VERSION)
+        self.assertEqual((header, list(rows)), (OLD_HEADER, [OLD_ROWS[0]]))
+
+
+class MigrateBankTest(PublicDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.bank = self.write_bank('Worksheet 1', OLD_ROWS, header=OLD_HEADER)
+
+    def test_migrates_once_then_skips(self):
+        result = migrate_bank(self.bank)
+        self.assertEqual((result['changed'], result['from_version'], result['rows']), (True, 0, 2))
+        with open_bank(self.bank) as (header, rows):
+            self.assertEqual(header, COLUMNS)
+            self.assertEqual([row[-1] for row in rows], ['Medium', 'Medium'])
+        self.assertEqual(current_version(self.bank), SCHEMA_VERSION)
+        self.assertFalse(migrate_bank(self.bank)['changed'])
+
+    def test_touched_but_unchanged_bank_keeps_its_version(self):
+        migrate_bank(self.bank)
+        stat = os.stat(self.bank)
+        os.utime(self.bank, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.assertEqual(current_version(self.bank), SCHEMA_VERSION)
+        self.assertFalse(migrate_bank(self.bank)['changed'])
+
+    def test_edited_bank_is_replayed_from_version_zero(self):
+        migrate_bank(self.bank)
+        with open(self.bank, 'a', encoding='utf-8') as f:
+            f.write('Added by hand?,a,b,,,a\n')
+        self.assertEqual(current_version(self.bank), 0)
+        result = migrate_bank(self.bank)
+        self.assertEqual((result['changed'], result['rows']), (True, 3))
+        with open_bank(self.bank) as (_, rows):
+            self.assertEqual([row[-1] for row in rows], ['Medium'] * 3)
+        self.assertTrue(os.path.exists(manifest_path(self.bank)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import os
+import unittest
+
+from support import PublicDirTestCase, question_row
+
+from bank_io import append_rows  # noqa: E402
+from near_duplicates import SignatureStore, find_clusters, normalize  # noqa: E402
+
+
+class NormalizeTest(unittest.TestCase):
+    def test_punctuation_only_words_are_spelled_out(self):
+        self.assertEqual(normalize('Identify the punctuation: ;'), 'identify the punctuation semicolon')
+        self.assertEqual(normalize('Identify the punctuation: :'), 'identify the punctuation colon')
+        self.assertEqual(normalize('What is 1/2 of 10?', template=True), 'what is 0 0 of 0')
+
+
+class FindClustersTest(PublicDirTestCase):
+    def clusters(self, template=False):
+        stores = [SignatureStore.open(bank, template) for bank in self.banks]
+        return [[(os.path.basename(os.path.dirname(path)), row_id, text) for path, row_id, text in cluster]
+                for cluster in find_clusters(stores)]
+
+    def setUp(self):
+        super().setUp()
+        self.banks = [
+            self.write_bank('Worksheet 4', [question_row(text) for text in [
+                '1/2 of 10 is?', '1/4 of 8 is?', 'Identify the punctuation: ;', 'Identify the punctuation: :']]),
+            self.write_bank('Worksheet 5', [question_row('1/2 of 10 is?'), question_row('Name a fruit.')]),
+        ]
+
+    def test_each_row_is_reported_with_its_own_text(self):
+        self.assertEqual(self.clusters(template=True), [[('Worksheet 4', 1, '1/2 of 10 is?'),
+                                                         ('Worksheet 4', 2, '1/4 of 8 is?'),
+                                                         ('Worksheet 5', 1, '1/2 of 10 is?')]])
+
+    def test_questions_about_different_punctuation_are_not_duplicates(self):
+        self.assertEqual(self.clusters(), [[('Worksheet 4', 1, '1/2 of 10 is?'), ('Worksheet 5', 1, '1/2 of 10 is?')]])
+
+    def test_signatures_are_reused(self):
+        SignatureStore.open(self.banks[0])
+        self.assertEqual(SignatureStore.open(self.banks[0]).computed, 0)
+        append_rows(self.banks[0], [question_row('1/2 of 10 is?'), question_row('Brand new?')])
+        store = SignatureStore.open(self.banks[0])
+        self.assertEqual((store.computed, len(store.keys), store.texts[-1]), (1, 6, 'Brand new?'))
+
+
+if __name__ == '__main__':
+    unittest.main()
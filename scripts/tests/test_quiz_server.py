@@ -0,0 +1,96 @@
+import asyncio
+import http.client
+import json
+import os
+import unittest
+
+from support import PublicDirTestCase, ServerThread, question_row
+
+import quiz_server  # noqa: E402
+from build_banks import build_bank  # noqa: E402
+
+
+class QuizServerTest(PublicDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write_bank('Worksheet 1 - Verbs', [question_row(f'Verb {i}?', difficulty=d, qtype='MCQ')
+                                                for i, d in enumerate(['Easy'] * 6 + ['Hard'] * 4)])
+        # Same derived id (ws1) as the indexed folder above
+        self.write_bank('Worksheet 1', [question_row('Stray?')])
+        self.write_bank('Worksheet 3 - Simple Present', [question_row('Present?')])
+        self.write_master_index([{'id': 'ws1', 'path': 'Worksheet 1 - Verbs'}])
+        self.server = quiz_server.QuizServer(self.public_dir, max_banks=1)
+
+    def get(self, target, headers=None):
+        status, content_type, body, extra = asyncio.run(self.server.dispatch('GET', target, headers or {}))
+        return status, json.loads(body) if content_type == 'application/json' else body, extra
+
+    def test_master_index_ids_win_over_derived_ones(self):
+        _, listing, _ = self.get('/api/worksheets')
+        ids = {entry['path']: entry['id'] for entry in listing['worksheets']}
+        self.assertEqual(ids, {'Worksheet 1': None, 'Worksheet 1 - Verbs': 'ws1',
+                               'Worksheet 3 - Simple Present': 'ws3'})
+        _, quiz, _ = self.get('/api/quiz?worksheet=ws1&count=3')
+        self.assertEqual(quiz['worksheet'], 'Worksheet 1 - Verbs')
+        # A folder without an id is still reachable by name
+        _, quiz, _ = self.get('/api/quiz?worksheet=Worksheet%201&count=3')
+        self.assertEqual([q['id'] for q in quiz['questions']], ['Worksheet 1-q1'])
+
+    def test_quiz_is_stratified_and_app_shaped(self):
+        status, quiz, _ = self.get('/api/quiz?worksheet=ws1&count=5&seed=1')
+        self.assertEqual(status, 200)
+        questions = quiz['questions']
+        self.assertEqual(sorted(q['difficulty'] for q in questions), ['Easy'] * 3 + ['Hard'] * 2)
+        for question in questions:
+            self.assertRegex(question['id'], r'^ws1-q\d+$')
+            self.assertEqual(question['topic'], 'ws1')
+            self.assertNotIn('row', question)
+        _, again, _ = self.get('/api/quiz?worksheet=ws1&count=5&seed=1')
+        self.assertEqual(again, quiz)
+        _, hard, _ = self.get('/api/quiz?worksheet=ws1&count=10&difficulty=hard')
+        self.assertEqual(len(hard['questions']), 4)
+
+    def test_errors(self):
+        for target, status in [('/api/quiz', 400), ('/api/quiz?worksheet=ws1&count=0', 400),
+                               ('/api/quiz?worksheet=ws9', 404), ('/nowhere', 404)]:
+            with self.assertRaises(quiz_server.HttpError) as caught:
+                self.get(target)
+            self.assertEqual(caught.exception.status, status, target)
+
+    def test_listing_uses_build_stats_without_loading_banks(self):
+        for folder in ('Worksheet 1 - Verbs', 'Worksheet 1', 'Worksheet 3 - Simple Present'):
+            build_bank(os.path.join(self.public_dir, folder, 'questions.csv'))
+        loads = []
+        original = quiz_server.BankCache._load
+        quiz_server.BankCache._load = staticmethod(lambda *args: loads.append(args) or original(*args))
+        try:
+            for _ in range(3):
+                _, listing, _ = self.get('/api/worksheets')
+        finally:
+            quiz_server.BankCache._load = staticmethod(original)
+        self.assertEqual(loads, [])
+        verbs = next(e for e in listing['worksheets'] if e['path'] == 'Worksheet 1 - Verbs')
+        self.assertEqual((verbs['questions'], verbs['difficulty']), (10, {'Easy': 6, 'Hard': 4}))
+
+    def test_csv_export_over_http(self):
+        server = ServerThread(self.public_dir)
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', server.port, timeout=5)
+            connection.request('GET', '/spreadsheets/d/ws1/export?format=csv&gid=0')
+            response = connection.getresponse()
+            body = response.read()
+            self.assertEqual(response.status, 200)
+            self.assertTrue(body.startswith(b'Question,'))
+            etag = response.getheader('ETag')
+
+            # Same keep-alive connection, conditional request
+            connection.request('GET', '/spreadsheets/d/e/ws1/pub?output=csv', headers={'If-None-Match': etag})
+            response = connection.getresponse()
+            self.assertEqual((response.status, response.read()), (304, b''))
+            connection.close()
+        finally:
+            server.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
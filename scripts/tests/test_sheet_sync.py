@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+
+from support import PublicDirTestCase, ServerThread, question_row
+
+from bank_io import open_bank  # noqa: E402
+from sheet_sync import diff_rows, sheet_csv_url, sync_bank, sync_state_path  # noqa: E402
+
+ROWS = [question_row(f'Question {i}?') for i in range(1, 4)]
+
+
+class SheetSyncTest(PublicDirTestCase):
+    """Syncs a local bank from the quiz server's CSV export, which stands in
+    for Google Sheets: same URL shape, ETag and 304 handling."""
+
+    def setUp(self):
+        super().setUp()
+        self.write_bank('Worksheet 1 - Verbs', ROWS)
+        self.write_master_index([{'id': 'ws1', 'path': 'Worksheet 1 - Verbs'}])
+        self.server = ServerThread(self.public_dir)
+        self.addCleanup(self.server.close)
+        self.url = sheet_csv_url(f'{self.server.url}/spreadsheets/d/ws1/export?format=csv', '0')
+        local = tempfile.TemporaryDirectory()
+        self.addCleanup(local.cleanup)
+        self.local_bank = os.path.join(local.name, 'Worksheet 1 - Verbs', 'questions.csv')
+
+    def local_rows(self):
+        with open_bank(self.local_bank) as (_, rows):
+            return list(rows)
+
+    def test_created_then_not_modified(self):
+        result = sync_bank(self.local_bank, self.url)
+        self.assertEqual((result['action'], result['inserted']), ('created', 3))
+        self.assertEqual(self.local_rows(), ROWS)
+        self.assertTrue(os.path.exists(sync_state_path(self.local_bank)))
+
+        mtime = os.stat(self.local_bank).st_mtime_ns
+        self.assertEqual(sync_bank(self.local_bank, self.url)['action'], 'not-modified')
+        self.assertEqual(os.stat(self.local_bank).st_mtime_ns, mtime)
+
+    def test_appended_when_the_sheet_only_grew(self):
+        sync_bank(self.local_bank, self.url)
+        grown = ROWS + [question_row('Question 4?')]
+        self.write_bank('Worksheet 1 - Verbs', grown)
+        result = sync_bank(self.local_bank, self.url)
+        self.assertEqual((result['action'], result['inserted']), ('appended', 1))
+        self.assertEqual(self.local_rows(), grown)
+
+    def test_rewritten_on_edits_and_deletes(self):
+        sync_bank(self.local_bank, self.url)
+        edited = [question_row('Question 1?', difficulty='Hard'), ROWS[2]]
+        self.write_bank('Worksheet 1 - Verbs', edited)
+        result = sync_bank(self.local_bank, self.url)
+        self.assertEqual((result['action'], result['updated'], result['deleted']), ('rewritten', 1, 1))
+        self.assertEqual(self.local_rows(), edited)
+
+    def test_dry_run_writes_nothing(self):
+        result = sync_bank(self.local_bank, self.url, dry_run=True)
+        self.assertEqual((result['action'], result['inserted']), ('created', 3))
+        self.assertFalse(os.path.exists(os.path.dirname(self.local_bank)))
+
+
+class DiffRowsTest(unittest.TestCase):
+    def test_repeated_questions_keep_their_own_keys(self):
+        diff = diff_rows([ROWS[0], ROWS[0]], [ROWS[0], ROWS[0], ROWS[0]])
+        self.assertEqual(diff, {'inserted': [ROWS[0]], 'updated': [], 'deleted': []})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+
+from support import PublicDirTestCase, question_row
+
+from bank_io import COLUMNS, append_rows  # noqa: E402
+from validate_banks import check_row, validate_bank  # noqa: E402
+
+WIDTH = len(COLUMNS)
+
+
+class CheckRowTest(unittest.TestCase):
+    def test_valid_rows(self):
+        self.assertEqual(check_row(question_row('Pick one', answer='b'), WIDTH), [])
+        self.assertEqual(check_row(question_row('2/9 + 4/9 = ?', answer='6/9', options=('', '', '', ''),
+                                                qtype='TTA'), WIDTH), [])
+
+    def test_mcq_answer_must_be_an_option(self):
+        self.assertEqual(check_row(question_row('Pick one', answer='e'), WIDTH),
+                         ["answer 'e' is not one of the options"])
+
+    def test_arithmetic_stem_is_checked(self):
+        row = question_row('12 x 1/3 = ?', answer='3', options=('2', '3', '4', '6'))
+        self.assertEqual(check_row(row, WIDTH), ['12 x 1/3 is 4, not 3'])
+
+    def test_shifted_cells(self):
+        issues = check_row(question_row('Pick one') + ['Easy'], WIDTH)
+        self.assertEqual(issues, ['16 columns but the header has 15; cells are shifted'])
+
+    def test_unparseable_typed_answer_and_unknown_labels(self):
+        row = question_row('Type it', answer='3//4', options=('', '', '', ''), qtype='TTA', difficulty='Tricky')
+        self.assertEqual(check_row(row, WIDTH), [
+            "unknown Difficulty 'Tricky'",
+            "typed answer '3//4' is not a number, quantity or amount the grader can parse",
+        ])
+
+
+class ValidateBankTest(PublicDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.bank = self.write_bank('Worksheet 1', [question_row('Q1'), question_row('Q2', answer='x'),
+                                                    question_row('Q1')])
+
+    def test_problems_carry_line_numbers_and_verdicts_are_cached(self):
+        result = validate_bank(self.bank)
+        self.assertEqual((result['rows'], result['checked']), (3, 2))
+        self.assertEqual(result['problems'], [(3, "answer 'x' is not one of the options")])
+
+        again = validate_bank(self.bank)
+        self.assertEqual((again['checked'], again['bytes_read'], again['problems']), (0, 0, result['problems']))
+
+        append_rows(self.bank, [question_row('Q3')])
+        grown = validate_bank(self.bank)
+        self.assertEqual((grown['rows'], grown['checked'], len(grown['problems'])), (4, 1, 1))
+        self.assertEqual(validate_bank(self.bank, use_cache=False)['checked'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
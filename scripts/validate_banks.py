@@ -0,0 +1,192 @@
+import argparse
+import hashlib
+import os
+import re
+import sys
+import time
+
+import bank_profile
+from bank_answers import parse_answer, parse_number
+from bank_io import PUBLIC_DIR, discover_banks, load_json, open_bank, sidecar_path, write_json_atomic
+
+# Bump when the checks change so cached verdicts are thrown away
+RULES_VERSION = 2
+
+KNOWN_TYPES = {'', 'MCQ', 'TTA', 'TYPE THE ANSWER', 'FIB', 'FILL IN THE BLANK'}
+KNOWN_DIFFICULTIES = {'', 'easy', 'low', 'medium', 'hard', 'high'}
+
+_NUMBER = r'\d+(?:\s+\d+/\d+|/\d+|\.\d+)?'
+# Stems like "2/9 + 4/9 = ?" or "12 x 1/3 = ?"
+ARITHMETIC_STEM = re.compile(
+    rf'^\s*({_NUMBER})\s*([+\-x×*÷])\s*({_NUMBER})\s*=\s*\?\s*$')
+_OPERATORS = {
+    '+': lambda a, b: a + b,
+    '-': lambda a, b: a - b,
+    'x': lambda a, b: a * b,
+    '×': lambda a, b: a * b,
+    '*': lambda a, b: a * b,
+    '÷': lambda a, b: a / b if b else None,
+}
+
+
+def _row_hash(row, width):
+    key = f'{width}\x1e' + '\x1f'.join(row)
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=12).hexdigest()
+
+
+def _question_type(row, options):
+    # Mirrors detectQuestionType in services/googleSheetsService.ts
+    declared = row[11].strip().upper() if len(row) > 11 else ''
+    if declared in ('FIB', 'FILL IN THE BLANK'):
+        return 'FIB'
+    if declared in ('TTA', 'TYPE THE ANSWER'):
+        return 'TTA'
+    if len(options) >= 2:
+        return 'MCQ'
+    return 'TTA'
+
+
+def check_row(row, width):
+    """Return the list of problems with one data row (empty if it is fine).
+    width is the number of columns in the bank's header."""
+    issues = []
+    if len(row) < 6:
+        return [f'only {len(row)} columns; need at least Question, 4 options and Answer']
+    if len(row) > width and any(cell.strip() for cell in row[width:]):
+        # Usually a stray empty cell that shifts Type, Worksheet No, ... right
+        return [f'{len(row)} columns but the header has {width}; cells are shifted']
+
+    question, answer = row[0].strip(), row[5].strip()
+    options = [o.strip() for o in row[1:5] if o.strip()]
+    if not question:
+        issues.append('empty question')
+    if not answer:
+        issues.append('empty answer')
+
+    declared = row[11].strip().upper() if len(row) > 11 else ''
+    if declared not in KNOWN_TYPES:
+        issues.append(f'unknown Type {row[11]!r}')
+    if len(row) > 14 and row[14].strip().lower() not in KNOWN_DIFFICULTIES:
+        issues.append(f'unknown Difficulty {row[14]!r}')
+
+    qtype = _question_type(row, options)
+    if qtype == 'MCQ':
+        if declared == 'MCQ' and len(options) < 2:
+            issues.append(f'MCQ has {len(options)} options')
+        lowered = [o.lower() for o in options]
+        if len(set(lowered)) != len(lowered):
+            issues.append('duplicate options')
+        # The app silently marks option A correct when nothing matches
+        if answer and answer.lower() not in lowered:
+            issues.append(f'answer {answer!r} is not one of the options')
+    elif answer:
+        # Typed answers are graded through the table bank_answers builds
+        for alternative in answer.split('|'):
+            if alternative.strip() and parse_answer(alternative) is None:
+                issues.append(f'typed answer {alternative.strip()!r} is not a number, quantity or amount '
+                              'the grader can parse')
+
+    match = ARITHMETIC_STEM.match(question)
+    if match and answer:
+        left, op, right = match.groups()
+        expected = _OPERATORS[op](parse_number(left), parse_number(right))
+        given = parse_number(answer)
+        if given is None:
+            issues.append(f'answer {answer!r} to an arithmetic stem is not a number')
+        elif expected is not None and given != expected:
+            issues.append(f'{left} {op} {right} is {expected}, not {answer}')
+    return issues
+
+
+def validate_bank(file_path, use_cache=True):
+    """Check every row of a bank. Verdicts are cached by row hash in a
+    '.questions.validation.json' sidecar, so only new or edited rows are
+    re-checked; an untouched bank (same size and mtime) is not read at all.
+    Returns a dict with the problems found as (line, message) pairs."""
+    start = time.perf_counter()
+    cache_path = sidecar_path(file_path, 'validation.json')
+    stat = os.stat(file_path)
+    cache = load_json(cache_path) if use_cache else None
+    if not cache or cache.get('rules') != RULES_VERSION:
+        cache = {'rules': RULES_VERSION, 'rows': {}}
+
+    if cache.get('size') == stat.st_size and cache.get('mtime_ns') == stat.st_mtime_ns:
+        return {
+            'path': file_path,
+            'rows': cache['row_count'],
+            'checked': 0,
+            'bytes_read': 0,
+            'problems': [tuple(p) for p in cache['problems']],
+            'seconds': time.perf_counter() - start,
+        }
+
+    cached = cache['rows']
+    verdicts = {}
+    problems = []
+    row_count = checked = 0
+    with open_bank(file_path) as (header, reader):
+        width = max(len(header), 6)
+        for row in reader:
+            if not row:
+                continue
+            row_count += 1
+            digest = _row_hash(row, width)
+            issues = verdicts.get(digest)
+            if issues is None:
+                issues = cached.get(digest)
+            if issues is None:
+                issues = check_row(row, width)
+                checked += 1
+            verdicts[digest] = issues
+            problems.extend((reader.line_num, issue) for issue in issues)
+
+    write_json_atomic(cache_path, {
+        'rules': RULES_VERSION,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'row_count': row_count,
+        'problems': problems,
+        'rows': verdicts,
+    })
+    return {
+        'path': file_path,
+        'rows': row_count,
+        'checked': checked,
+        'bytes_read': stat.st_size,
+        'problems': problems,
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Check the answer keys of worksheet question banks.')
+    parser.add_argument('banks', nargs='*', help='questions.csv files (default: every public/Worksheet*/questions.csv)')
+    parser.add_argument('--public-dir', default=PUBLIC_DIR)
+    parser.add_argument('--no-cache', action='store_true', help='re-check every row')
+    bank_profile.add_arguments(parser)
+    args = parser.parse_args(argv)
+    bank_profile.activate(bank_profile.Profiler.from_args('validate_banks', args))
+
+    banks = args.banks or discover_banks(args.public_dir)
+    total_problems = 0
+    for file_path in banks:
+        with bank_profile.stage('validate', bank=file_path) as record:
+            result = validate_bank(file_path, use_cache=not args.no_cache)
+            record.update(rows=result['rows'], checked=result['checked'], bytes_read=result['bytes_read'])
+        name = os.path.basename(os.path.dirname(result['path']))
+        print(f"  {name}: {result['rows']} rows, {result['checked']} re-checked, "
+              f"{len(result['problems'])} problems ({result['seconds'] * 1000:.1f} ms)")
+        for line, message in result['problems']:
+            print(f"    {file_path}:{line}: {message}")
+        total_problems += len(result['problems'])
+    bank_profile.close(banks=len(banks), problems=total_problems)
+
+    if total_problems:
+        print(f'❌ {total_problems} problems in {len(banks)} banks.')
+        return 1
+    print(f'✅ {len(banks)} banks valid.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,96 @@
+import { describe, it, expect } from 'vitest';
+import { applyDeltas, normalizeAnswer, parseCSVToQuestions } from '../googleSheetsService';
+
+type VersionedQuestion = Parameters<typeof applyDeltas>[0][number];
+type BankDelta = Parameters<typeof applyDeltas>[1][number];
+
+const question = (key: string, row: number, text = `Question ${key}`): VersionedQuestion => ({
+    key,
+    row,
+    text,
+    answers: [],
+    correctAnswer: 'A',
+});
+
+const delta = (from: number, changes: Partial<BankDelta>): BankDelta => ({
+    version: 1,
+    from,
+    to: from + 1,
+    inserted: [],
+    updated: [],
+    deleted: [],
+    moved: {},
+    ...changes,
+});
+
+describe('normalizeAnswer', () => {
+    it('lower-cases, trims and collapses whitespace', () => {
+        expect(normalizeAnswer('  Ten   Dollars ')).toBe('ten dollars');
+    });
+
+    it('drops spaces around slashes', () => {
+        expect(normalizeAnswer('4 / 6')).toBe('4/6');
+        expect(normalizeAnswer('1 1 /2')).toBe('1 1/2');
+    });
+});
+
+describe('parseCSVToQuestions', () => {
+    const header = 'Question,Option 1,Option 2,Option 3,Option 4,Answer,Hint,Know More,Link,YouTube,Image,Type,Concept,Worksheet No,Difficulty';
+
+    it('numbers rows like the build scripts, across blank lines and multi-line cells', () => {
+        const csv = [
+            header,
+            'One?,a,b,c,d,a,,,,,,MCQ,Smoke,1,Easy',
+            '',
+            '"Two,\nwith a second line?",,,,,2/4,,,,,,TTA,Smoke,1,Easy',
+            'Three?,a,b,c,d,b,,,,,,MCQ,Smoke,1,Hard',
+        ].join('\n');
+
+        const questions = parseCSVToQuestions(csv, 'ws4');
+
+        expect(questions.map(q => q.id)).toEqual(['ws4-q1', 'ws4-q2', 'ws4-q3']);
+        expect(questions[1].text).toBe('Two,\nwith a second line?');
+        expect(parseCSVToQuestions(csv, 'ws4', undefined, 'Hard').map(q => q.id)).toEqual(['ws4-q3']);
+    });
+});
+
+describe('applyDeltas', () => {
+    const base = [question('a', 1), question('b', 2), question('c', 3)];
+
+    it('returns the questions unchanged without deltas', () => {
+        expect(applyDeltas(base, [])).toEqual(base);
+    });
+
+    it('applies inserts, updates and deletes in row order', () => {
+        const result = applyDeltas(base, [delta(1, {
+            inserted: [question('d', 4)],
+            updated: [question('a', 1, 'Edited')],
+            deleted: ['b'],
+        })]);
+
+        expect(result.map(q => q.key)).toEqual(['a', 'c', 'd']);
+        expect(result[0].text).toBe('Edited');
+    });
+
+    it('renumbers moved questions without resending them', () => {
+        const result = applyDeltas(base, [delta(1, { deleted: ['a'], moved: { b: 1, c: 2 } })]);
+
+        expect(result.map(q => [q.key, q.row])).toEqual([['b', 1], ['c', 2]]);
+        expect(result[0].text).toBe('Question b');
+    });
+
+    it('chains deltas in order', () => {
+        const result = applyDeltas(base, [
+            delta(1, { inserted: [question('d', 4)] }),
+            delta(2, { deleted: ['d'], updated: [question('c', 3, 'Edited twice')] }),
+        ]);
+
+        expect(result.map(q => q.key)).toEqual(['a', 'b', 'c']);
+        expect(result[2].text).toBe('Edited twice');
+    });
+
+    it('does not modify the cached questions', () => {
+        applyDeltas(base, [delta(1, { moved: { a: 9 } })]);
+        expect(base[0].row).toBe(1);
+    });
+});
@@ -3,6 +3,15 @@ import type { Question, Topic } from '../types';
 // Master configuration sheet URL
 export const MASTER_CONFIG_URL = 'https://docs.google.com/spreadsheets/d/e/2PACX-1vQUv4zA167WG6griM00FRz-MTUm-v8o0687XWoWk_VbJ4PP-X5AyF-joKVu5gTVLu89rWJzvzvZnP55/pub?output=csv';
 
+// Per-bank statistics recorded in master_index.json by scripts/build_banks.py
+export interface WorksheetBankStats {
+  rows: number;
+  bytes: number;
+  sha256: string;
+  difficulty: Partial<Record<'Easy' | 'Medium' | 'Hard', number>>;
+  types: Partial<Record<'MCQ' | 'TTA' | 'FIB', number>>;
+}
+
 // Interface for local worksheet configuration
 export interface WorksheetConfig {
   id: string;
@@ -11,12 +20,89 @@ export interface WorksheetConfig {
   description?: string;
   icon?: string;
   color?: string;
+  bank?: WorksheetBankStats;
+}
+
+// Logical artifact names mapped to content-hashed copies, written to dist/ by
+// scripts/publish_banks.py. Hashed copies never change, so the browser can keep
+// them; only the manifest itself is revalidated. Without a manifest (dev server)
+// every name resolves to itself.
+interface AssetManifest {
+  version: number;
+  assets: Record<string, { file: string }>;
+}
+
+const ASSET_MANIFEST_VERSION = 1;
+let assetManifest: Promise<Record<string, { file: string }>> | null = null;
+
+function loadAssetManifest(): Promise<Record<string, { file: string }>> {
+  if (!assetManifest) {
+    assetManifest = fetch(`${import.meta.env.BASE_URL}asset-manifest.json`, { cache: 'no-cache' })
+      .then(response => (response.ok ? response.json() : null))
+      .then((manifest: AssetManifest | null) =>
+        manifest?.version === ASSET_MANIFEST_VERSION && manifest.assets ? manifest.assets : {})
+      // Missing manifest (the dev server answers with index.html) or malformed JSON
+      .catch(() => ({}));
+  }
+  return assetManifest;
+}
+
+/**
+ * Published (content-hashed) name of an artifact under public/, e.g.
+ * "Worksheet 1/questions.json" -> "Worksheet 1/questions.8cf34f39d9.json".
+ * A "#fragment" is kept as is.
+ */
+async function resolveAsset(logicalPath: string): Promise<string> {
+  const assets = await loadAssetManifest();
+  const hashIndex = logicalPath.indexOf('#');
+  const path = hashIndex === -1 ? logicalPath : logicalPath.slice(0, hashIndex);
+  const published = assets[path];
+  return published ? published.file + logicalPath.slice(path.length) : logicalPath;
+}
+
+async function withPublishedImages(questions: Question[]): Promise<Question[]> {
+  return Promise.all(questions.map(async question =>
+    question.imageUrl ? { ...question, imageUrl: await resolveAsset(question.imageUrl) } : question));
+}
+
+// Accepted-answer table written to <worksheet>/answers.json by scripts/build_banks.py.
+// Every typed (TTA/FIB) answer is expanded at build time into the spellings that count as
+// correct (4/6 and 0.67 for 2/3, 1 l for 1000ml, 10 dollars for $10), keyed by row.
+interface AnswerTable {
+  version: number;
+  sha256: string;
+  answers: Record<string, { kind: string; canonical: string; accepted: string[] }>;
+}
+
+/**
+ * Same rules as normalize_answer in scripts/bank_answers.py: lower-case, trimmed,
+ * single-spaced, no spaces around '/'.
+ */
+export function normalizeAnswer(text: string): string {
+  return text.trim().toLowerCase().replace(/\s+/g, ' ').replace(/\s*\/\s*/g, '/');
+}
+
+async function withAcceptedAnswers(questions: Question[], localBasePath: string, topicId: string): Promise<Question[]> {
+  try {
+    const response = await fetch(await resolveAsset(`${localBasePath}/answers.json`));
+    if (!response.ok) return questions;
+    const table: AnswerTable = await response.json();
+    if (!table.answers) return questions;
+    const prefix = `${topicId}-q`;
+    return questions.map(question => {
+      const entry = question.id.startsWith(prefix) ? table.answers[question.id.slice(prefix.length)] : undefined;
+      return entry ? { ...question, acceptedAnswers: entry.accepted } : question;
+    });
+  } catch {
+    // No table (the dev server answers with index.html): grading falls back to exact matches
+    return questions;
+  }
 }
 
 // Fetch available worksheets from master_index.json
 export async function fetchWorksheets(): Promise<WorksheetConfig[]> {
   try {
-    const response = await fetch(`${import.meta.env.BASE_URL}master_index.json`);
+    const response = await fetch(`${import.meta.env.BASE_URL}${await resolveAsset('master_index.json')}`);
     if (!response.ok) throw new Error('Failed to load master index');
     return await response.json();
   } catch (error) {
@@ -218,18 +304,65 @@ function detectQuestionType(
   return { questionType: 'TTA', is_fib: false };
 }
 
+/**
+ * Map a Difficulty cell or difficulty setting onto Easy / Medium / Hard
+ */
+function normalizeDifficulty(value: string): 'Easy' | 'Medium' | 'Hard' {
+  const lower = value.trim().toLowerCase();
+  if (lower === 'easy' || lower === 'low') return 'Easy';
+  if (lower === 'hard' || lower === 'high') return 'Hard';
+  return 'Medium';
+}
+
+/**
+ * Number of questions a worksheet offers at the given difficulty, read from the
+ * master index statistics. Returns undefined when the index has no statistics.
+ */
+export function countQuestionsFromIndex(config: WorksheetConfig, difficultyLevel?: string): number | undefined {
+  if (!config.bank) return undefined;
+  if (!difficultyLevel || difficultyLevel === 'None') return config.bank.rows;
+  return config.bank.difficulty[normalizeDifficulty(difficultyLevel)] ?? 0;
+}
+
+/**
+ * Split CSV text into records. A line break inside a quoted cell stays part of its record.
+ */
+function splitCSVRecords(csvText: string): string[] {
+  const records: string[] = [];
+  let start = 0;
+  let inQuotes = false;
+
+  for (let i = 0; i < csvText.length; i++) {
+    const char = csvText[i];
+
+    if (char === '"') {
+      inQuotes = !inQuotes;
+    } else if (char === '\n' && !inQuotes) {
+      records.push(csvText.slice(start, i));
+      start = i + 1;
+    }
+  }
+
+  records.push(csvText.slice(start));
+  return records;
+}
+
 /**
  * Parse CSV data from Google Sheets into Question objects
  * Column format: Question, Option 1, Option 2, Option 3, Option 4, Answer, Hint, Know More, Link, YouTube, Image, Type, Concept/Subtopic, Worksheet No, Difficulty
  */
-function parseCSVToQuestions(csvText: string, topicId: string, filterWorksheetNumber?: number, difficultyLevel?: string): Question[] {
-  const lines = csvText.trim().split('\n');
+export function parseCSVToQuestions(csvText: string, topicId: string, filterWorksheetNumber?: number, difficultyLevel?: string): Question[] {
+  const lines = splitCSVRecords(csvText.trim());
   const questions: Question[] = [];
+  // Data rows count from 1 and blank lines are skipped, as in scripts/bank_compile.py, so
+  // the ids match the precompiled artifacts and the rows of answers.json
+  let row = 0;
 
   // Skip header row
   for (let i = 1; i < lines.length; i++) {
     const line = lines[i].trim();
     if (!line) continue;
+    row++;
 
     // Parse CSV line with proper handling of quoted fields
     const parts = parseCSVLine(line);
@@ -262,19 +395,11 @@ function parseCSVToQuestions(csvText: string, topicId: string, filterWorksheetNu
       }
 
       // Parse difficulty
-      let difficulty: 'Easy' | 'Medium' | 'Hard' = 'Medium';
-      const dLower = difficultyRaw.trim().toLowerCase();
-      if (dLower === 'easy' || dLower === 'low') difficulty = 'Easy';
-      else if (dLower === 'hard' || dLower === 'high') difficulty = 'Hard';
+      const difficulty = normalizeDifficulty(difficultyRaw);
 
       // If difficultyLevel is specified, filter
       if (difficultyLevel && difficultyLevel !== 'None') {
-         let targetDiff = 'Medium';
-         const lLower = difficultyLevel.trim().toLowerCase();
-         if (lLower === 'easy' || lLower === 'low') targetDiff = 'Easy';
-         else if (lLower === 'hard' || lLower === 'high') targetDiff = 'Hard';
-
-         if (difficulty !== targetDiff) {
+         if (difficulty !== normalizeDifficulty(difficultyLevel)) {
             continue;
          }
       }
@@ -306,7 +431,7 @@ function parseCSVToQuestions(csvText: string, topicId: string, filterWorksheetNu
       }
 
       questions.push({
-        id: `${topicId}-q${i}`,
+        id: `${topicId}-q${row}`,
         text: questionText,
         hint: hint || undefined,
         knowMore: knowMoreUrl || undefined,
@@ -335,6 +460,222 @@ function parseCSVToQuestions(csvText: string, topicId: string, filterWorksheetNu
 }
 
 
+// Precompiled bank written next to questions.csv by scripts/build_banks.py.
+// Rows are already parsed, typed and column-mapped; only the topic-specific
+// fields (id, topic) are filled in here.
+interface CompiledQuestion extends Omit<Question, 'id' | 'topic'> {
+  row: number;
+}
+
+interface CompiledBank {
+  version: number;
+  sha256: string;
+  questions: CompiledQuestion[];
+}
+
+const COMPILED_BANK_VERSION = 1;
+
+// Shard index written to <worksheet>/shards/manifest.json by scripts/build_banks.py.
+// Each shard holds the compiled questions for one (worksheet, difficulty, type).
+interface ShardInfo {
+  file: string;
+  worksheet: number | null;
+  difficulty: 'Easy' | 'Medium' | 'Hard';
+  type: 'MCQ' | 'TTA' | 'FIB';
+  count: number;
+  bytes: number;
+}
+
+interface ShardManifest {
+  version: number;
+  sha256: string;
+  shards: ShardInfo[];
+}
+
+function fromCompiled({ row, ...question }: CompiledQuestion, topicId: string): Question {
+  return { ...question, id: `${topicId}-q${row}`, topic: topicId };
+}
+
+async function fetchCompiledBank(url: string): Promise<CompiledBank> {
+  const response = await fetch(url);
+  if (!response.ok) throw new Error(`HTTP ${response.status}: Failed to fetch ${url}`);
+  const bank: CompiledBank = await response.json();
+  if (bank.version !== COMPILED_BANK_VERSION || !Array.isArray(bank.questions)) {
+    throw new Error(`Unsupported compiled bank at ${url}`);
+  }
+  return bank;
+}
+
+/**
+ * Load only the shards for one difficulty, so the payload does not grow with the rest of the bank.
+ * Returns null when the worksheet has no usable shard manifest.
+ */
+async function fetchShardedQuestions(localBasePath: string, topicId: string, difficulty: 'Easy' | 'Medium' | 'Hard'): Promise<Question[] | null> {
+  try {
+    const response = await fetch(await resolveAsset(`${localBasePath}/shards/manifest.json`));
+    if (!response.ok) return null;
+
+    const manifest: ShardManifest = await response.json();
+    if (manifest.version !== COMPILED_BANK_VERSION || !Array.isArray(manifest.shards)) return null;
+
+    const wanted = manifest.shards.filter(shard => shard.difficulty === difficulty);
+    const banks = await Promise.all(wanted.map(async shard => fetchCompiledBank(await resolveAsset(`${localBasePath}/shards/${shard.file}`))));
+
+    // Shards split by type, so restore the bank's row order
+    return banks
+      .flatMap(bank => bank.questions)
+      .sort((a, b) => a.row - b.row)
+      .map(question => fromCompiled(question, topicId));
+  } catch {
+    return null;
+  }
+}
+
+// Versioned snapshots and deltas written to <worksheet>/versions/ by scripts/build_banks.py.
+// Questions carry a stable content-hash key so deltas survive rows moving around.
+interface VersionedQuestion extends CompiledQuestion {
+  key: string;
+}
+
+interface BankDelta {
+  version: number;
+  from: number;
+  to: number;
+  inserted: VersionedQuestion[];
+  updated: VersionedQuestion[];
+  deleted: string[];
+  moved: Record<string, number>;
+}
+
+interface VersionsManifest {
+  version: number;
+  bank_version: number;
+  sha256: string;
+  snapshot: { file: string; count: number; bytes: number };
+  deltas: { from: number; from_sha256: string; to: number; file: string; bytes: number }[];
+}
+
+interface CachedBank {
+  bankVersion: number;
+  // Content hash of the bank at bankVersion; a version number alone can be reused by another build
+  sha256: string;
+  questions: VersionedQuestion[];
+}
+
+const BANK_CACHE_PREFIX = 'bank-cache:';
+
+function readCachedBank(localBasePath: string): CachedBank | null {
+  try {
+    const cached = localStorage.getItem(BANK_CACHE_PREFIX + localBasePath);
+    return cached ? JSON.parse(cached) : null;
+  } catch {
+    return null;
+  }
+}
+
+function writeCachedBank(localBasePath: string, bank: CachedBank): void {
+  try {
+    localStorage.setItem(BANK_CACHE_PREFIX + localBasePath, JSON.stringify(bank));
+  } catch {
+    // Quota exceeded or storage disabled: the next visit downloads the snapshot again
+  }
+}
+
+async function fetchJson<T>(url: string, init?: RequestInit): Promise<T> {
+  const response = await fetch(url, init);
+  if (!response.ok) throw new Error(`HTTP ${response.status}: Failed to fetch ${url}`);
+  return response.json();
+}
+
+export function applyDeltas(questions: VersionedQuestion[], deltas: BankDelta[]): VersionedQuestion[] {
+  const byKey = new Map(questions.map(question => [question.key, question]));
+  for (const delta of deltas) {
+    delta.deleted.forEach(key => byKey.delete(key));
+    [...delta.inserted, ...delta.updated].forEach(question => byKey.set(question.key, question));
+    Object.entries(delta.moved).forEach(([key, row]) => {
+      const question = byKey.get(key);
+      if (question) byKey.set(key, { ...question, row });
+    });
+  }
+  return [...byKey.values()].sort((a, b) => a.row - b.row);
+}
+
+/**
+ * Bring the locally cached copy of a worksheet up to the current bank version, downloading
+ * only the deltas when they are smaller than the snapshot. Returns null when the worksheet
+ * has no usable versions manifest.
+ */
+async function fetchVersionedQuestions(localBasePath: string): Promise<VersionedQuestion[] | null> {
+  try {
+    const manifest = await fetchJson<VersionsManifest>(
+      await resolveAsset(`${localBasePath}/versions/manifest.json`), { cache: 'no-cache' });
+    if (manifest.version !== COMPILED_BANK_VERSION) return null;
+
+    const cached = readCachedBank(localBasePath);
+    if (cached?.bankVersion === manifest.bank_version && cached.sha256 === manifest.sha256) return cached.questions;
+
+    let questions: VersionedQuestion[] | null = null;
+    if (cached) {
+      // Deltas only apply to the exact content they were computed from; anything else takes the snapshot
+      const chain = manifest.deltas.filter(delta => delta.from >= cached.bankVersion);
+      const chainBytes = chain.reduce((sum, delta) => sum + delta.bytes, 0);
+      if (chain.length > 0 && chain[0].from === cached.bankVersion && chain[0].from_sha256 === cached.sha256
+        && chainBytes < manifest.snapshot.bytes) {
+        const deltas = await Promise.all(chain.map(async delta =>
+          fetchJson<BankDelta>(await resolveAsset(`${localBasePath}/versions/${delta.file}`))));
+        questions = applyDeltas(cached.questions, deltas);
+      }
+    }
+    if (!questions) {
+      const snapshot = await fetchJson<{ questions: VersionedQuestion[] }>(
+        await resolveAsset(`${localBasePath}/versions/${manifest.snapshot.file}`));
+      questions = snapshot.questions;
+    }
+
+    writeCachedBank(localBasePath, { bankVersion: manifest.bank_version, sha256: manifest.sha256, questions });
+    return questions;
+  } catch {
+    // Missing artifacts (the dev server answers with index.html) or malformed JSON
+    return null;
+  }
+}
+
+/**
+ * Load questions from a worksheet's precompiled artifacts. A worksheet that is already
+ * cached is caught up from the version deltas. Otherwise the matching shards are used when
+ * a difficulty is selected, and the current snapshot when none is (it seeds the cache).
+ * questions.json is the fallback for trees built without versions.
+ * Returns null when there is no usable artifact so callers can fall back to the CSV.
+ */
+async function fetchCompiledQuestions(localBasePath: string, topicId: string, difficultyLevel?: string): Promise<Question[] | null> {
+  const targetDifficulty = difficultyLevel && difficultyLevel !== 'None'
+    ? normalizeDifficulty(difficultyLevel)
+    : undefined;
+  const matches = (question: CompiledQuestion) => !targetDifficulty || question.difficulty === targetDifficulty;
+
+  if (targetDifficulty && !readCachedBank(localBasePath)) {
+    const sharded = await fetchShardedQuestions(localBasePath, topicId, targetDifficulty);
+    if (sharded) return sharded;
+  }
+
+  const versioned = await fetchVersionedQuestions(localBasePath);
+  if (versioned) {
+    return versioned
+      .filter(matches)
+      .map(({ key, ...question }) => fromCompiled(question, topicId));
+  }
+
+  try {
+    const bank = await fetchCompiledBank(await resolveAsset(`${localBasePath}/questions.json`));
+    return bank.questions
+      .filter(matches)
+      .map(question => fromCompiled(question, topicId));
+  } catch {
+    // Missing artifact (the dev server answers with index.html) or malformed JSON
+    return null;
+  }
+}
+
 /**
  * Parse a CSV line handling quoted fields with commas
  */
@@ -376,7 +717,11 @@ export async function fetchQuestionsFromSheet(topic: Topic, localBasePath?: stri
       // We might need to filter by topic if the CSV contains all topics, OR fetch a specific topic file.
       // Based on the plan, we are using a single "questions.csv" which likely has the "Concept/Topic" column.
 
-      const csvUrl = `${localBasePath}/questions.csv`;
+      // Prefer the precompiled artifact; it needs no CSV parsing at all
+      const compiled = await fetchCompiledQuestions(localBasePath, topic.id, difficultyLevel);
+      if (compiled) return withPublishedImages(await withAcceptedAnswers(compiled, localBasePath, topic.id));
+
+      const csvUrl = await resolveAsset(`${localBasePath}/questions.csv`);
       const response = await fetch(csvUrl);
       if (!response.ok) throw new Error(`HTTP ${response.status}: Failed to fetch local CSV`);
 
@@ -390,7 +735,8 @@ export async function fetchQuestionsFromSheet(topic: Topic, localBasePath?: stri
       // Let's assume the local file contains QUESTIONS FOR THIS WORKSHEET.
 
       // We pass the topic.id to tag the questions correctly.
-      return parseCSVToQuestions(csvText, topic.id, undefined, difficultyLevel);
+      const parsed = parseCSVToQuestions(csvText, topic.id, undefined, difficultyLevel);
+      return withPublishedImages(await withAcceptedAnswers(parsed, localBasePath, topic.id));
     }
 
     // 2. REMOTE MODE: Existing Google Sheets Logic